@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import bisect
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.exam_engine import (
+    _BUILDERS,
+    DistractorPool,
+    Question,
+    _distractor_pool,
+    _exam_sources,
+    exam_streams,
+)
+from app.core.irt import AbilityEstimate, ItemParams, Response, p_correct
+
+
+# Se para cuando el error típico de la habilidad baja de aquí...
+TARGET_SE = 0.5
+# ...pero nunca antes de este número de preguntas
+MIN_QUESTIONS = 8
+# Se elige al azar entre los N ítems más informativos para no repetir siempre los mismos
+RANDOMESQUE = 5
+# Proporción de aciertos esperada sobre todo el contenido que consideramos "preparado"
+# (con margen sobre el mínimo oficial de 80/180 puntos)
+PASS_RATIO = 0.6
+
+
+class AdaptiveExam:
+    """Examen adaptativo (CAT) con el modelo de Rasch.
+
+    Tras cada respuesta se actualiza la estimación de la habilidad y se elige
+    como siguiente pregunta un ítem de dificultad cercana a ella (el de mayor
+    información). Los ítems están ordenados por dificultad, así que elegir la
+    siguiente pregunta es una búsqueda binaria.
+    """
+
+    def __init__(
+        self,
+        max_questions: int = 30,
+        seed: int = 0,
+        params: Optional[ItemParams] = None,
+    ) -> None:
+        self.max_questions = max_questions
+        self.params = params or ItemParams.load()
+        self.estimate = AbilityEstimate()
+        self.responses: List[Response] = []
+        self.finished = False
+
+        self._streams = exam_streams(seed)
+        self._sections = dict(zip(("vocab", "kanji", "grammar"), _exam_sources()))
+        self._pools: Dict[str, DistractorPool] = {}
+        self._current: Optional[Tuple[str, int, float]] = None
+
+        # Banco de ítems ordenado por dificultad; se baraja antes para que los
+        # empates (ítems aún sin calibrar) no salgan siempre en el mismo orden
+        bank: List[Tuple[float, str, int]] = [
+            (self.params.difficulty(source_type, item.id), source_type, index)
+            for source_type, items in self._sections.items()
+            if len(items) >= 2
+            for index, item in enumerate(items)
+        ]
+        self._streams["select"].shuffle(bank)
+        bank.sort(key=lambda entry: entry[0])
+        self._bank = bank
+        self._difficulties = [entry[0] for entry in bank]
+        self._used: Set[int] = set()
+
+    @property
+    def answered(self) -> int:
+        return len(self.responses)
+
+    def _pick(self, theta: float) -> Optional[int]:
+        """Posición en el banco de uno de los ítems libres más cercanos a `theta`."""
+
+        right = bisect.bisect_left(self._difficulties, theta)
+        left = right - 1
+        nearest: List[int] = []
+        while len(nearest) < RANDOMESQUE and (left >= 0 or right < len(self._bank)):
+            take_right = left < 0 or (
+                right < len(self._bank)
+                and self._difficulties[right] - theta <= theta - self._difficulties[left]
+            )
+            if take_right:
+                pos, right = right, right + 1
+            else:
+                pos, left = left, left - 1
+            if pos not in self._used:
+                nearest.append(pos)
+
+        if not nearest:
+            return None
+        return self._streams["select"].choice(nearest)
+
+    def next_question(self) -> Optional[Question]:
+        """Siguiente pregunta, o None si el examen ya ha terminado."""
+
+        if self.finished:
+            return None
+        if self.answered >= self.max_questions or (
+            self.answered >= MIN_QUESTIONS and self.estimate.standard_error <= TARGET_SE
+        ):
+            self.finished = True
+            return None
+
+        theta = self.estimate.theta
+        while True:
+            pos = self._pick(theta)
+            if pos is None:
+                self.finished = True
+                return None
+            self._used.add(pos)
+
+            difficulty, source_type, index = self._bank[pos]
+            items = self._sections[source_type]
+            pool = self._pools.get(source_type)
+            if pool is None:
+                pool = self._pools[source_type] = _distractor_pool(source_type, items)
+
+            item = items[index]
+            question = _BUILDERS[source_type](
+                item, pool, self.answered + 1, self._streams[source_type]
+            )
+            if question is not None:
+                self._current = (source_type, item.id, difficulty)
+                return question
+
+    def answer(self, correct: bool) -> None:
+        """Registrar la respuesta a la pregunta actual."""
+
+        if self._current is None:
+            return
+        source_type, item_id, difficulty = self._current
+        self._current = None
+        self.estimate.update(difficulty, correct)
+        self.responses.append((source_type, item_id, correct))
+
+    def expected_ratio(self, theta: float) -> float:
+        """Proporción de aciertos esperada sobre todo el banco con habilidad `theta`."""
+
+        if not self._difficulties:
+            return 0.0
+        return sum(p_correct(theta, b) for b in self._difficulties) / len(self._difficulties)
+
+    def readiness(self) -> Tuple[float, float]:
+        """(aciertos esperados sobre todo el contenido, probabilidad de llegar a PASS_RATIO)."""
+
+        theta = self.estimate.theta
+        ratio = self.expected_ratio(theta)
+
+        # expected_ratio crece con theta: buscar por bisección la habilidad mínima "preparada"
+        low, high = -20.0, 20.0
+        for _ in range(40):
+            mid = (low + high) / 2
+            if self.expected_ratio(mid) < PASS_RATIO:
+                low = mid
+            else:
+                high = mid
+        return ratio, self.estimate.probability_above(high)
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Sequence, TypeVar, overload
+
+from app.core.models import GrammarPoint, KanjiItem, VocabItem
+
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+BUNDLE_FILE = BASE_DIR / "app" / "data" / "content_n5.bin"
+
+# Cambiar al modificar el formato: los paquetes antiguos se regeneran solos
+FORMAT_VERSION = 2
+_MAGIC = b"N5CB"
+# Separador de los campos de tipo lista (tags, lecturas, ejemplos...)
+_LIST_SEP = "\x1f"
+
+# magic, versión, máscara de los ficheros fuente que existían (bit i =
+# `_source_files()[i]`), offset tabla de cadenas, nº cadenas,
+# y (offset, nº registros) de las secciones vocab, kanji y gramática
+_HEADER = struct.Struct("<4sHHII" + "II" * 3)
+_VOCAB_RECORD = struct.Struct("<i5I")
+_KANJI_RECORD = struct.Struct("<i4I")
+_GRAMMAR_RECORD = struct.Struct("<i4I")
+_U32 = struct.Struct("<I")
+
+T = TypeVar("T")
+
+
+def _source_files() -> List[Path]:
+    from app.core.grammar_repository import GRAMMAR_FILE
+    from app.core.kanji_repository import KANJI_FILE
+    from app.core.vocab_repository import VOCAB_CSV_FILE, VOCAB_JSON_FILE
+
+    return [VOCAB_CSV_FILE, VOCAB_JSON_FILE, KANJI_FILE, GRAMMAR_FILE]
+
+
+def _sources_mask() -> int:
+    mask = 0
+    for i, source in enumerate(_source_files()):
+        if source.exists():
+            mask |= 1 << i
+    return mask
+
+
+def _split_list(value: str) -> List[str]:
+    return value.split(_LIST_SEP) if value else []
+
+
+class _StringTable:
+    """Tabla de cadenas sin duplicados para el paquete."""
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._strings: List[bytes] = []
+
+    def add(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self._strings)
+            self._index[value] = idx
+            self._strings.append(value.encode("utf-8"))
+        return idx
+
+    def add_list(self, values: Sequence[str]) -> int:
+        return self.add(_LIST_SEP.join(values))
+
+    def to_bytes(self) -> bytes:
+        offsets = bytearray()
+        pos = 0
+        for raw in self._strings:
+            offsets += _U32.pack(pos)
+            pos += len(raw)
+        offsets += _U32.pack(pos)
+        return bytes(offsets) + b"".join(self._strings)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+def build_bundle(path: Optional[Path] = None) -> Path:
+    """Compilar los ficheros de app/data en un único paquete binario."""
+
+    from app.core.grammar_repository import _load_grammar_uncached
+    from app.core.kanji_repository import _load_kanji_uncached
+    from app.core.vocab_repository import _load_vocab_uncached
+
+    if path is None:
+        path = BUNDLE_FILE
+
+    # Antes de leer: si un fuente aparece a la vez, el paquete queda desactualizado
+    sources_mask = _sources_mask()
+    strings = _StringTable()
+
+    vocab = b"".join(
+        _VOCAB_RECORD.pack(
+            v.id,
+            strings.add(v.word_jp),
+            strings.add(v.reading),
+            strings.add(v.meaning_es),
+            strings.add(v.pos),
+            strings.add_list(v.tags),
+        )
+        for v in _load_vocab_uncached()
+    )
+    kanji = b"".join(
+        _KANJI_RECORD.pack(
+            k.id,
+            strings.add(k.kanji),
+            strings.add_list(k.readings),
+            strings.add_list(k.meanings_es),
+            strings.add_list(k.examples),
+        )
+        for k in _load_kanji_uncached()
+    )
+    grammar = b"".join(
+        _GRAMMAR_RECORD.pack(
+            p.id,
+            strings.add(p.title_jp),
+            strings.add(p.description_simple_jp),
+            strings.add(p.note_es),
+            strings.add_list(p.examples),
+        )
+        for p in _load_grammar_uncached()
+    )
+
+    vocab_offset = _HEADER.size
+    kanji_offset = vocab_offset + len(vocab)
+    grammar_offset = kanji_offset + len(kanji)
+    strings_offset = grammar_offset + len(grammar)
+
+    header = _HEADER.pack(
+        _MAGIC,
+        FORMAT_VERSION,
+        sources_mask,
+        strings_offset,
+        len(strings),
+        vocab_offset,
+        len(vocab) // _VOCAB_RECORD.size,
+        kanji_offset,
+        len(kanji) // _KANJI_RECORD.size,
+        grammar_offset,
+        len(grammar) // _GRAMMAR_RECORD.size,
+    )
+
+    tmp_file = path.with_suffix(".bin.tmp")
+    tmp_file.write_bytes(header + vocab + kanji + grammar + strings.to_bytes())
+    os.replace(tmp_file, path)
+    return path
+
+
+def bundle_is_stale(path: Optional[Path] = None) -> bool:
+    """True si el paquete no existe, es de otra versión o algún origen ha cambiado.
+
+    Un origen ha cambiado si es más nuevo que el paquete, o si se ha creado o
+    borrado desde que se compiló (p.ej. al borrar el CSV, el vocabulario pasa
+    a salir del JSON).
+    """
+
+    if path is None:
+        path = BUNDLE_FILE
+
+    try:
+        bundle_mtime = path.stat().st_mtime_ns
+        with path.open("rb") as f:
+            magic, version, sources_mask = struct.unpack("<4sHH", f.read(8))
+    except (OSError, struct.error):
+        return True
+
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        return True
+    if sources_mask != _sources_mask():
+        return True
+
+    for source in _source_files():
+        try:
+            if source.stat().st_mtime_ns >= bundle_mtime:
+                return True
+        except OSError:
+            continue
+    return False
+
+
+class BundleSection(Sequence[T], Generic[T]):
+    """Vista de solo lectura sobre los registros de una sección.
+
+    Cada registro se decodifica la primera vez que se accede a él y se
+    recuerda; los que nunca se leen no cuestan nada.
+    """
+
+    def __init__(
+        self,
+        bundle: "ContentBundle",
+        offset: int,
+        count: int,
+        record: struct.Struct,
+        decode: Callable[["ContentBundle", tuple], T],
+    ) -> None:
+        self._bundle = bundle
+        self._offset = offset
+        self._count = count
+        self._record = record
+        self._decode = decode
+        self._decoded: List[Optional[T]] = [None] * count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        item = self._decoded[index]
+        if item is None:
+            # Si dos hilos lo decodifican a la vez, ambos resultados son equivalentes
+            item = self._decoded[index] = self._decode_at(index)
+        return item
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(self._count):
+            yield self[i]
+
+    def _decode_at(self, index: int) -> T:
+        fields = self._record.unpack_from(self._bundle._mm, self._offset + index * self._record.size)
+        return self._decode(self._bundle, fields)
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> Iterator[T]:
+        """Recorrer los registros `[start, stop)` sin guardar los decodificados.
+
+        Para pasadas completas (construir índices) o páginas que la vista
+        descarta después: la memoria no crece con el tamaño de la sección.
+        """
+
+        for i in range(*slice(start, stop).indices(self._count)):
+            item = self._decoded[i]
+            yield item if item is not None else self._decode_at(i)
+
+
+def _decode_vocab(bundle: "ContentBundle", fields: tuple) -> VocabItem:
+    item_id, word, reading, meaning, pos, tags = fields
+    s = bundle.string
+    return VocabItem(
+        id=item_id,
+        word_jp=s(word),
+        reading=s(reading),
+        meaning_es=s(meaning),
+        pos=s(pos),
+        tags=_split_list(s(tags)),
+    )
+
+
+def _decode_kanji(bundle: "ContentBundle", fields: tuple) -> KanjiItem:
+    item_id, kanji, readings, meanings, examples = fields
+    s = bundle.string
+    return KanjiItem(
+        id=item_id,
+        kanji=s(kanji),
+        readings=_split_list(s(readings)),
+        meanings_es=_split_list(s(meanings)),
+        examples=_split_list(s(examples)),
+    )
+
+
+def _decode_grammar(bundle: "ContentBundle", fields: tuple) -> GrammarPoint:
+    item_id, title, desc, note, examples = fields
+    s = bundle.string
+    return GrammarPoint(
+        id=item_id,
+        title_jp=s(title),
+        description_simple_jp=s(desc),
+        note_es=s(note),
+        examples=_split_list(s(examples)),
+    )
+
+
+class ContentBundle:
+    """Paquete binario de contenido abierto con mmap."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            version,
+            _sources_mask,
+            self._strings_offset,
+            self._n_strings,
+            vocab_offset,
+            vocab_count,
+            kanji_offset,
+            kanji_count,
+            grammar_offset,
+            grammar_count,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Paquete de contenido no válido: {path}")
+
+        self._blob_offset = self._strings_offset + (self._n_strings + 1) * _U32.size
+
+        self.vocab: BundleSection[VocabItem] = BundleSection(
+            self, vocab_offset, vocab_count, _VOCAB_RECORD, _decode_vocab
+        )
+        self.kanji: BundleSection[KanjiItem] = BundleSection(
+            self, kanji_offset, kanji_count, _KANJI_RECORD, _decode_kanji
+        )
+        self.grammar: BundleSection[GrammarPoint] = BundleSection(
+            self, grammar_offset, grammar_count, _GRAMMAR_RECORD, _decode_grammar
+        )
+
+    def string(self, index: int) -> str:
+        pos = self._strings_offset + index * _U32.size
+        (start,) = _U32.unpack_from(self._mm, pos)
+        (end,) = _U32.unpack_from(self._mm, pos + _U32.size)
+        return self._mm[self._blob_offset + start : self._blob_offset + end].decode("utf-8")
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+_lock = threading.Lock()
+_bundle: Optional[ContentBundle] = None
+
+
+def open_bundle() -> ContentBundle:
+    """Abrir el paquete del proceso, regenerándolo antes si está desactualizado."""
+
+    global _bundle
+    with _lock:
+        if _bundle is not None and not bundle_is_stale(_bundle.path):
+            return _bundle
+
+        # El paquete anterior no se cierra aquí: puede haber secciones suyas en
+        # uso (un examen en marcha, listas de las vistas). Su mmap se libera
+        # cuando nadie lo referencia. En Windows reemplazar un fichero mapeado
+        # falla con OSError; quien llama recurre entonces a los ficheros fuente.
+        _bundle = None
+
+        if bundle_is_stale(BUNDLE_FILE):
+            build_bundle(BUNDLE_FILE)
+        _bundle = ContentBundle(BUNDLE_FILE)
+        return _bundle
+
+
+if __name__ == "__main__":
+    built = build_bundle()
+    print(f"Paquete de contenido generado en {built}")
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, MutableSequence, Optional, Sequence, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+# (ruta, mtime en ns, tamaño) de cada fichero de origen; None si no existe
+_Signature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+def file_signature(paths: Sequence[Path]) -> _Signature:
+    sig = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            sig.append((str(path), None, None))
+        else:
+            sig.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+class CopyOnWriteList(MutableSequence[T]):
+    """Lista que lee de una secuencia compartida y solo la copia al modificarla.
+
+    Permite devolver el contenido cacheado (p.ej. una sección perezosa del
+    paquete binario) sin decodificarlo ni copiarlo entero por adelantado.
+    """
+
+    def __init__(self, source: Sequence[T]) -> None:
+        self._source: Sequence[T] = source
+        self._own: Optional[List[T]] = None
+
+    def _items(self) -> Sequence[T]:
+        return self._source if self._own is None else self._own
+
+    def _materialize(self) -> List[T]:
+        if self._own is None:
+            self._own = list(self._source)
+        return self._own
+
+    def __len__(self) -> int:
+        return len(self._items())
+
+    def __getitem__(self, index):
+        items = self._items()
+        if isinstance(index, slice):
+            return [items[i] for i in range(*index.indices(len(items)))]
+        return items[index]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items())
+
+    def __setitem__(self, index, value) -> None:
+        self._materialize()[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._materialize()[index]
+
+    def insert(self, index: int, value: T) -> None:
+        self._materialize().insert(index, value)
+
+    def __repr__(self) -> str:
+        return f"CopyOnWriteList(len={len(self)})"
+
+
+class ContentCache:
+    """Caché de contenido ya parseado (vocabulario, kanji, gramática) del proceso.
+
+    Cada entrada recuerda la fecha de modificación y el tamaño de sus ficheros
+    de origen; si cambian (o se llama a `invalidate` tras guardar desde la
+    app), se vuelve a cargar. Así abrir vistas o empezar exámenes no relee ni
+    reparsea los ficheros.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Tuple[_Signature, object]] = {}
+
+    def get(
+        self, name: str, paths: Sequence[Path], loader: Callable[[], Sequence[T]]
+    ) -> MutableSequence[T]:
+        """Devolver una copia de la secuencia cacheada, cargándola si hace falta.
+
+        La copia (de la secuencia, no de los ítems) permite a las vistas
+        añadir sin tocar la caché; solo se hace efectiva al modificarla.
+        """
+
+        return CopyOnWriteList(self.get_object(name, paths, loader))
+
+    def get_object(self, name: str, paths: Sequence[Path], loader: Callable[[], T]) -> T:
+        """Devolver el objeto cacheado tal cual (estructuras derivadas de solo lectura).
+
+        Los nombres `"<origen>:<algo>"` se invalidan junto con `"<origen>"`.
+        """
+
+        sig = file_signature(paths)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry[0] != sig:
+                entry = (sig, loader())
+                self._entries[name] = entry
+            return entry[1]  # type: ignore[return-value]
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+                for key in [k for k in self._entries if k.startswith(name + ":")]:
+                    del self._entries[key]
+
+
+content_cache = ContentCache()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from app.core.content_bundle import _source_files
+from app.core.content_cache import content_cache, file_signature
+from app.core.grammar_repository import load_grammar_points
+from app.core.kanji_repository import load_kanji_items
+from app.core.romaji import katakana_to_hiragana
+from app.core.vocab_repository import load_vocab_items
+
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DISTRACTOR_INDEX_FILE = BASE_DIR / "app" / "data" / "distractor_index.json"
+
+# Caracteres de lectura por cada edición permitida para considerarlas
+# confundibles: en lecturas de 1-3 kana una distancia fija de 2 casa con casi
+# todo, así que el radio crece con la longitud (mínimo 1)
+CHARS_PER_EDIT = 3
+# Cambiar al modificar cómo se eligen los vecinos: el índice en disco se rehace
+INDEX_VERSION = 2
+# Distractores "difíciles" guardados por ítem
+NEIGHBOURS = 6
+
+# Partículas que se suelen confundir entre sí (N5)
+PARTICLE_GROUPS: List[Tuple[str, ...]] = [
+    ("は", "が", "も"),
+    ("に", "で", "へ"),
+    ("を", "が"),
+    ("から", "まで"),
+    ("と", "や"),
+    ("の", "が"),
+]
+
+P = TypeVar("P")
+
+
+def max_distance(key: str) -> int:
+    """Distancia de edición máxima para que `key` y otra cadena sean confundibles."""
+
+    return max(1, len(key) // CHARS_PER_EDIT)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Distancia de Levenshtein."""
+
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ca != cb),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class BKTree(Generic[P]):
+    """Árbol BK para buscar cadenas a distancia de edición acotada.
+
+    Cada búsqueda con radio pequeño visita solo una parte del árbol en lugar
+    de comparar con todas las cadenas.
+    """
+
+    def __init__(self) -> None:
+        # Nodo: (clave, [payloads], {distancia: hijo})
+        self._root: Optional[Tuple[str, List[P], Dict[int, tuple]]] = None
+
+    def add(self, key: str, payload: P) -> None:
+        if self._root is None:
+            self._root = (key, [payload], {})
+            return
+
+        node = self._root
+        while True:
+            node_key, payloads, children = node
+            d = edit_distance(key, node_key)
+            if d == 0:
+                payloads.append(payload)
+                return
+            child = children.get(d)
+            if child is None:
+                children[d] = (key, [payload], {})
+                return
+            node = child
+
+    def search(self, key: str, max_distance: int) -> List[Tuple[int, P]]:
+        """Payloads a distancia <= `max_distance`, ordenados por distancia."""
+
+        if self._root is None:
+            return []
+
+        found: List[Tuple[int, P]] = []
+        stack = [self._root]
+        while stack:
+            node_key, payloads, children = stack.pop()
+            d = edit_distance(key, node_key)
+            if d <= max_distance:
+                found.extend((d, p) for p in payloads)
+            for child_d, child in children.items():
+                if d - max_distance <= child_d <= d + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+
+def _pick(correct: str, candidates: Sequence[str]) -> List[str]:
+    result: List[str] = []
+    for value in candidates:
+        if value != correct and value not in result:
+            result.append(value)
+            if len(result) >= NEIGHBOURS:
+                break
+    return result
+
+
+def _build_vocab() -> Dict[str, List[str]]:
+    items = load_vocab_items()
+    tree: BKTree[int] = BKTree()
+    readings = [katakana_to_hiragana(v.reading) for v in items]
+    for i, reading in enumerate(readings):
+        tree.add(reading, i)
+
+    neighbours: Dict[str, List[str]] = {}
+    for i, item in enumerate(items):
+        close = tree.search(readings[i], max_distance(readings[i]))
+        picked = _pick(item.meaning_es, [items[j].meaning_es for _d, j in close if j != i])
+        if picked:
+            neighbours[str(item.id)] = picked
+    return neighbours
+
+
+def _build_kanji() -> Dict[str, List[str]]:
+    items = [k for k in load_kanji_items() if k.meanings_es]
+
+    by_reading: Dict[str, List[int]] = {}
+    tree: BKTree[int] = BKTree()
+    for i, item in enumerate(items):
+        for reading in item.readings:
+            by_reading.setdefault(reading, []).append(i)
+            tree.add(reading, i)
+
+    neighbours: Dict[str, List[str]] = {}
+    for i, item in enumerate(items):
+        # Primero los kanji que comparten lectura, luego los de lectura parecida
+        candidates: List[int] = []
+        for reading in item.readings:
+            candidates.extend(by_reading.get(reading, []))
+        for reading in item.readings:
+            candidates.extend(j for _d, j in tree.search(reading, max_distance(reading)))
+
+        correct = item.meanings_es[0]
+        picked = _pick(correct, [items[j].meanings_es[0] for j in candidates if j != i])
+        if picked:
+            neighbours[str(item.id)] = picked
+    return neighbours
+
+
+def _build_grammar() -> Dict[str, List[str]]:
+    points = load_grammar_points()
+    titles = [p.title_jp for p in points]
+    tree: BKTree[str] = BKTree()
+    for title in titles:
+        tree.add(title, title)
+
+    neighbours: Dict[str, List[str]] = {}
+    for point in points:
+        candidates: List[str] = []
+        for group in PARTICLE_GROUPS:
+            if point.title_jp in group:
+                candidates.extend(t for t in group if t in titles)
+        candidates.extend(t for _d, t in tree.search(point.title_jp, max_distance(point.title_jp)))
+        picked = _pick(point.title_jp, candidates)
+        if picked:
+            neighbours[str(point.id)] = picked
+    return neighbours
+
+
+def content_version() -> str:
+    """Huella de los ficheros de contenido (cambia al modificarlos) y del índice."""
+
+    raw = repr((INDEX_VERSION, file_signature(_source_files()))).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+class DistractorIndex:
+    """Distractores confundibles precalculados por ítem (modo difícil).
+
+    - Vocabulario: significados de palabras con lectura parecida.
+    - Kanji: significados de kanji que comparten (o casi) lectura.
+    - Gramática: partículas que se suelen confundir.
+
+    Se construye una vez por versión del contenido y se guarda en disco; cada
+    pregunta solo consulta un diccionario.
+    """
+
+    def __init__(self, version: str, sections: Dict[str, Dict[str, List[str]]]) -> None:
+        self.version = version
+        self._sections = sections
+
+    def neighbours(self, source_type: str, item_id: int) -> List[str]:
+        return self._sections.get(source_type, {}).get(str(item_id), [])
+
+    @classmethod
+    def build(cls, version: str) -> "DistractorIndex":
+        return cls(
+            version,
+            {
+                "vocab": _build_vocab(),
+                "kanji": _build_kanji(),
+                "grammar": _build_grammar(),
+            },
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["DistractorIndex"]:
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            return cls(raw["version"], raw["sections"])
+        except Exception:
+            return None
+
+    def save(self, path: Path) -> None:
+        tmp_file = path.with_suffix(".json.tmp")
+        tmp_file.write_text(
+            json.dumps(
+                {"version": self.version, "sections": self._sections},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_file, path)
+
+
+def _load_or_build() -> DistractorIndex:
+    version = content_version()
+    index = DistractorIndex.load(DISTRACTOR_INDEX_FILE)
+    if index is None or index.version != version:
+        index = DistractorIndex.build(version)
+        try:
+            index.save(DISTRACTOR_INDEX_FILE)
+        except OSError:
+            pass
+    return index
+
+
+def get_distractor_index() -> DistractorIndex:
+    """Índice del proceso (del disco si corresponde al contenido actual)."""
+
+    return content_cache.get_object("distractor_index", _source_files(), _load_or_build)
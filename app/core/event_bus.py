@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, DefaultDict, List
+
+from app.core.models import ItemType, StudySession
+
+logger = logging.getLogger(__name__)
+
+
+# Temas publicados por la aplicación
+REVIEW_RECORDED = "review_recorded"  # payload: ReviewRecorded
+EXAM_FINISHED = "exam_finished"  # payload: StudySession
+
+Handler = Callable[[Any], None]
+
+
+@dataclass(frozen=True)
+class ReviewRecorded:
+    """Una respuesta aplicada al progreso, con lo necesario para actualizar contadores."""
+
+    item_type: ItemType
+    item_id: int
+    correct: bool
+    created: bool  # el ítem no tenía progreso hasta ahora
+    old_level: int
+    new_level: int
+
+
+class EventBus:
+    """Bus de eventos en proceso (publicar/suscribirse por tema).
+
+    Los manejadores se llaman en el hilo que publica y en orden de
+    suscripción; un error en uno no impide que se llame a los demás.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: DefaultDict[str, List[Handler]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, handler: Handler) -> Callable[[], None]:
+        """Registrar `handler` en `topic`; devuelve la función para darse de baja."""
+
+        with self._lock:
+            self._handlers[topic].append(handler)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                handlers = self._handlers.get(topic, [])
+                if handler in handlers:
+                    handlers.remove(handler)
+
+        return unsubscribe
+
+    def publish(self, topic: str, payload: Any = None) -> None:
+        with self._lock:
+            handlers = list(self._handlers.get(topic, ()))
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception:
+                # Un suscriptor roto no debe interrumpir a quien publica,
+                # pero el error tiene que quedar registrado
+                logger.exception("Error en un manejador de %r", topic)
+
+
+event_bus = EventBus()
+
+
+def publish_exam_finished(session: StudySession) -> None:
+    event_bus.publish(EXAM_FINISHED, session)
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import List
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from app.core.kanji_repository import load_kanji_items
-from app.core.grammar_repository import load_grammar_points
-from app.core.vocab_repository import load_vocab_items
+from app.core.content_cache import content_cache
+from app.core.kanji_repository import KANJI_FILE, load_kanji_items
+from app.core.grammar_repository import GRAMMAR_FILE, load_grammar_points
+from app.core.models import GrammarPoint, KanjiItem, StudySession, VocabItem
+from app.core.vocab_repository import VOCAB_CSV_FILE, VOCAB_JSON_FILE, load_vocab_items
 
 
 @dataclass
@@ -19,140 +22,397 @@ class Question:
     source_item_id: int
 
 
-def _build_vocab_questions() -> List[Question]:
-    questions: List[Question] = []
-    vocab_items = load_vocab_items()
-    if len(vocab_items) < 2:
-        return questions
+class DistractorPool:
+    """Valores candidatos a distractor, sin duplicados, para muestrear por índice.
 
+    Se construye una vez por versión del contenido; cada pregunta elige `k` posiciones al
+    azar y descarta la respuesta correcta, en lugar de filtrar la lista
+    completa para cada ítem.
+    """
+
+    def __init__(self, values: Sequence[str]) -> None:
+        self.values: List[str] = list(dict.fromkeys(values))
+        self._members = set(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def sample(
+        self,
+        correct: str,
+        k: int = 3,
+        rng: Optional[random.Random] = None,
+        exclude: Sequence[str] = (),
+    ) -> Optional[List[str]]:
+        """`k` valores distintos de `correct` y de `exclude`, o None si no hay suficientes."""
+
+        if rng is None:
+            rng = random.Random()
+        if k <= 0:
+            return []
+
+        skip = {correct, *exclude}
+        n = len(self.values)
+        available = n - sum(1 for v in skip if v in self._members)
+        if available < k:
+            return None
+
+        # Con pocos candidatos el rechazo repetiría mucho: filtrar directamente
+        if available < 2 * k:
+            return rng.sample([v for v in self.values if v not in skip], k)
+
+        chosen: set[int] = set()
+        result: List[str] = []
+        while len(result) < k:
+            i = rng.randrange(n)
+            if i in chosen or self.values[i] in skip:
+                continue
+            chosen.add(i)
+            result.append(self.values[i])
+        return result
+
+
+def _pick_distractors(
+    correct: str,
+    pool: DistractorPool,
+    rng: random.Random,
+    confusable: Sequence[str] = (),
+) -> Optional[List[str]]:
+    """Tres distractores: primero los confundibles (modo difícil), el resto del pool."""
+
+    hard = [v for v in confusable if v != correct]
+    hard = rng.sample(hard, min(3, len(hard)))
+    rest = pool.sample(correct, 3 - len(hard), rng, exclude=hard)
+    if rest is None:
+        return None
+    return hard + rest
+
+
+def _finish_question(
+    q_id: int,
+    text: str,
+    correct: str,
+    distractors: List[str],
+    source_type: str,
+    source_item_id: int,
+    rng: random.Random,
+) -> Question:
+    choices = distractors + [correct]
+    rng.shuffle(choices)
+    return Question(
+        id=q_id,
+        text=text,
+        choices=choices,
+        correct_index=choices.index(correct),
+        source_type=source_type,
+        source_item_id=source_item_id,
+    )
+
+
+def _vocab_question(
+    item: VocabItem,
+    pool: DistractorPool,
+    q_id: int,
+    rng: random.Random,
+    confusable: Sequence[str] = (),
+) -> Optional[Question]:
     # Usamos el significado principal en español como respuesta
-    all_meanings = [v.meaning_es for v in vocab_items]
+    correct = item.meaning_es
+    distractors = _pick_distractors(correct, pool, rng, confusable)
+    if distractors is None:
+        return None
+
+    text = f"【単語】日本語の意味を選んでください：{item.word_jp}（よみ：{item.reading}）"
+    return _finish_question(q_id, text, correct, distractors, "vocab", item.id, rng)
+
+
+def _kanji_question(
+    item: KanjiItem,
+    pool: DistractorPool,
+    q_id: int,
+    rng: random.Random,
+    confusable: Sequence[str] = (),
+) -> Optional[Question]:
+    if not item.meanings_es:
+        return None
+    correct = item.meanings_es[0]
+    distractors = _pick_distractors(correct, pool, rng, confusable)
+    if distractors is None:
+        return None
+
+    readings = ", ".join(item.readings)
+    text = f"【漢字】この漢字の意味を選んでください：{item.kanji}（よみ：{readings}）"
+    return _finish_question(q_id, text, correct, distractors, "kanji", item.id, rng)
+
+
+def _grammar_question(
+    point: GrammarPoint,
+    pool: DistractorPool,
+    q_id: int,
+    rng: random.Random,
+    confusable: Sequence[str] = (),
+) -> Optional[Question]:
+    if not point.examples:
+        return None
+    correct = point.title_jp
+    distractors = _pick_distractors(correct, pool, rng, confusable)
+    if distractors is None:
+        return None
+
+    example = rng.choice(point.examples)
+    text = f"【文法】この文で使われている助詞を選んでください：{example}"
+    return _finish_question(q_id, text, correct, distractors, "grammar", point.id, rng)
+
+
+def _exam_sources() -> Tuple[Sequence[VocabItem], Sequence[KanjiItem], Sequence[GrammarPoint]]:
+    """Contenido del examen como secuencias de acceso aleatorio.
+
+    Con el paquete binario solo se decodifican los ítems que se preguntan.
+    """
 
-    q_id = 1
-    for item in vocab_items:
-        correct = item.meaning_es
-        # Generar distractores distintos
-        distractors_pool = [m for m in all_meanings if m != correct]
-        if len(distractors_pool) < 3:
-            continue
-        distractors = random.sample(distractors_pool, 3)
-
-        choices = distractors + [correct]
-        random.shuffle(choices)
-        correct_index = choices.index(correct)
-
-        text = f"【単語】日本語の意味を選んでください：{item.word_jp}（よみ：{item.reading}）"
-
-        questions.append(
-            Question(
-                id=q_id,
-                text=text,
-                choices=choices,
-                correct_index=correct_index,
-                source_type="vocab",
-                source_item_id=item.id,
-            )
-        )
-        q_id += 1
-
-    return questions
-
-
-def _build_kanji_questions(start_id: int) -> List[Question]:
-    questions: List[Question] = []
-    kanji_items = load_kanji_items()
-    if len(kanji_items) < 2:
-        return questions
-
-    all_meanings = [k.meanings_es[0] for k in kanji_items if k.meanings_es]
-
-    q_id = start_id
-    for item in kanji_items:
-        if not item.meanings_es:
-            continue
-        correct = item.meanings_es[0]
-        distractors_pool = [m for m in all_meanings if m != correct]
-        if len(distractors_pool) < 3:
-            continue
-        distractors = random.sample(distractors_pool, 3)
-
-        choices = distractors + [correct]
-        random.shuffle(choices)
-        correct_index = choices.index(correct)
-
-        readings = ", ".join(item.readings)
-        text = f"【漢字】この漢字の意味を選んでください：{item.kanji}（よみ：{readings}）"
-
-        questions.append(
-            Question(
-                id=q_id,
-                text=text,
-                choices=choices,
-                correct_index=correct_index,
-                source_type="kanji",
-                source_item_id=item.id,
-            )
+    from app.core.content_bundle import open_bundle
+
+    try:
+        bundle = open_bundle()
+    except (OSError, ValueError):
+        return load_vocab_items(), load_kanji_items(), load_grammar_points()
+    return bundle.vocab, bundle.kanji, bundle.grammar
+
+
+def _distractor_pool(source_type: str, items: Sequence) -> DistractorPool:
+    # Se construye una vez por versión del contenido y se reutiliza entre exámenes
+    if source_type == "vocab":
+        return content_cache.get_object(
+            "vocab:exam_pool",
+            [VOCAB_CSV_FILE, VOCAB_JSON_FILE],
+            lambda: DistractorPool([v.meaning_es for v in items]),
         )
-        q_id += 1
-
-    return questions
-
-
-def _build_grammar_questions(start_id: int) -> List[Question]:
-    questions: List[Question] = []
-    points = load_grammar_points()
-    if len(points) < 2:
-        return questions
-
-    all_titles = [p.title_jp for p in points]
-
-    q_id = start_id
-    for p in points:
-        if not p.examples:
-            continue
-        example = random.choice(p.examples)
-        correct = p.title_jp
-
-        distractors_pool = [t for t in all_titles if t != correct]
-        if len(distractors_pool) < 3:
-            continue
-        distractors = random.sample(distractors_pool, 3)
-
-        choices = distractors + [correct]
-        random.shuffle(choices)
-        correct_index = choices.index(correct)
-
-        text = f"【文法】この文で使われている助詞を選んでください：{example}"
-
-        questions.append(
-            Question(
-                id=q_id,
-                text=text,
-                choices=choices,
-                correct_index=correct_index,
-                source_type="grammar",
-                source_item_id=p.id,
-            )
+    if source_type == "kanji":
+        return content_cache.get_object(
+            "kanji:exam_pool",
+            [KANJI_FILE],
+            lambda: DistractorPool([k.meanings_es[0] for k in items if k.meanings_es]),
         )
-        q_id += 1
+    return content_cache.get_object(
+        "grammar:exam_pool",
+        [GRAMMAR_FILE],
+        lambda: DistractorPool([p.title_jp for p in items]),
+    )
+
+
+_BUILDERS: Dict[str, Callable[..., Optional[Question]]] = {
+    "vocab": _vocab_question,
+    "kanji": _kanji_question,
+    "grammar": _grammar_question,
+}
+
+
+def _sample_indices(n: int, rng: random.Random) -> Iterator[int]:
+    """Índices distintos de `range(n)` en orden aleatorio, generados bajo demanda."""
+
+    seen: set[int] = set()
+    # Mientras quede mucho por sacar, muestreo con rechazo (coste por índice pedido)
+    while len(seen) < n // 2:
+        i = rng.randrange(n)
+        if i not in seen:
+            seen.add(i)
+            yield i
+
+    remaining = [i for i in range(n) if i not in seen]
+    rng.shuffle(remaining)
+    yield from remaining
+
+
+def _weighted_indices(
+    sections: Sequence[Tuple[str, Sequence]],
+    k: int,
+    rng: random.Random,
+    user_id: int = 1,
+) -> Iterator[int]:
+    """Índices globales elegidos según lo flojo que va el usuario en cada ítem.
+
+    Recorre una vez el contenido unido a su progreso y se queda con `k`
+    ítems mediante un muestreo ponderado de reservorio.
+    """
+
+    from app.core.exam_sampling import weakness_weight, weighted_reservoir
+    from app.storage.progress import get_progress_store
 
-    return questions
+    store = get_progress_store()
+    now = datetime.now()
+
+    def stream() -> Iterator[Tuple[int, float]]:
+        offset = 0
+        for source_type, items in sections:
+            for i, item in enumerate(items):
+                progress = store.get(user_id, source_type, item.id)
+                yield offset + i, weakness_weight(progress, now)
+            offset += len(items)
+
+    yield from weighted_reservoir(stream(), k, rng)
+
+
+def new_exam_seed() -> int:
+    """Semilla nueva para un examen (se guarda en la sesión para reproducirlo)."""
+
+    return random.SystemRandom().getrandbits(63)
+
+
+def exam_streams(seed: int) -> Dict[str, random.Random]:
+    """Generadores independientes derivados de la semilla del examen.
+
+    Uno para elegir los ítems y otro por sección, de modo que cambiar el
+    contenido de una sección no altera las preguntas de las demás.
+    """
 
+    return {
+        name: random.Random(f"{seed}:{name}")
+        for name in ("select", "vocab", "kanji", "grammar")
+    }
 
-def generate_exam(total_questions: int = 20) -> List[Question]:
+
+def _resolve_seed(seed: Optional[int], rng: Optional[random.Random]) -> int:
+    if seed is not None:
+        return seed
+    if rng is not None:
+        return rng.getrandbits(63)
+    return new_exam_seed()
+
+
+def _exam_sections() -> List[Tuple[str, Sequence]]:
+    return [
+        (source_type, items)
+        for source_type, items in zip(("vocab", "kanji", "grammar"), _exam_sources())
+        if len(items) >= 2
+    ]
+
+
+def weighted_exam_picks(total_questions: int, seed: int) -> List[int]:
+    """Ítems que elegiría `weighted=True` con esta semilla y el progreso actual.
+
+    Se guardan con la sesión (`StudySession.picks`) y se pasan como `picks`
+    para que el examen se pueda regenerar aunque el progreso haya cambiado.
+    """
+
+    sections = _exam_sections()
+    # Margen para los ítems que no admiten pregunta y se saltan
+    return list(_weighted_indices(sections, 2 * total_questions, exam_streams(seed)["select"]))
+
+
+def iter_exam_questions(
+    total_questions: int = 20,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+    difficulty: str = "normal",
+    weighted: bool = False,
+    picks: Optional[Sequence[int]] = None,
+) -> Iterator[Question]:
+    """Generar preguntas del examen una a una.
+
+    Primero se elige al azar qué ítem (de vocabulario, kanji o gramática) se
+    pregunta y solo entonces se construye su `Question`; los ítems que no
+    admiten pregunta se saltan. El trabajo depende del número de preguntas,
+    no del tamaño del contenido.
+
+    Con la misma `seed` (o un `rng` en el mismo estado) y el mismo contenido
+    se obtiene exactamente el mismo examen.
+
+    Con `difficulty="hard"` los distractores salen del índice de similitud
+    (lecturas parecidas, kanji con la misma lectura, partículas confundibles).
+
+    Con `weighted=True` los ítems se eligen con más probabilidad cuanto peor
+    los lleva el usuario según `progress.json` (nivel SRS, fallos y repaso
+    atrasado); el examen depende entonces también del progreso guardado.
+    Con `picks` (ver `weighted_exam_picks`) se usan esos ítems en lugar de
+    volver a elegirlos, y el resultado vuelve a depender solo de la semilla.
+    """
+
+    streams = exam_streams(_resolve_seed(seed, rng))
+
+    neighbours = None
+    if difficulty == "hard":
+        from app.core.distractor_index import get_distractor_index
+
+        neighbours = get_distractor_index()
+
+    sections = _exam_sections()
+    total_items = sum(len(items) for _source_type, items in sections)
+
+    pools: Dict[str, DistractorPool] = {}
+    q_id = 1
+    if picks is not None:
+        # Ítems fuera de rango si el contenido ha encogido desde que se eligieron
+        indices = (index for index in picks if 0 <= index < total_items)
+    elif weighted:
+        # Margen para los ítems que no admiten pregunta y se saltan
+        indices = _weighted_indices(sections, 2 * total_questions, streams["select"])
+    else:
+        indices = _sample_indices(total_items, streams["select"])
+
+    for index in indices:
+        if q_id > total_questions:
+            return
+
+        for source_type, items in sections:
+            if index < len(items):
+                break
+            index -= len(items)
+
+        pool = pools.get(source_type)
+        if pool is None:
+            pool = pools[source_type] = _distractor_pool(source_type, items)
+
+        item = items[index]
+        confusable = neighbours.neighbours(source_type, item.id) if neighbours else ()
+        question = _BUILDERS[source_type](item, pool, q_id, streams[source_type], confusable)
+        if question is not None:
+            yield question
+            q_id += 1
+
+
+def generate_exam(
+    total_questions: int = 20,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+    difficulty: str = "normal",
+    weighted: bool = False,
+    picks: Optional[Sequence[int]] = None,
+) -> List[Question]:
     """Generar un conjunto mezclado de preguntas para el examen simulado.
 
-    Intenta mezclar vocabulario, kanji y gramática de forma equilibrada.
+    Mezcla vocabulario, kanji y gramática al azar entre todo el contenido.
+    Ver `iter_exam_questions` para `seed`, `rng`, `difficulty`, `weighted` y `picks`.
     """
 
-    vocab_q = _build_vocab_questions()
-    kanji_q = _build_kanji_questions(start_id=len(vocab_q) + 1)
-    grammar_q = _build_grammar_questions(start_id=len(vocab_q) + len(kanji_q) + 1)
+    return list(
+        iter_exam_questions(
+            total_questions,
+            seed=seed,
+            rng=rng,
+            difficulty=difficulty,
+            weighted=weighted,
+            picks=picks,
+        )
+    )
+
 
-    pool: List[Question] = vocab_q + kanji_q + grammar_q
-    random.shuffle(pool)
+def replay_exam(session: StudySession) -> List[Question]:
+    """Regenerar el examen de una sesión guardada con su semilla y su modo.
 
-    if not pool:
-        return []
+    Los exámenes adaptativos no se pueden regenerar: sus preguntas dependen de
+    las respuestas dadas durante el examen.
+    """
 
-    return pool[: min(total_questions, len(pool))]
+    if session.seed is None:
+        raise ValueError("La sesión no tiene semilla guardada")
+    if session.adaptive:
+        raise ValueError("Un examen adaptativo no se puede regenerar desde la semilla")
+    if session.weighted and session.picks is None:
+        raise ValueError("La sesión ponderada no tiene guardados sus ítems")
+
+    return generate_exam(
+        session.total_questions,
+        seed=session.seed,
+        difficulty=session.difficulty or "normal",
+        picks=session.picks,
+    )
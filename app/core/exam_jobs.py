@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+from app.core.adaptive_exam import AdaptiveExam
+from app.core.exam_engine import Question, iter_exam_questions, weighted_exam_picks
+from app.storage.progress import get_progress_store
+
+
+T = TypeVar("T")
+
+# Un único hilo: los exámenes se generan de uno en uno, fuera del hilo de Tk
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="exam-gen")
+
+
+class ExamJob(Generic[T]):
+    """Generación de un examen en segundo plano.
+
+    La interfaz consulta `done()` periódicamente (con `after`) y recoge el
+    resultado con `result()`. `cancel()` evita que empiece si aún está en
+    cola y, si ya está en marcha, la detiene en la siguiente pregunta; en ese
+    caso el resultado es None.
+    """
+
+    def __init__(self, build: Callable[[threading.Event], Optional[T]]) -> None:
+        self._cancel = threading.Event()
+        self._future: Future = _executor.submit(build, self._cancel)
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        self._future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def result(self) -> Optional[T]:
+        """Resultado (bloquea si no ha terminado); relanza el error del hilo si lo hubo."""
+
+        if self._future.cancelled():
+            return None
+        return self._future.result()
+
+
+def start_exam_job(
+    total_questions: int, seed: int, difficulty: str, weighted: bool
+) -> ExamJob[Tuple[List[Question], Optional[List[int]]]]:
+    """Generar el examen completo; con `weighted` devuelve también los ítems elegidos.
+
+    Esos ítems se guardan con la sesión para poder regenerar el examen sin
+    depender del progreso (ver `weighted_exam_picks`).
+    """
+
+    def build(cancel: threading.Event) -> Optional[Tuple[List[Question], Optional[List[int]]]]:
+        picks = weighted_exam_picks(total_questions, seed) if weighted else None
+        questions: List[Question] = []
+        for question in iter_exam_questions(
+            total_questions, seed=seed, difficulty=difficulty, picks=picks
+        ):
+            if cancel.is_set():
+                return None
+            questions.append(question)
+        return questions, picks
+
+    return ExamJob(build)
+
+
+def start_adaptive_job(
+    max_questions: int, seed: int
+) -> ExamJob[Tuple[AdaptiveExam, Optional[Question]]]:
+    """Preparar el banco del examen adaptativo y su primera pregunta.
+
+    Las siguientes preguntas son baratas y se piden desde la interfaz.
+    """
+
+    def build(cancel: threading.Event) -> Optional[Tuple[AdaptiveExam, Optional[Question]]]:
+        # Esperar a que se guarde la recalibración del examen anterior
+        get_progress_store().flush()
+        exam = AdaptiveExam(max_questions=max_questions, seed=seed)
+        if cancel.is_set():
+            return None
+        return exam, exam.next_question()
+
+    return ExamJob(build)
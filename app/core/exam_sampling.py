@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import heapq
+import random
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, TypeVar
+
+from app.core.models import UserProgress
+from app.core.scheduler import SRS_INTERVALS, next_due
+
+
+T = TypeVar("T")
+
+# Peso de un ítem que el usuario aún no ha visto nunca
+NEW_ITEM_WEIGHT = 2.0
+# Días de retraso a partir de los cuales el peso por antigüedad deja de crecer
+MAX_OVERDUE_DAYS = 30
+
+
+def weakness_weight(progress: Optional[UserProgress], now: datetime) -> float:
+    """Peso de selección de un ítem: mayor cuanto peor se lo sabe el usuario.
+
+    Combina el nivel SRS (niveles bajos pesan más), la proporción de fallos
+    (suavizada para que un solo intento no domine) y lo atrasado que va el
+    repaso respecto a su intervalo.
+    """
+
+    if progress is None:
+        return NEW_ITEM_WEIGHT
+
+    max_level = max(SRS_INTERVALS)
+    level = min(max(progress.srs_level, 0), max_level)
+    level_factor = float(max_level + 1 - level)
+
+    attempts = progress.right_count + progress.wrong_count
+    error_rate = (progress.wrong_count + 1) / (attempts + 2)
+
+    overdue_days = 0.0
+    if progress.last_review is not None:
+        overdue_days = (now - next_due(progress)).total_seconds() / 86400
+    staleness = 1.0 + min(max(overdue_days, 0.0), MAX_OVERDUE_DAYS) / 10
+
+    return level_factor * (0.5 + error_rate) * staleness
+
+
+def weighted_reservoir(
+    stream: Iterable[Tuple[T, float]], k: int, rng: random.Random
+) -> List[T]:
+    """Muestra ponderada sin reemplazo de `k` elementos en una sola pasada.
+
+    Algoritmo A-Res (Efraimidis-Spirakis): cada elemento recibe la clave
+    `u ** (1 / peso)` y se conservan las `k` mayores en un montículo, así que
+    la memoria es O(k) sea cual sea el tamaño de `stream`. El resultado sale
+    ordenado por clave descendente, que equivale a extraer sucesivamente sin
+    reemplazo según los pesos.
+    """
+
+    if k <= 0:
+        return []
+
+    heap: List[Tuple[float, int, T]] = []
+    for seq, (value, weight) in enumerate(stream):
+        if weight <= 0:
+            continue
+        key = rng.random() ** (1.0 / weight)
+        if len(heap) < k:
+            heapq.heappush(heap, (key, seq, value))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, seq, value))
+
+    heap.sort(reverse=True)
+    return [value for _key, _seq, value in heap]
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import List
+from typing import List, MutableSequence, Sequence
 
+from app.core.content_cache import content_cache
 from app.core.models import GrammarPoint
 
 
@@ -11,7 +12,21 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 GRAMMAR_FILE = BASE_DIR / "app" / "data" / "grammar_n5.json"
 
 
-def load_grammar_points() -> List[GrammarPoint]:
+def load_grammar_points() -> MutableSequence[GrammarPoint]:
+    return content_cache.get("grammar", [GRAMMAR_FILE], _load_grammar_bundled)
+
+
+def _load_grammar_bundled() -> Sequence[GrammarPoint]:
+    from app.core.content_bundle import open_bundle
+
+    # Sección perezosa: cada ítem se decodifica del mmap al leerlo
+    try:
+        return open_bundle().grammar
+    except (OSError, ValueError):
+        return _load_grammar_uncached()
+
+
+def _load_grammar_uncached() -> List[GrammarPoint]:
     if not GRAMMAR_FILE.exists():
         return []
 
@@ -48,3 +63,5 @@ def save_grammar_points(points: List[GrammarPoint]) -> None:
     GRAMMAR_FILE.write_text(
         json.dumps(raw, ensure_ascii=False, indent=2), encoding="utf-8"
     )
+
+    content_cache.invalidate("grammar")
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.storage.item_params import load_item_params, write_item_params
+
+
+# Rejilla de habilidad (theta) para la estimación EAP
+THETA_MIN = -4.0
+THETA_MAX = 4.0
+GRID_POINTS = 81
+
+# Paso de aprendizaje del ajuste incremental: empieza grande y decrece con
+# el número de respuestas de cada ítem, sin bajar de MIN_RATE
+MIN_RATE = 0.05
+
+# Respuesta a un ítem del examen: (tipo, id, acierto)
+Response = Tuple[str, int, bool]
+
+
+def p_correct(theta: float, difficulty: float) -> float:
+    """Probabilidad de acierto en el modelo de Rasch (1PL)."""
+
+    return 1.0 / (1.0 + math.exp(difficulty - theta))
+
+
+def item_information(theta: float, difficulty: float) -> float:
+    """Información de Fisher del ítem en `theta` (máxima cuando dificultad = theta)."""
+
+    p = p_correct(theta, difficulty)
+    return p * (1.0 - p)
+
+
+class AbilityEstimate:
+    """Estimación bayesiana (EAP) de la habilidad sobre una rejilla fija.
+
+    Cada respuesta multiplica la posterior por la verosimilitud del ítem, así
+    que actualizar cuesta O(GRID_POINTS) independientemente de cuántas
+    preguntas se lleven.
+    """
+
+    def __init__(self) -> None:
+        step = (THETA_MAX - THETA_MIN) / (GRID_POINTS - 1)
+        self.grid: List[float] = [THETA_MIN + i * step for i in range(GRID_POINTS)]
+        # Prior normal estándar
+        self.posterior: List[float] = [math.exp(-t * t / 2) for t in self.grid]
+        self._normalize()
+        self.answered = 0
+
+    def _normalize(self) -> None:
+        total = sum(self.posterior)
+        self.posterior = [w / total for w in self.posterior]
+
+    def update(self, difficulty: float, correct: bool) -> None:
+        for i, theta in enumerate(self.grid):
+            p = p_correct(theta, difficulty)
+            self.posterior[i] *= p if correct else 1.0 - p
+        self._normalize()
+        self.answered += 1
+
+    @property
+    def theta(self) -> float:
+        return sum(t * w for t, w in zip(self.grid, self.posterior))
+
+    @property
+    def standard_error(self) -> float:
+        mean = self.theta
+        var = sum((t - mean) ** 2 * w for t, w in zip(self.grid, self.posterior))
+        return math.sqrt(var)
+
+    def probability_above(self, threshold: float) -> float:
+        """Probabilidad posterior de que la habilidad supere `threshold`."""
+
+        return sum(w for t, w in zip(self.grid, self.posterior) if t >= threshold)
+
+
+def item_key(source_type: str, item_id: int) -> str:
+    return f"{source_type}:{item_id}"
+
+
+class ItemParams:
+    """Dificultades de los ítems, ajustadas poco a poco con cada examen.
+
+    Los ítems sin respuestas todavía tienen dificultad 0 (la media del prior).
+    """
+
+    def __init__(self, raw: Optional[Dict[str, Tuple[float, int]]] = None) -> None:
+        self._raw: Dict[str, Tuple[float, int]] = dict(raw or {})
+        # Ítems cambiados desde que se cargaron: solo esos se guardan
+        self._dirty: Set[str] = set()
+
+    @classmethod
+    def load(cls) -> "ItemParams":
+        return cls(load_item_params())
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        write_item_params({key: self._raw[key] for key in self._dirty})
+        self._dirty.clear()
+
+    def difficulty(self, source_type: str, item_id: int) -> float:
+        return self._raw.get(item_key(source_type, item_id), (0.0, 0))[0]
+
+    def update(self, responses: Iterable[Response], theta: float) -> None:
+        """Un paso de gradiente de la verosimilitud por respuesta, con la habilidad fija."""
+
+        for source_type, item_id, correct in responses:
+            key = item_key(source_type, item_id)
+            b, n = self._raw.get(key, (0.0, 0))
+            rate = max(MIN_RATE, 1.0 / (n + 1))
+            b += rate * (p_correct(theta, b) - (1.0 if correct else 0.0))
+            b = min(max(b, THETA_MIN), THETA_MAX)
+            self._raw[key] = (b, n + 1)
+            self._dirty.add(key)
+
+
+def record_exam_responses(responses: List[Response]) -> None:
+    """Recalibrar los ítems con las respuestas de un examen terminado.
+
+    La habilidad del examen se estima con las dificultades actuales y luego se
+    usa para actualizar la dificultad de cada ítem respondido.
+    """
+
+    if not responses:
+        return
+
+    params = ItemParams.load()
+    estimate = AbilityEstimate()
+    for source_type, item_id, correct in responses:
+        estimate.update(params.difficulty(source_type, item_id), correct)
+    params.update(responses, estimate.theta)
+    params.save()
+
+
+def submit_exam_responses(responses: List[Response]) -> None:
+    """Encolar `record_exam_responses` en el hilo de escritura del progreso.
+
+    La recalibración lee y escribe el almacenamiento, así que no se hace en
+    el hilo de la interfaz.
+    """
+
+    if not responses:
+        return
+
+    from app.storage.progress import get_progress_store
+
+    responses = list(responses)
+    get_progress_store().defer(lambda: record_exam_responses(responses))
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import List
+from typing import List, MutableSequence, Sequence
 
+from app.core.content_cache import content_cache
 from app.core.models import KanjiItem
 
 
@@ -11,7 +12,21 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 KANJI_FILE = BASE_DIR / "app" / "data" / "kanji_n5.json"
 
 
-def load_kanji_items() -> List[KanjiItem]:
+def load_kanji_items() -> MutableSequence[KanjiItem]:
+    return content_cache.get("kanji", [KANJI_FILE], _load_kanji_bundled)
+
+
+def _load_kanji_bundled() -> Sequence[KanjiItem]:
+    from app.core.content_bundle import open_bundle
+
+    # Sección perezosa: cada ítem se decodifica del mmap al leerlo
+    try:
+        return open_bundle().kanji
+    except (OSError, ValueError):
+        return _load_kanji_uncached()
+
+
+def _load_kanji_uncached() -> List[KanjiItem]:
     if not KANJI_FILE.exists():
         return []
 
@@ -51,3 +66,5 @@ def save_kanji_items(items: List[KanjiItem]) -> None:
     KANJI_FILE.write_text(
         json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
     )
+
+    content_cache.invalidate("kanji")
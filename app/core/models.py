@@ -62,3 +62,12 @@ class StudySession:
     end_time: datetime
     correct_count: int
     total_questions: int
+    # Semilla con la que se generó el examen (permite regenerarlo igual)
+    seed: Optional[int] = None
+    # Modo del examen, necesario junto a la semilla para regenerarlo
+    difficulty: Optional[str] = None
+    weighted: bool = False
+    adaptive: bool = False
+    # Ítems elegidos por la selección ponderada (dependen del progreso del
+    # momento, así que se guardan en lugar de recalcularse)
+    picks: Optional[List[int]] = None
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Dict
+
+
+# Hiragana → romaji (Hepburn). El katakana se pasa antes a hiragana.
+_BASE: Dict[str, str] = {}
+
+for _row, _romaji in [
+    ("あいうえお", "a i u e o"),
+    ("かきくけこ", "ka ki ku ke ko"),
+    ("さしすせそ", "sa shi su se so"),
+    ("たちつてと", "ta chi tsu te to"),
+    ("なにぬねの", "na ni nu ne no"),
+    ("はひふへほ", "ha hi fu he ho"),
+    ("まみむめも", "ma mi mu me mo"),
+    ("やゆよ", "ya yu yo"),
+    ("らりるれろ", "ra ri ru re ro"),
+    ("わゐゑを", "wa i e o"),
+    ("がぎぐげご", "ga gi gu ge go"),
+    ("ざじずぜぞ", "za ji zu ze zo"),
+    ("だぢづでど", "da ji zu de do"),
+    ("ばびぶべぼ", "ba bi bu be bo"),
+    ("ぱぴぷぺぽ", "pa pi pu pe po"),
+    ("ぁぃぅぇぉゔ", "a i u e o vu"),
+]:
+    _BASE.update(zip(_row, _romaji.split()))
+_BASE["ん"] = "n"
+
+# Combinaciones con ゃ/ゅ/ょ (拗音)
+_YOON: Dict[str, str] = {}
+for _kana, _stem in [
+    ("き", "ky"), ("し", "sh"), ("ち", "ch"), ("に", "ny"), ("ひ", "hy"),
+    ("み", "my"), ("り", "ry"), ("ぎ", "gy"), ("じ", "j"), ("ぢ", "j"),
+    ("び", "by"), ("ぴ", "py"),
+]:
+    for _small, _vowel in (("ゃ", "a"), ("ゅ", "u"), ("ょ", "o")):
+        _YOON[_kana + _small] = _stem + _vowel
+
+_KATAKANA_START = ord("ァ")
+_KATAKANA_END = ord("ヶ")
+_KATAKANA_SHIFT = ord("ァ") - ord("ぁ")
+
+
+def katakana_to_hiragana(text: str) -> str:
+    return "".join(
+        chr(ord(c) - _KATAKANA_SHIFT) if _KATAKANA_START <= ord(c) <= _KATAKANA_END else c
+        for c in text
+    )
+
+
+def kana_to_romaji(text: str) -> str:
+    """Transliterar una lectura en kana (hiragana o katakana) a romaji.
+
+    Los caracteres que no son kana se dejan tal cual.
+    """
+
+    text = katakana_to_hiragana(text)
+    out: list[str] = []
+    double_next = False
+    i = 0
+    while i < len(text):
+        pair = text[i : i + 2]
+        if pair in _YOON:
+            romaji = _YOON[pair]
+            i += 2
+        else:
+            c = text[i]
+            i += 1
+            if c == "っ":
+                double_next = True
+                continue
+            if c == "ー":
+                # Vocal larga: repetir la última vocal
+                if out and out[-1]:
+                    out.append(out[-1][-1])
+                continue
+            romaji = _BASE.get(c, c)
+
+        if double_next:
+            romaji = ("t" if romaji.startswith("ch") else romaji[0]) + romaji
+            double_next = False
+        out.append(romaji)
+
+    return "".join(out)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.models import UserProgress
+from app.storage.progress import ProgressKey, get_progress_store, progress_key
+
+
+# Intervalo de repaso según el nivel SRS (0-4) tras la última revisión
+SRS_INTERVALS: Dict[int, timedelta] = {
+    0: timedelta(0),
+    1: timedelta(days=1),
+    2: timedelta(days=3),
+    3: timedelta(days=7),
+    4: timedelta(days=14),
+}
+
+
+def next_due(progress: UserProgress) -> datetime:
+    """Fecha a partir de la cual el ítem debe repasarse."""
+
+    if progress.last_review is None:
+        return datetime.min
+    level = min(max(progress.srs_level, 0), max(SRS_INTERVALS))
+    return progress.last_review + SRS_INTERVALS[level]
+
+
+_HeapEntry = Tuple[datetime, int, ProgressKey]
+
+
+class ReviewScheduler:
+    """Cola de prioridad de ítems ordenados por próxima fecha de repaso.
+
+    Mezcla todos los tipos de ítem (kana, vocab, kanji, grammar). Sacar el
+    siguiente ítem pendiente y volver a programarlo tras corregirlo cuestan
+    O(log n); las entradas obsoletas se descartan al llegar a la cima.
+    """
+
+    def __init__(self, items: Iterable[UserProgress] = ()) -> None:
+        self._heap: List[_HeapEntry] = []
+        # Entrada vigente de cada ítem (para invalidar las antiguas)
+        self._entries: Dict[ProgressKey, _HeapEntry] = {}
+        self._seq = 0
+
+        for p in items:
+            entry = self._new_entry(p)
+            self._entries[entry[2]] = entry
+            self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def _new_entry(self, progress: UserProgress) -> _HeapEntry:
+        self._seq += 1
+        key = progress_key(progress.user_id, progress.item_type, progress.item_id)
+        return (next_due(progress), self._seq, key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: ProgressKey) -> bool:
+        return key in self._entries
+
+    def reschedule(self, progress: UserProgress) -> None:
+        """Insertar o reprogramar un ítem tras corregirlo."""
+
+        entry = self._new_entry(progress)
+        self._entries[entry[2]] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, key: ProgressKey) -> None:
+        self._entries.pop(key, None)
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._entries.get(self._heap[0][2]) is not self._heap[0]:
+            heapq.heappop(self._heap)
+
+    def peek_due_time(self) -> Optional[datetime]:
+        """Próxima fecha de repaso de toda la cola (None si está vacía)."""
+
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_next_due(self, now: Optional[datetime] = None) -> Optional[ProgressKey]:
+        """Sacar el ítem más atrasado si ya toca repasarlo.
+
+        El ítem sale de la cola hasta que se vuelva a programar con
+        `reschedule` (normalmente tras corregir la respuesta).
+        """
+
+        if now is None:
+            now = datetime.now()
+
+        self._discard_stale()
+        if not self._heap or self._heap[0][0] > now:
+            return None
+
+        _due, _seq, key = heapq.heappop(self._heap)
+        del self._entries[key]
+        return key
+
+
+_scheduler: Optional[ReviewScheduler] = None
+
+
+def get_review_scheduler() -> ReviewScheduler:
+    """Devolver el planificador del proceso, construido desde el progreso en memoria."""
+
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReviewScheduler(get_progress_store().all())
+    return _scheduler
+
+
+def reschedule_if_loaded(items: Iterable[UserProgress]) -> None:
+    """Reprogramar ítems recién corregidos si el planificador ya existe."""
+
+    if _scheduler is None:
+        return
+    for p in items:
+        _scheduler.reschedule(p)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterable, Tuple
 
+from app.core.event_bus import REVIEW_RECORDED, ReviewRecorded, event_bus
 from app.core.models import UserProgress, ItemType
-from app.storage.progress import load_all_progress, save_all_progress
+from app.core.scheduler import reschedule_if_loaded
+from app.storage.progress import ProgressKey, get_progress_store, progress_key
+
+
+# (item_type, item_id, correct, timestamp)
+ReviewEvent = Tuple[ItemType, int, bool, datetime]
 
 
 def _update_single_progress(item: UserProgress, correct: bool, now: datetime) -> None:
@@ -23,6 +29,32 @@ def _update_single_progress(item: UserProgress, correct: bool, now: datetime) ->
     item.last_review = now
 
 
+def _apply_review(
+    user_id: int, item_type: ItemType, item_id: int, correct: bool, now: datetime
+) -> UserProgress:
+    """Aplicar una respuesta en memoria y publicarla en el bus de eventos."""
+
+    store = get_progress_store()
+    created = store.get(user_id, item_type, item_id) is None
+    match = store.get_or_create(user_id, item_type, item_id)
+    old_level = match.srs_level
+
+    _update_single_progress(match, correct=correct, now=now)
+
+    event_bus.publish(
+        REVIEW_RECORDED,
+        ReviewRecorded(
+            item_type=item_type,
+            item_id=item_id,
+            correct=correct,
+            created=created,
+            old_level=old_level,
+            new_level=match.srs_level,
+        ),
+    )
+    return match
+
+
 def update_progress_for_item(
     user_id: int,
     item_type: ItemType,
@@ -41,21 +73,27 @@ def update_progress_for_item(
     if now is None:
         now = datetime.now()
 
-    items: List[UserProgress] = load_all_progress()
+    match = _apply_review(user_id, item_type, item_id, correct, now)
 
-    match = next(
-        (p for p in items if p.user_id == user_id and p.item_type == item_type and p.item_id == item_id),
-        None,
-    )
+    get_progress_store().record([match])
+    reschedule_if_loaded([match])
 
-    if match is None:
-        match = UserProgress(
-            user_id=user_id,
-            item_type=item_type,
-            item_id=item_id,
-        )
-        items.append(match)
 
-    _update_single_progress(match, correct=correct, now=now)
+def update_progress_batch(events: Iterable[ReviewEvent], user_id: int = 1) -> None:
+    """Aplicar muchas respuestas de una vez (p.ej. todas las de un examen).
+
+    Los eventos se aplican en orden sobre el progreso en memoria y los
+    registros afectados se guardan en una sola escritura (una transacción en
+    SQLite, un único bloque de líneas en el diario JSON).
+    """
+
+    store = get_progress_store()
+    touched: Dict[ProgressKey, UserProgress] = {}
+
+    for item_type, item_id, correct, timestamp in events:
+        match = _apply_review(user_id, item_type, item_id, correct, timestamp)
+        touched[progress_key(user_id, item_type, item_id)] = match
 
-    save_all_progress(items)
+    if touched:
+        store.record(touched.values())
+        reschedule_if_loaded(touched.values())
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from app.core.models import VocabItem
+
+
+# Posiciones de los bits activos de cada valor de byte (0-255)
+_BYTE_BITS: List[List[int]] = [[b for b in range(8) if value >> b & 1] for value in range(256)]
+
+
+def _bitset(positions: List[int], size: int) -> int:
+    buf = bytearray((size + 7) // 8)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, "little")
+
+
+class VocabFilterIndex:
+    """Índice de filtros del vocabulario con un bitset por etiqueta y por `pos`.
+
+    Cada bitset es un entero de Python con el bit i activo si el ítem i cumple
+    el filtro, así que combinar filtros es un AND/OR de enteros en lugar de
+    recorrer la lista. Devuelve posiciones; los ítems se leen de la lista.
+    """
+
+    def __init__(self, items: Iterable[VocabItem]) -> None:
+        # Una sola pasada: `items` puede ser un iterador y no se guarda
+        tag_positions: Dict[str, List[int]] = {}
+        pos_positions: Dict[str, List[int]] = {}
+        size = 0
+        for i, item in enumerate(items):
+            for tag in item.tags:
+                tag_positions.setdefault(tag, []).append(i)
+            if item.pos:
+                pos_positions.setdefault(item.pos, []).append(i)
+            size = i + 1
+        self._size = size
+
+        self._tag_bits: Dict[str, int] = {t: _bitset(p, size) for t, p in tag_positions.items()}
+        self._pos_bits: Dict[str, int] = {t: _bitset(p, size) for t, p in pos_positions.items()}
+        self._all_bits: int = (1 << size) - 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def tags(self) -> List[str]:
+        return sorted(self._tag_bits)
+
+    @property
+    def pos_values(self) -> List[str]:
+        return sorted(self._pos_bits)
+
+    def match(self, tag: Optional[str] = None, pos: Optional[str] = None) -> int:
+        """Bitset de los ítems con la etiqueta `tag` y el tipo de palabra `pos`.
+
+        Un criterio a None no filtra.
+        """
+
+        bits = self._all_bits
+        if tag is not None:
+            bits &= self._tag_bits.get(tag, 0)
+        if pos is not None:
+            bits &= self._pos_bits.get(pos, 0)
+        return bits
+
+    def bits_from_positions(self, positions: Iterable[int]) -> int:
+        return _bitset(list(positions), self._size)
+
+    def positions(self, bits: int) -> List[int]:
+        """Posiciones (en orden) de los bits activos."""
+
+        result: List[int] = []
+        raw = bits.to_bytes((self._size + 7) // 8, "little")
+        for byte_index, value in enumerate(raw):
+            if value:
+                base = byte_index << 3
+                result.extend(base + b for b in _BYTE_BITS[value])
+        return result
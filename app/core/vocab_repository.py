@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import csv
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterable, Iterator, List, MutableSequence, Optional, Sequence, TypeVar
 
+from app.core.content_cache import content_cache, file_signature
 from app.core.models import VocabItem
+from app.core.vocab_index import VocabFilterIndex
+from app.core.vocab_search import VocabSearchIndex
 
 
 BASE_DIR = Path(__file__).resolve().parents[2]
@@ -31,43 +37,71 @@ def _load_from_json() -> List[VocabItem]:
     ]
 
 
-def _load_from_csv() -> List[VocabItem]:
+def _parse_id(value: Optional[str]) -> Optional[int]:
+    """Id de una fila del CSV, o None si falta o no es un entero."""
+
+    try:
+        return int((value or "").strip())
+    except ValueError:
+        return None
+
+
+def _row_to_item(row: Dict[str, str]) -> Optional[VocabItem]:
+    item_id = _parse_id(row.get("id"))
+    if item_id is None:
+        return None
+
+    tags_raw = row.get("tags", "") or ""
+    tags = [t.strip() for t in tags_raw.split(";") if t.strip()]
+
+    return VocabItem(
+        id=item_id,
+        word_jp=row.get("word_jp", ""),
+        reading=row.get("reading", ""),
+        meaning_es=row.get("meaning_es", ""),
+        pos=row.get("pos", ""),
+        tags=tags,
+    )
+
+
+def _iter_csv() -> Iterator[VocabItem]:
     if not VOCAB_CSV_FILE.exists():
-        return []
+        return
 
-    items: List[VocabItem] = []
     with VOCAB_CSV_FILE.open(encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            try:
-                item_id = int(row.get("id", "0") or 0)
-            except ValueError:
-                continue
-
-            tags_raw = row.get("tags", "") or ""
-            tags = [t.strip() for t in tags_raw.split(";") if t.strip()]
-
-            items.append(
-                VocabItem(
-                    id=item_id,
-                    word_jp=row.get("word_jp", ""),
-                    reading=row.get("reading", ""),
-                    meaning_es=row.get("meaning_es", ""),
-                    pos=row.get("pos", ""),
-                    tags=tags,
-                )
-            )
+            item = _row_to_item(row)
+            if item is not None:
+                yield item
 
-    return items
+
+def _load_from_csv() -> List[VocabItem]:
+    return list(_iter_csv())
 
 
-def load_vocab_items() -> List[VocabItem]:
+def load_vocab_items() -> MutableSequence[VocabItem]:
     """Cargar vocabulario N5.
 
     Si existe vocab_n5.csv, se prioriza (permite un listado grande N5).
     En caso contrario, se usa vocab_n5.json como conjunto mínimo.
+    El resultado se guarda en la caché de contenido del proceso.
     """
 
+    return content_cache.get("vocab", [VOCAB_CSV_FILE, VOCAB_JSON_FILE], _load_vocab_bundled)
+
+
+def _load_vocab_bundled() -> Sequence[VocabItem]:
+    from app.core.content_bundle import open_bundle
+
+    # Sección perezosa: cada ítem se decodifica del mmap al leerlo
+    try:
+        return open_bundle().vocab
+    except (OSError, ValueError):
+        return _load_vocab_uncached()
+
+
+def _load_vocab_uncached() -> List[VocabItem]:
     csv_items = _load_from_csv()
     if csv_items:
         return csv_items
@@ -75,10 +109,11 @@ def load_vocab_items() -> List[VocabItem]:
     return _load_from_json()
 
 
-def save_vocab_items(items: List[VocabItem]) -> None:
-    """Guardar la lista completa de vocabulario en vocab_n5.csv.
+def save_vocab_items(items: Iterable[VocabItem]) -> None:
+    """Guardar el vocabulario completo en vocab_n5.csv.
 
-    Si el fichero CSV no existe, se creará con encabezados estándar.
+    Si el fichero CSV no existe, se creará con encabezados estándar. `items`
+    se recorre una sola vez, así que puede ser un iterador.
     """
 
     VOCAB_CSV_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -98,3 +133,123 @@ def save_vocab_items(items: List[VocabItem]) -> None:
                     "tags": ";".join(item.tags),
                 }
             )
+
+    content_cache.invalidate("vocab")
+    _reset_filter_index()
+
+
+# Índices en memoria del vocabulario (filtros y búsqueda). Se construyen en
+# una pasada por `iter_vocab_items` y guardan posiciones, no ítems: quien los
+# usa resuelve las posiciones con `load_vocab_at`. Se pueden pedir desde el
+# hilo de Tk y desde `_index_executor`, así que el estado va bajo `_index_lock`.
+_index_sig: Optional[tuple] = None
+_indexes: Dict[str, object] = {}
+_index_lock = threading.Lock()
+_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vocab-index")
+
+T = TypeVar("T")
+
+
+def _reset_filter_index() -> None:
+    global _index_sig
+    with _index_lock:
+        _index_sig = None
+        _indexes.clear()
+
+
+def _get_index(name: str, build: Callable[[Iterable[VocabItem]], T]) -> T:
+    global _index_sig
+
+    sig = file_signature([VOCAB_CSV_FILE, VOCAB_JSON_FILE])
+    with _index_lock:
+        if _index_sig != sig:
+            _indexes.clear()
+            _index_sig = sig
+        index = _indexes.get(name)
+    if index is None:
+        # Se construye fuera del lock para no bloquear a quien pida otro índice
+        index = build(iter_vocab_items())
+        with _index_lock:
+            if _index_sig == sig:
+                index = _indexes.setdefault(name, index)
+    return index  # type: ignore[return-value]
+
+
+def get_vocab_filter_index() -> VocabFilterIndex:
+    """Índice de bitsets por etiqueta y tipo de palabra del vocabulario actual."""
+
+    return _get_index("filter", VocabFilterIndex)
+
+
+def get_vocab_search_index() -> VocabSearchIndex:
+    """Índice de búsqueda por prefijo (japonés, lectura, romaji, significado)."""
+
+    return _get_index("search", VocabSearchIndex)
+
+
+def prepare_vocab_filter_index() -> Future[VocabFilterIndex]:
+    """Construir el índice de filtros en segundo plano (recorre todo el mazo)."""
+
+    return _index_executor.submit(get_vocab_filter_index)
+
+
+def prepare_vocab_search_index() -> Future[VocabSearchIndex]:
+    """Construir el índice de búsqueda en segundo plano.
+
+    Con decenas de miles de palabras tarda más de un segundo; la vista lo pide
+    al abrirse y no busca hasta que el futuro ha terminado.
+    """
+
+    return _index_executor.submit(get_vocab_search_index)
+
+
+# --- Lectura en streaming y por páginas (mazos muy grandes) ---
+
+
+def _vocab_source() -> Sequence[VocabItem]:
+    # La misma entrada de caché que `load_vocab_items`: listas, páginas e
+    # índices leen siempre del mismo sitio
+    return content_cache.get_object("vocab", [VOCAB_CSV_FILE, VOCAB_JSON_FILE], _load_vocab_bundled)
+
+
+def iter_vocab_items(start: int = 0, stop: Optional[int] = None) -> Iterator[VocabItem]:
+    """Recorrer el vocabulario ítem a ítem sin construir la lista completa.
+
+    Con el paquete binario cada ítem se decodifica al pedirlo y no se guarda,
+    así que la memoria no depende del tamaño del mazo; sin paquete se recorre
+    la lista ya parseada (y cacheada) de los ficheros fuente.
+    """
+
+    source = _vocab_source()
+    read = getattr(source, "read", None)
+    if read is not None:
+        return read(start, stop)
+    return islice(source, start, stop)
+
+
+def count_vocab_items() -> int:
+    """Número de palabras del mazo (sin decodificar ninguna)."""
+
+    return len(_vocab_source())
+
+
+def load_vocab_page(offset: int, limit: int) -> List[VocabItem]:
+    """Cargar solo los ítems `[offset, offset + limit)` del vocabulario.
+
+    Los registros del paquete tienen tamaño fijo, así que se salta
+    directamente a la página pedida.
+    """
+
+    if offset < 0 or limit <= 0:
+        return []
+    return list(iter_vocab_items(offset, offset + limit))
+
+
+def load_vocab_at(positions: Iterable[int]) -> List[VocabItem]:
+    """Ítems en las posiciones dadas (p.ej. las que devuelve un índice)."""
+
+    source = _vocab_source()
+    read = getattr(source, "read", None)
+    if read is None:
+        return [source[i] for i in positions]
+    return [next(read(i, i + 1)) for i in positions]
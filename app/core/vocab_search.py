@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.models import VocabItem
+from app.core.romaji import kana_to_romaji, katakana_to_hiragana
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas y sin tildes (para comparar significados en español)."""
+
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+class _TrieNode:
+    __slots__ = ("children", "positions")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Ítems cuya clave pasa por este nodo (resultado directo de la búsqueda por prefijo)
+        self.positions: List[int] = []
+
+
+class PrefixTrie:
+    """Trie de prefijos: cada nodo guarda los ítems cuya clave empieza por él."""
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    def add(self, key: str, position: int) -> None:
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            # Una misma clave puede repetir prefijo (p.ej. varios tokens): no duplicar
+            if not child.positions or child.positions[-1] != position:
+                child.positions.append(position)
+            node = child
+
+    def find(self, prefix: str) -> List[int]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.positions
+
+
+class VocabSearchIndex:
+    """Índice de búsqueda incremental del vocabulario.
+
+    - Tries de prefijos sobre `word_jp`, `reading` (en hiragana) y la lectura
+      transliterada a romaji.
+    - Índice invertido por prefijo sobre las palabras de `meaning_es`
+      (sin tildes ni mayúsculas).
+
+    `search` devuelve posiciones en la lista indexada sin recorrerla.
+    """
+
+    def __init__(self, items: Iterable[VocabItem]) -> None:
+        self._size = 0
+        self._word = PrefixTrie()
+        self._reading = PrefixTrie()
+        self._romaji = PrefixTrie()
+        self._meaning = PrefixTrie()
+
+        for i, item in enumerate(items):
+            self._size = i + 1
+            self._word.add(item.word_jp, i)
+            reading = katakana_to_hiragana(item.reading)
+            self._reading.add(reading, i)
+            self._romaji.add(kana_to_romaji(reading), i)
+            for token in _tokens(item.meaning_es):
+                self._meaning.add(token, i)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _search_term(self, term: str) -> Set[int]:
+        matches: Set[int] = set(self._word.find(term))
+        kana = katakana_to_hiragana(term)
+        matches.update(self._reading.find(kana))
+        lowered = term.lower()
+        matches.update(self._romaji.find(lowered))
+        for token in _tokens(term):
+            matches.update(self._meaning.find(token))
+        return matches
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """Posiciones (ordenadas) de los ítems que casan con la consulta.
+
+        Cada palabra de la consulta se busca como prefijo en todos los campos
+        y se exige que casen todas. Devuelve None si la consulta está vacía.
+        """
+
+        terms = query.split()
+        if not terms:
+            return None
+
+        result: Optional[Set[int]] = None
+        for term in terms:
+            matches = self._search_term(term)
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        return sorted(result or ())
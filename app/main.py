@@ -1,22 +1,49 @@
+import sys
+import time
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-from app.ui.main_window import MainWindow
-from app.storage.settings import load_settings
+from app.storage.backend import shutdown_storage
+from app.storage.settings import get_settings_service
+
 
+# Marca que imprime `--measure-startup` al dibujarse el primer frame
+FIRST_FRAME_MARK = "FIRST_FRAME"
 
-def main() -> None:
-    settings = load_settings()
+
+def main(measure_startup: bool = False) -> None:
+    settings = get_settings_service().current
     theme_name = settings.theme or "flatly"
 
     app = ttk.Window(themename=theme_name)
     app.title("日本語N5トレーナー")
     app.geometry("900x600")
 
+    # Se importa con la ventana ya creada; las vistas se cargan al abrirlas
+    from app.ui.main_window import MainWindow
+
     MainWindow(app)
 
-    app.mainloop()
+    def on_close() -> None:
+        # Garantizar que las respuestas pendientes se escriben antes de salir
+        shutdown_storage()
+        app.destroy()
+
+    app.protocol("WM_DELETE_WINDOW", on_close)
+
+    if measure_startup:
+        # Forzar el primer dibujado, informar y salir (ver app.startup_timing)
+        app.update()
+        print(f"{FIRST_FRAME_MARK} {time.time():.6f}", flush=True)
+        on_close()
+        return
+
+    try:
+        app.mainloop()
+    finally:
+        shutdown_storage()
 
 
 if __name__ == "__main__":
-    main()
+    main(measure_startup="--measure-startup" in sys.argv)
@@ -0,0 +1,95 @@
+"""Medición del arranque en frío: tiempo hasta el primer frame.
+
+Lanza la aplicación varias veces en procesos nuevos (intérprete e imports
+incluidos) con `--measure-startup` y mide desde el lanzamiento hasta que la
+ventana se ha dibujado por primera vez.
+
+Uso:
+    python -m app.startup_timing [--runs N] [--budget-ms MS] [--imports N]
+
+Con `--budget-ms` termina con código 1 si la mediana supera el presupuesto;
+con `--imports` muestra además los módulos de la app que más tardan en importarse.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.main import FIRST_FRAME_MARK
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+
+def measure_once(import_time: bool = False) -> tuple[float, str]:
+    """Milisegundos desde el lanzamiento del proceso hasta el primer frame.
+
+    Devuelve también la salida de error, que con `import_time` contiene el
+    informe de `python -X importtime`.
+    """
+
+    command = [sys.executable]
+    if import_time:
+        command += ["-X", "importtime"]
+    command += ["-m", "app.main", "--measure-startup"]
+
+    start = time.time()
+    result = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True, check=True)
+    for line in result.stdout.splitlines():
+        if line.startswith(FIRST_FRAME_MARK):
+            return (float(line.split()[1]) - start) * 1000, result.stderr
+    raise RuntimeError(f"la aplicación no informó del primer frame:\n{result.stderr}")
+
+
+def slowest_imports(importtime_report: str, limit: int) -> List[Tuple[float, str]]:
+    """Módulos `app.*` con mayor tiempo acumulado de import (ms)."""
+
+    found: List[Tuple[float, str]] = []
+    for line in importtime_report.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        module = parts[2].strip()
+        if module.startswith("app.") or module == "app":
+            found.append((int(parts[1]) / 1000, module))
+    found.sort(reverse=True)
+    return found[:limit]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="número de arranques")
+    parser.add_argument("--budget-ms", type=float, default=None, help="máximo para la mediana")
+    parser.add_argument("--imports", type=int, default=0, help="mostrar los N imports más lentos")
+    args = parser.parse_args(argv)
+
+    times = [measure_once()[0] for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(
+        f"primer frame: mediana {median:.0f} ms "
+        f"(mín {min(times):.0f} ms, máx {max(times):.0f} ms, {args.runs} arranques)"
+    )
+
+    if args.imports:
+        # Arranque aparte: -X importtime añade su propio coste
+        _elapsed, report = measure_once(import_time=True)
+        for cumulative_ms, module in slowest_imports(report, args.imports):
+            print(f"  {cumulative_ms:8.1f} ms  {module}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"fuera de presupuesto: {median:.0f} ms > {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.models import Settings, StudySession, UserProgress
+from app.storage.item_params import ItemParamsRaw, load_item_params_json, save_item_params_json
+from app.storage.progress import ProgressJournal, close_progress_store, progress_stats
+from app.storage.sessions import append_session_json, load_sessions_json
+from app.storage.settings import load_settings_json, save_settings_json
+
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+# Si existe la base de datos (creada por el migrador), se usa SQLite
+DB_FILE = BASE_DIR / "n5_trainer.db"
+
+
+class StorageBackend:
+    """Interfaz común de almacenamiento de progreso, sesiones y ajustes."""
+
+    name = "base"
+
+    def load_progress(self) -> List[UserProgress]:
+        raise NotImplementedError
+
+    def write_progress(self, items: List[UserProgress]) -> None:
+        """Guardar (insertar o actualizar) los registros indicados de una vez."""
+
+        raise NotImplementedError
+
+    def progress_stats(self) -> Dict[str, Dict[str, int]]:
+        raise NotImplementedError
+
+    def load_sessions(self) -> List[StudySession]:
+        raise NotImplementedError
+
+    def append_session(self, session: StudySession) -> None:
+        raise NotImplementedError
+
+    def load_settings(self) -> Settings:
+        raise NotImplementedError
+
+    def save_settings(self, settings: Settings) -> None:
+        raise NotImplementedError
+
+    def load_item_params(self) -> ItemParamsRaw:
+        raise NotImplementedError
+
+    def write_item_params(self, params: ItemParamsRaw) -> None:
+        """Guardar (insertar o actualizar) los parámetros de los ítems indicados."""
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonBackend(StorageBackend):
+    """Almacenamiento en ficheros JSON (progress.json + diario, sessions.json,
+    settings.json, item_params.json)."""
+
+    name = "json"
+
+    def __init__(self) -> None:
+        self.journal = ProgressJournal()
+
+    def load_progress(self) -> List[UserProgress]:
+        return self.journal.load()
+
+    def write_progress(self, items: List[UserProgress]) -> None:
+        self.journal.append(items)
+
+    def progress_stats(self) -> Dict[str, Dict[str, int]]:
+        from app.storage.progress import get_progress_store
+
+        return progress_stats(get_progress_store().all())
+
+    def load_sessions(self) -> List[StudySession]:
+        return load_sessions_json()
+
+    def append_session(self, session: StudySession) -> None:
+        append_session_json(session)
+
+    def load_settings(self) -> Settings:
+        return load_settings_json()
+
+    def save_settings(self, settings: Settings) -> None:
+        save_settings_json(settings)
+
+    def load_item_params(self) -> ItemParamsRaw:
+        return load_item_params_json()
+
+    def write_item_params(self, params: ItemParamsRaw) -> None:
+        raw = load_item_params_json()
+        raw.update(params)
+        save_item_params_json(raw)
+
+    def close(self) -> None:
+        self.journal.close()
+
+
+_backend: Optional[StorageBackend] = None
+
+
+def get_backend() -> StorageBackend:
+    """Devolver el backend activo del proceso (SQLite si existe la base de datos)."""
+
+    global _backend
+    if _backend is None:
+        if DB_FILE.exists():
+            from app.storage.sqlite_backend import SqliteBackend
+
+            _backend = SqliteBackend(DB_FILE)
+        else:
+            _backend = JsonBackend()
+    return _backend
+
+
+def shutdown_storage() -> None:
+    """Vaciar las escrituras pendientes y cerrar el backend activo."""
+
+    global _backend
+    close_progress_store()
+    if _backend is not None:
+        _backend.close()
+        _backend = None
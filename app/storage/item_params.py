@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+# Fichero del backend JSON (con SQLite se guarda en la tabla item_params)
+ITEM_PARAMS_FILE = BASE_DIR / "item_params.json"
+
+# Clave "tipo:id" -> (dificultad, respuestas usadas en el ajuste)
+ItemParamsRaw = Dict[str, Tuple[float, int]]
+
+
+def load_item_params() -> ItemParamsRaw:
+    from app.storage.backend import get_backend
+
+    return get_backend().load_item_params()
+
+
+def write_item_params(params: ItemParamsRaw) -> None:
+    """Guardar (insertar o actualizar) los parámetros de los ítems indicados."""
+
+    from app.storage.backend import get_backend
+
+    get_backend().write_item_params(params)
+
+
+def load_item_params_json() -> ItemParamsRaw:
+    if not ITEM_PARAMS_FILE.exists():
+        return {}
+
+    try:
+        raw = json.loads(ITEM_PARAMS_FILE.read_text(encoding="utf-8"))
+        return {key: (float(b), int(n)) for key, (b, n) in raw.items()}
+    except Exception:
+        return {}
+
+
+def save_item_params_json(params: ItemParamsRaw) -> None:
+    raw = {key: [round(b, 4), n] for key, (b, n) in params.items()}
+    tmp_file = ITEM_PARAMS_FILE.with_suffix(".json.tmp")
+    tmp_file.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_file, ITEM_PARAMS_FILE)
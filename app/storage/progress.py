@@ -1,17 +1,29 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
 
-from app.core.models import UserProgress
+from app.core.models import UserProgress, ItemType
+
+if TYPE_CHECKING:
+    from app.storage.backend import StorageBackend
+    from app.storage.writer import PersistenceWorker
 
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 PROGRESS_FILE = BASE_DIR / "progress.json"
+# Diario de repasos (una línea JSON por respuesta) que se aplica sobre progress.json
+JOURNAL_FILE = BASE_DIR / "progress.journal"
+# Entradas del diario a partir de las cuales se integra en una nueva instantánea
+COMPACT_THRESHOLD = 500
 _DATE_FMT = "%Y-%m-%dT%H:%M:%S"
 
+ProgressKey = Tuple[int, str, int]
+
 
 def _serialize_progress_item(p: UserProgress) -> Dict:
     return {
@@ -54,6 +66,263 @@ def load_all_progress() -> List[UserProgress]:
 
 def save_all_progress(items: List[UserProgress]) -> None:
     raw = [_serialize_progress_item(p) for p in items]
-    PROGRESS_FILE.write_text(
+    _write_snapshot(raw)
+
+
+def _write_snapshot(raw: List[Dict]) -> None:
+    # Escribir en un temporal y reemplazar para no dejar nunca un fichero a medias
+    tmp_file = PROGRESS_FILE.with_suffix(".json.tmp")
+    tmp_file.write_text(
         json.dumps(raw, ensure_ascii=False, indent=2), encoding="utf-8"
     )
+    os.replace(tmp_file, PROGRESS_FILE)
+
+
+def _compacting_file() -> Path:
+    return JOURNAL_FILE.with_suffix(".journal.compacting")
+
+
+def _read_journal(path: Path) -> List[UserProgress]:
+    if not path.exists():
+        return []
+
+    items: List[UserProgress] = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(_deserialize_progress_item(json.loads(line)))
+            except Exception:
+                # Línea incompleta (p.ej. cierre inesperado a mitad de escritura)
+                continue
+    return items
+
+
+def _merge_progress(*batches: List[UserProgress]) -> List[UserProgress]:
+    merged: Dict[ProgressKey, UserProgress] = {}
+    for batch in batches:
+        for p in batch:
+            merged[progress_key(p.user_id, p.item_type, p.item_id)] = p
+    return list(merged.values())
+
+
+def progress_key(user_id: int, item_type: ItemType, item_id: int) -> ProgressKey:
+    return (user_id, item_type, item_id)
+
+
+# Nivel SRS a partir del cual un ítem cuenta como aprendido
+LEARNED_LEVEL = 2
+
+
+def progress_stats(items: Iterable[UserProgress]) -> Dict[str, Dict[str, int]]:
+    """Agregar estadísticas por tipo de ítem (nº, aprendidos, aciertos, fallos)."""
+
+    stats_by_type: Dict[str, Dict[str, int]] = {}
+    for p in items:
+        t = p.item_type
+        if t not in stats_by_type:
+            stats_by_type[t] = {
+                "count": 0,
+                "learned": 0,
+                "right": 0,
+                "wrong": 0,
+            }
+        stats_by_type[t]["count"] += 1
+        stats_by_type[t]["right"] += p.right_count
+        stats_by_type[t]["wrong"] += p.wrong_count
+        if p.srs_level >= LEARNED_LEVEL:
+            stats_by_type[t]["learned"] += 1
+    return stats_by_type
+
+
+class ProgressJournal:
+    """Diario append-only de repasos junto a progress.json.
+
+    Cada respuesta se añade como una línea (`append`); al superar
+    `COMPACT_THRESHOLD` entradas, el diario se integra en una nueva
+    instantánea de progress.json en segundo plano.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handle: Optional[TextIO] = None
+        self._entries = 0
+        self._compaction: Optional[threading.Thread] = None
+
+    def load(self) -> List[UserProgress]:
+        """Cargar la última instantánea y reaplicar el diario encima."""
+
+        snapshot = load_all_progress()
+
+        # Si una compactación quedó a medias, su diario aún no está en la instantánea
+        leftover = _read_journal(_compacting_file())
+        if leftover:
+            snapshot = _merge_progress(snapshot, leftover)
+            save_all_progress(snapshot)
+        _compacting_file().unlink(missing_ok=True)
+
+        pending = _read_journal(JOURNAL_FILE)
+        self._entries = len(pending)
+        return _merge_progress(snapshot, pending)
+
+    def append(self, items: Iterable[UserProgress]) -> None:
+        """Añadir el estado actual de cada ítem al diario (coste constante por ítem)."""
+
+        lines = [
+            json.dumps(_serialize_progress_item(p), ensure_ascii=False, separators=(",", ":"))
+            for p in items
+        ]
+        if not lines:
+            return
+
+        with self._lock:
+            if self._handle is None:
+                self._handle = JOURNAL_FILE.open("a", encoding="utf-8")
+            self._handle.write("\n".join(lines) + "\n")
+            self._handle.flush()
+            self._entries += len(lines)
+            needs_compaction = self._entries >= COMPACT_THRESHOLD
+
+        if needs_compaction:
+            self.compact(background=True)
+
+    def compact(self, background: bool = False) -> None:
+        """Integrar el diario en una nueva instantánea de progress.json.
+
+        El diario actual se aparta (renombrado) antes de escribir, de modo que
+        las respuestas que lleguen mientras tanto van a un diario nuevo.
+        """
+
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+            if not JOURNAL_FILE.exists():
+                return
+            os.replace(JOURNAL_FILE, _compacting_file())
+            self._entries = 0
+
+        def run() -> None:
+            merged = _merge_progress(load_all_progress(), _read_journal(_compacting_file()))
+            save_all_progress(merged)
+            _compacting_file().unlink(missing_ok=True)
+
+        if background:
+            self._compaction = threading.Thread(target=run, daemon=True)
+            self._compaction.start()
+        else:
+            run()
+
+    def close(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+class ProgressStore:
+    """Progreso en memoria indexado por `(user_id, item_type, item_id)`.
+
+    Se carga una sola vez por proceso (ver `get_progress_store`) y permite
+    consultar y actualizar un registro en O(1) sin volver a leer el fichero.
+    La persistencia se delega en un hilo de escritura (`PersistenceWorker`)
+    sobre el backend de almacenamiento activo, así que `record` no bloquea.
+    """
+
+    def __init__(
+        self,
+        items: Optional[List[UserProgress]] = None,
+        backend: Optional["StorageBackend"] = None,
+    ) -> None:
+        self._index: Dict[ProgressKey, UserProgress] = {}
+        self._backend = backend
+        self._writer: Optional["PersistenceWorker"] = None
+        for p in items or []:
+            self._index[progress_key(p.user_id, p.item_type, p.item_id)] = p
+
+    @classmethod
+    def load(cls, backend: "StorageBackend") -> "ProgressStore":
+        return cls(backend.load_progress(), backend)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, user_id: int, item_type: ItemType, item_id: int) -> Optional[UserProgress]:
+        return self._index.get(progress_key(user_id, item_type, item_id))
+
+    def get_or_create(self, user_id: int, item_type: ItemType, item_id: int) -> UserProgress:
+        key = progress_key(user_id, item_type, item_id)
+        item = self._index.get(key)
+        if item is None:
+            item = UserProgress(user_id=user_id, item_type=item_type, item_id=item_id)
+            self._index[key] = item
+        return item
+
+    def all(self) -> List[UserProgress]:
+        return list(self._index.values())
+
+    def record(self, items: Iterable[UserProgress]) -> None:
+        """Encolar el estado actual de los ítems indicados para guardarlo."""
+
+        if self._backend is None:
+            return
+        self._get_writer().submit(items)
+
+    def defer(self, task: Callable[[], None]) -> None:
+        """Ejecutar otra escritura (`task`) en el hilo de escritura del progreso.
+
+        Así no bloquea la interfaz y queda ordenada con el resto; sin backend
+        se ejecuta en el momento.
+        """
+
+        if self._backend is None:
+            task()
+            return
+        self._get_writer().submit_task(task)
+
+    def _get_writer(self) -> "PersistenceWorker":
+        if self._writer is None:
+            from app.storage.writer import PersistenceWorker
+
+            self._writer = PersistenceWorker(self._backend)  # type: ignore[arg-type]
+        return self._writer
+
+    def flush(self) -> None:
+        """Esperar a que todo lo encolado esté escrito en el backend."""
+
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+
+
+_store: Optional[ProgressStore] = None
+
+
+def get_progress_store() -> ProgressStore:
+    """Devolver el `ProgressStore` del proceso, cargándolo la primera vez."""
+
+    from app.storage.backend import get_backend
+
+    global _store
+    if _store is None:
+        _store = ProgressStore.load(get_backend())
+    return _store
+
+
+def close_progress_store() -> None:
+    """Volcar las escrituras pendientes del progreso (p.ej. al cerrar la app)."""
+
+    if _store is not None:
+        _store.close()
@@ -21,6 +21,11 @@ def _serialize_session(s: StudySession) -> Dict:
         "end_time": s.end_time.strftime(_DATE_FMT),
         "correct_count": s.correct_count,
         "total_questions": s.total_questions,
+        "seed": s.seed,
+        "difficulty": s.difficulty,
+        "weighted": s.weighted,
+        "adaptive": s.adaptive,
+        "picks": s.picks,
     }
 
 
@@ -32,10 +37,27 @@ def _deserialize_session(data: Dict) -> StudySession:
         end_time=datetime.strptime(data["end_time"], _DATE_FMT),
         correct_count=data.get("correct_count", 0),
         total_questions=data.get("total_questions", 0),
+        seed=data.get("seed"),
+        difficulty=data.get("difficulty"),
+        weighted=bool(data.get("weighted", False)),
+        adaptive=bool(data.get("adaptive", False)),
+        picks=data.get("picks"),
     )
 
 
 def load_sessions() -> List[StudySession]:
+    from app.storage.backend import get_backend
+
+    return get_backend().load_sessions()
+
+
+def append_session(session: StudySession) -> None:
+    from app.storage.backend import get_backend
+
+    get_backend().append_session(session)
+
+
+def load_sessions_json() -> List[StudySession]:
     if not SESSIONS_FILE.exists():
         return []
 
@@ -53,8 +75,8 @@ def save_sessions(sessions: List[StudySession]) -> None:
     )
 
 
-def append_session(session: StudySession) -> None:
-    sessions = load_sessions()
+def append_session_json(session: StudySession) -> None:
+    sessions = load_sessions_json()
     # Asignar id incremental sencillo
     next_id = max((s.id for s in sessions), default=0) + 1
     session.id = next_id
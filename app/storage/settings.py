@@ -1,17 +1,98 @@
 from __future__ import annotations
 
 import json
+import logging
+import threading
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional
 
 from app.core.models import Settings
 
 
+logger = logging.getLogger(__name__)
+
 BASE_DIR = Path(__file__).resolve().parents[2]
 SETTINGS_FILE = BASE_DIR / "settings.json"
 
 
+# Recibe (ajustes anteriores, ajustes nuevos)
+SettingsListener = Callable[[Settings, Settings], None]
+
+
+class SettingsService:
+    """Ajustes compartidos por toda la aplicación.
+
+    Se leen del almacenamiento una sola vez; `current` devuelve una copia de
+    los ajustes en memoria. `save` los guarda y avisa a los suscriptores,
+    que pueden aplicar el cambio en el momento (tema, idioma de ayuda...).
+    """
+
+    def __init__(self) -> None:
+        self._settings: Optional[Settings] = None
+        self._listeners: List[SettingsListener] = []
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Settings:
+        with self._lock:
+            if self._settings is None:
+                self._settings = load_settings()
+            return replace(self._settings)
+
+    def save(self, settings: Settings) -> None:
+        old = self.current
+        save_settings(settings)
+        with self._lock:
+            self._settings = replace(settings)
+            listeners = list(self._listeners)
+
+        new = replace(settings)
+        for listener in listeners:
+            try:
+                listener(old, new)
+            except Exception:
+                # Los ajustes ya están guardados: un suscriptor roto no debe
+                # dejar sin aviso a los demás ni llegar al diálogo de ajustes
+                logger.exception("Error en un suscriptor de ajustes")
+
+    def subscribe(self, listener: SettingsListener) -> Callable[[], None]:
+        """Registrar `listener`; devuelve la función para darse de baja."""
+
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+
+_service: Optional[SettingsService] = None
+
+
+def get_settings_service() -> SettingsService:
+    global _service
+    if _service is None:
+        _service = SettingsService()
+    return _service
+
+
 def load_settings() -> Settings:
+    from app.storage.backend import get_backend
+
+    return get_backend().load_settings()
+
+
+def save_settings(settings: Settings) -> None:
+    from app.storage.backend import get_backend
+
+    get_backend().save_settings(settings)
+
+
+def load_settings_json() -> Settings:
     if not SETTINGS_FILE.exists():
         return Settings()
 
@@ -23,7 +104,7 @@ def load_settings() -> Settings:
         return Settings()
 
 
-def save_settings(settings: Settings) -> None:
+def save_settings_json(settings: Settings) -> None:
     data = {
         "theme": settings.theme,
         "help_language": settings.help_language,
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from app.core.models import Settings, StudySession, UserProgress
+from app.storage.backend import StorageBackend
+from app.storage.item_params import ItemParamsRaw, load_item_params_json
+from app.storage.progress import LEARNED_LEVEL
+from app.storage.sessions import load_sessions_json
+from app.storage.settings import load_settings_json
+
+
+_DATE_FMT = "%Y-%m-%dT%H:%M:%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    user_id     INTEGER NOT NULL,
+    item_type   TEXT    NOT NULL,
+    item_id     INTEGER NOT NULL,
+    srs_level   INTEGER NOT NULL DEFAULT 0,
+    last_review TEXT,
+    right_count INTEGER NOT NULL DEFAULT 0,
+    wrong_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, item_type, item_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_progress_last_review ON progress (last_review);
+CREATE INDEX IF NOT EXISTS idx_progress_srs_level ON progress (item_type, srs_level);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_type    TEXT    NOT NULL,
+    start_time      TEXT    NOT NULL,
+    end_time        TEXT    NOT NULL,
+    correct_count   INTEGER NOT NULL DEFAULT 0,
+    total_questions INTEGER NOT NULL DEFAULT 0,
+    seed            INTEGER,
+    difficulty      TEXT,
+    weighted        INTEGER NOT NULL DEFAULT 0,
+    adaptive        INTEGER NOT NULL DEFAULT 0,
+    picks           TEXT
+);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS item_params (
+    item_key   TEXT    PRIMARY KEY,
+    difficulty REAL    NOT NULL,
+    responses  INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+_UPSERT_PROGRESS = """
+INSERT INTO progress (user_id, item_type, item_id, srs_level, last_review, right_count, wrong_count)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_id, item_type, item_id) DO UPDATE SET
+    srs_level = excluded.srs_level,
+    last_review = excluded.last_review,
+    right_count = excluded.right_count,
+    wrong_count = excluded.wrong_count
+"""
+
+_SELECT_PROGRESS = """
+SELECT user_id, item_type, item_id, srs_level, last_review, right_count, wrong_count
+FROM progress
+"""
+
+# Mismo umbral de "aprendido" que ProgressStore.stats
+_PROGRESS_STATS = f"""
+SELECT item_type,
+       COUNT(*),
+       SUM(CASE WHEN srs_level >= {int(LEARNED_LEVEL)} THEN 1 ELSE 0 END),
+       SUM(right_count),
+       SUM(wrong_count)
+FROM progress
+GROUP BY item_type
+"""
+
+# Columnas añadidas a `sessions` después de la primera versión del esquema
+_SESSION_COLUMNS = (
+    ("seed", "INTEGER"),
+    ("difficulty", "TEXT"),
+    ("weighted", "INTEGER NOT NULL DEFAULT 0"),
+    ("adaptive", "INTEGER NOT NULL DEFAULT 0"),
+    ("picks", "TEXT"),
+)
+
+_UPSERT_ITEM_PARAMS = """
+INSERT INTO item_params (item_key, difficulty, responses)
+VALUES (?, ?, ?)
+ON CONFLICT (item_key) DO UPDATE SET
+    difficulty = excluded.difficulty,
+    responses = excluded.responses
+"""
+
+_INSERT_SESSION = """
+INSERT INTO sessions (
+    session_type, start_time, end_time, correct_count, total_questions,
+    seed, difficulty, weighted, adaptive, picks
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _progress_row(p: UserProgress) -> tuple:
+    return (
+        p.user_id,
+        p.item_type,
+        p.item_id,
+        p.srs_level,
+        p.last_review.strftime(_DATE_FMT) if p.last_review else None,
+        p.right_count,
+        p.wrong_count,
+    )
+
+
+def _session_row(s: StudySession) -> tuple:
+    return (
+        s.session_type,
+        s.start_time.strftime(_DATE_FMT),
+        s.end_time.strftime(_DATE_FMT),
+        s.correct_count,
+        s.total_questions,
+        s.seed,
+        s.difficulty,
+        int(s.weighted),
+        int(s.adaptive),
+        json.dumps(s.picks) if s.picks is not None else None,
+    )
+
+
+class SqliteBackend(StorageBackend):
+    """Almacenamiento en una base de datos SQLite local (modo WAL).
+
+    El progreso se guarda fila a fila con un upsert sobre la clave primaria
+    `(user_id, item_type, item_id)`; las estadísticas se calculan con GROUP BY.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_file: Path) -> None:
+        # La conexión se comparte entre hilos; el acceso se serializa con el lock
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._upgrade_schema()
+            self._conn.commit()
+
+    def _upgrade_schema(self) -> None:
+        # Bases de datos creadas antes de guardar la semilla y el modo del examen
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        for name, definition in _SESSION_COLUMNS:
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE sessions ADD COLUMN {name} {definition}")
+
+    def load_progress(self) -> List[UserProgress]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_PROGRESS).fetchall()
+        return [
+            UserProgress(
+                user_id=user_id,
+                item_type=item_type,
+                item_id=item_id,
+                srs_level=srs_level,
+                last_review=datetime.strptime(last_review, _DATE_FMT) if last_review else None,
+                right_count=right_count,
+                wrong_count=wrong_count,
+            )
+            for user_id, item_type, item_id, srs_level, last_review, right_count, wrong_count in rows
+        ]
+
+    def write_progress(self, items: List[UserProgress]) -> None:
+        if not items:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_PROGRESS, [_progress_row(p) for p in items])
+
+    def progress_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._conn.execute(_PROGRESS_STATS).fetchall()
+        return {
+            item_type: {
+                "count": count,
+                "learned": learned or 0,
+                "right": right or 0,
+                "wrong": wrong or 0,
+            }
+            for item_type, count, learned, right, wrong in rows
+        }
+
+    def load_sessions(self) -> List[StudySession]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, session_type, start_time, end_time, correct_count, total_questions, "
+                "seed, difficulty, weighted, adaptive, picks "
+                "FROM sessions"
+            ).fetchall()
+        return [
+            StudySession(
+                id=session_id,
+                session_type=session_type,
+                start_time=datetime.strptime(start_time, _DATE_FMT),
+                end_time=datetime.strptime(end_time, _DATE_FMT),
+                correct_count=correct_count,
+                total_questions=total_questions,
+                seed=seed,
+                difficulty=difficulty,
+                weighted=bool(weighted),
+                adaptive=bool(adaptive),
+                picks=json.loads(picks) if picks else None,
+            )
+            for (
+                session_id, session_type, start_time, end_time, correct_count, total_questions,
+                seed, difficulty, weighted, adaptive, picks,
+            ) in rows
+        ]
+
+    def append_session(self, session: StudySession) -> None:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(_INSERT_SESSION, _session_row(session))
+            session.id = cursor.lastrowid
+
+    def load_settings(self) -> Settings:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM settings").fetchall()
+        known = {f.name for f in fields(Settings)}
+        return Settings(**{key: value for key, value in rows if key in known})
+
+    def save_settings(self, settings: Settings) -> None:
+        rows = [(f.name, getattr(settings, f.name)) for f in fields(Settings)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO settings (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                rows,
+            )
+
+    def load_item_params(self) -> ItemParamsRaw:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_key, difficulty, responses FROM item_params"
+            ).fetchall()
+        return {key: (difficulty, responses) for key, difficulty, responses in rows}
+
+    def write_item_params(self, params: ItemParamsRaw) -> None:
+        rows = [(key, b, n) for key, (b, n) in params.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_ITEM_PARAMS, rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(db_file: Path) -> None:
+    """Migración única de progress.json, sessions.json, settings.json e
+    item_params.json a SQLite.
+
+    Los ficheros JSON se conservan como copia de seguridad. Si la base de datos
+    ya existe no se hace nada, para no duplicar sesiones.
+    """
+
+    if db_file.exists():
+        return
+
+    # Integrar primero el diario pendiente para migrar el progreso completo
+    from app.storage.progress import ProgressJournal
+
+    progress = ProgressJournal().load()
+    sessions = load_sessions_json()
+    settings = load_settings_json()
+    item_params = load_item_params_json()
+
+    # Crear en un temporal: la base de datos solo aparece si la migración termina
+    tmp_file = db_file.with_suffix(".db.tmp")
+    tmp_file.unlink(missing_ok=True)
+    backend = SqliteBackend(tmp_file)
+    try:
+        backend.write_progress(progress)
+        for session in sorted(sessions, key=lambda s: s.id):
+            backend.append_session(session)
+        backend.save_settings(settings)
+        backend.write_item_params(item_params)
+        with backend._lock:
+            backend._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            backend._conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        backend.close()
+    tmp_file.replace(db_file)
+
+
+if __name__ == "__main__":
+    from app.storage.backend import DB_FILE
+
+    migrate_json_to_sqlite(DB_FILE)
+    print(f"Datos migrados a {DB_FILE}")
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.models import UserProgress
+from app.storage.backend import StorageBackend
+from app.storage.progress import ProgressKey, progress_key
+
+
+logger = logging.getLogger(__name__)
+
+# Tiempo que se esperan más respuestas antes de escribir un lote
+DEBOUNCE_SECONDS = 0.5
+# Un lote que falla se reintenta con esperas que se duplican hasta este máximo
+RETRY_MAX_SECONDS = 30.0
+# Intentos de escribir lo pendiente al parar antes de darlo por perdido
+STOP_ATTEMPTS = 3
+
+_STOP = object()
+
+
+class _Task:
+    def __init__(self, run: Callable[[], None]) -> None:
+        self.run = run
+
+
+class PersistenceWorker:
+    """Hilo único de escritura en segundo plano (write-behind).
+
+    La interfaz entrega los registros de progreso por una cola (`submit`) y
+    sigue respondiendo; el hilo los agrupa durante `DEBOUNCE_SECONDS` y los
+    escribe de una vez en el backend. Otras escrituras se encolan con
+    `submit_task` y se ejecutan en el mismo hilo, en orden. `flush` y `stop`
+    garantizan que todo lo pendiente llega a disco (p.ej. al cerrar la ventana).
+    """
+
+    def __init__(self, backend: StorageBackend, debounce: float = DEBOUNCE_SECONDS) -> None:
+        self._backend = backend
+        self._debounce = debounce
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._pending: Dict[ProgressKey, UserProgress] = {}
+        # Escrituras fallidas seguidas (para la espera entre reintentos)
+        self._failures = 0
+        self._thread = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: Iterable[UserProgress]) -> None:
+        # Copias: la interfaz puede seguir modificando los originales
+        self._queue.put([replace(p) for p in items])
+
+    def submit_task(self, task: Callable[[], None]) -> None:
+        """Ejecutar `task` en el hilo de escritura, después de lo ya encolado."""
+
+        self._queue.put(_Task(task))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Escribir ya todo lo pendiente y esperar a que termine."""
+
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def stop(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self, batch: List[UserProgress]) -> None:
+        for p in batch:
+            self._pending[progress_key(p.user_id, p.item_type, p.item_id)] = p
+
+    def _write_pending(self) -> bool:
+        """Escribir lo pendiente; si falla se conserva para reintentarlo."""
+
+        if not self._pending:
+            return True
+        try:
+            self._backend.write_progress(list(self._pending.values()))
+        except Exception:
+            self._failures += 1
+            logger.exception(
+                "No se pudo guardar el progreso (%d registros, intento %d)",
+                len(self._pending),
+                self._failures,
+            )
+            return False
+        self._pending.clear()
+        self._failures = 0
+        return True
+
+    def _retry_delay(self) -> float:
+        return min(self._debounce * 2 ** self._failures, RETRY_MAX_SECONDS)
+
+    def _next_deadline(self) -> Optional[float]:
+        # Tras escribir no hay plazo; tras un fallo, se reintenta con espera creciente
+        if self._write_pending():
+            return None
+        return time.monotonic() + self._retry_delay()
+
+    def _write_on_stop(self) -> None:
+        for attempt in range(STOP_ATTEMPTS):
+            if self._write_pending():
+                return
+            if attempt + 1 < STOP_ATTEMPTS:
+                # Espera corta: se está cerrando la aplicación
+                time.sleep(self._debounce)
+
+        logger.error(
+            "Se pierde el progreso sin guardar de %d ítems: %s",
+            len(self._pending),
+            ", ".join(f"{item_type}:{item_id}" for _user, item_type, item_id in sorted(self._pending)),
+        )
+
+    def _run(self) -> None:
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                msg = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                msg = None
+
+            if msg is None:
+                # Venció el plazo del lote (o el del reintento)
+                deadline = self._next_deadline()
+                continue
+
+            if msg is _STOP:
+                self._write_on_stop()
+                return
+
+            if isinstance(msg, threading.Event):
+                deadline = self._next_deadline()
+                msg.set()
+                continue
+
+            if isinstance(msg, _Task):
+                deadline = self._next_deadline()
+                try:
+                    msg.run()
+                except Exception:
+                    logger.exception("Error en una escritura en segundo plano")
+                continue
+
+            self._collect(msg)  # type: ignore[arg-type]
+            if deadline is None:
+                deadline = time.monotonic() + self._debounce
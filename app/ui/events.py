@@ -0,0 +1,5 @@
+# Eventos virtuales de Tk que las vistas generan sobre sí mismas; la ventana
+# principal los recibe (a través de la toplevel) y refresca las vistas en caché.
+
+# Se ha añadido o modificado contenido (vocabulario, kanji, gramática)
+CONTENT_CHANGED = "<<ContentChanged>>"
\ No newline at end of file
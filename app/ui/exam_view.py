@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+import logging
 from datetime import datetime
 
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-from app.core.exam_engine import Question, generate_exam
-from app.storage.settings import load_settings
-from app.core.models import StudySession
+from app.core.adaptive_exam import AdaptiveExam
+from app.core.exam_engine import Question, new_exam_seed
+from app.core.exam_jobs import ExamJob, start_adaptive_job, start_exam_job
+from app.core.event_bus import REVIEW_RECORDED, ReviewRecorded, event_bus, publish_exam_finished
+from app.core.irt import submit_exam_responses
+from app.storage.settings import get_settings_service
+from app.core.models import Settings, StudySession
+from app.core.srs import update_progress_batch
 from app.storage.sessions import append_session
+from app.ui.help_text import HelpText
+from app.ui.option_group import OptionGroup
+
+
+logger = logging.getLogger(__name__)
+
+SPINNER_FRAMES = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+# Cada cuánto se comprueba si el examen en preparación ha terminado
+POLL_MS = 100
+# Elegir antes los ítems que el usuario lleva peor (se guardan con la sesión)
+WEIGHTED_EXAMS = True
 
 
 class ExamView(ttk.Frame):
@@ -17,72 +34,120 @@ class ExamView(ttk.Frame):
     - Genera un examen de preguntas mezcladas (vocab, kanji, gramática).
     - Permite responder en formato test (elección múltiple).
     - Al final muestra puntuación y tiempo empleado.
+    - En modo adaptativo (CAT) elige cada pregunta según la habilidad estimada
+      y termina cuando la estimación es suficientemente precisa.
+
+    Los exámenes se generan en un hilo aparte (la ventana no se congela) y,
+    mientras se revisan los resultados, se prepara ya el siguiente.
     """
 
     def __init__(self, master: ttk.Frame) -> None:
         super().__init__(master)
-        self.settings = load_settings()
-        self.help_lang: str = (self.settings.help_language or "es").lower()
+        settings_service = get_settings_service()
+        self.settings = settings_service.current
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self)
         self.questions: list[Question] = []
         self.current_index: int | None = None
         self.selected_var = ttk.IntVar(value=-1)
         self.start_time: datetime | None = None
+        # Semilla y modo del examen en curso, para guardarlos con la sesión
+        self.exam_seed: int | None = None
+        self.exam_difficulty: str | None = None
+        self.exam_picks: list[int] | None = None
         self.correct_count: int = 0
         self.answers: list[int] = []  # índice elegido por el usuario
+        self.answer_times: list[datetime] = []
+        self.adaptive_var = ttk.BooleanVar(value=False)
+        self.adaptive: AdaptiveExam | None = None
+
+        # Examen en preparación (el que se espera o el pregenerado)
+        self._job: ExamJob | None = None
+        self._job_params: tuple | None = None
+        self._waiting = False
+        self._spinner_step = 0
+        # Hubo respuestas después de elegir los ítems ponderados del pregenerado
+        self._picks_stale = False
 
         self.question_label: ttk.Label | None = None
-        self.options_frame: ttk.Frame | None = None
+        self.options_group: OptionGroup | None = None
         self.status_label: ttk.Label | None = None
         self.result_label: ttk.Label | None = None
 
         self._create_widgets()
 
-    def _create_widgets(self) -> None:
-        if self.help_lang == "en":
-            header_text = "模擬テスト / Mock exam"
-        elif self.help_lang == "none":
-            header_text = "模擬テスト"
-        else:
-            header_text = "模擬テスト (Examen simulado)"
+        self.bind("<Destroy>", self._on_destroy, add="+")
+        # Una dificultad nueva se aplica al siguiente examen sin reconstruir la vista
+        self._unsubscribe_settings = settings_service.subscribe(self._on_settings_changed)
+        self._unsubscribe_review = event_bus.subscribe(REVIEW_RECORDED, self._on_review)
 
+    def _create_widgets(self) -> None:
         header = ttk.Label(
             self,
-            text=header_text,
             font=("Yu Gothic UI", 18, "bold"),
         )
+        self.help.bind(
+            header,
+            es="模擬テスト (Examen simulado)",
+            en="模擬テスト / Mock exam",
+            none="模擬テスト",
+        )
         header.pack(side=TOP, pady=10)
 
-        if self.help_lang == "en":
-            info_text = "語彙・漢字・文法の混合問題です。難易度により問題数が変わります。"
-        elif self.help_lang == "none":
-            info_text = "語彙・漢字・文法の混合問題です。"
-        else:
-            info_text = "語彙・漢字・文法の混合問題です。難易度により問題数が変わります。"
-
         info = ttk.Label(
             self,
-            text=info_text,
             font=("Yu Gothic UI", 11),
         )
+        self.help.bind(
+            info,
+            es="語彙・漢字・文法の混合問題です。難易度により問題数が変わります。",
+            en="語彙・漢字・文法の混合問題です。難易度により問題数が変わります。",
+            none="語彙・漢字・文法の混合問題です。",
+        )
         info.pack(side=TOP, pady=5)
 
         control_frame = ttk.Frame(self)
         control_frame.pack(pady=5)
 
-        if self.help_lang == "en":
-            start_text = "テスト開始 / Start exam"
-        elif self.help_lang == "none":
-            start_text = "テスト開始"
-        else:
-            start_text = "テスト開始 / Iniciar examen"
-
-        start_btn = ttk.Button(
+        self.start_button = ttk.Button(
             control_frame,
-            text=start_text,
             bootstyle="primary",
             command=self._start_exam,
         )
-        start_btn.pack(side=LEFT, padx=5)
+        self.help.bind(
+            self.start_button,
+            es="テスト開始 / Iniciar examen",
+            en="テスト開始 / Start exam",
+            none="テスト開始",
+        )
+        self.start_button.pack(side=LEFT, padx=5)
+
+        self.cancel_button = ttk.Button(
+            control_frame,
+            bootstyle="secondary-outline",
+            command=self._cancel_generation,
+            state=DISABLED,
+        )
+        self.help.bind(
+            self.cancel_button,
+            es="キャンセル / Cancelar",
+            en="キャンセル / Cancel",
+            none="キャンセル",
+        )
+        self.cancel_button.pack(side=LEFT, padx=5)
+
+        adaptive_check = ttk.Checkbutton(
+            control_frame,
+            variable=self.adaptive_var,
+            bootstyle="round-toggle",
+        )
+        self.help.bind(
+            adaptive_check,
+            es="適応モード / Adaptativo",
+            en="適応モード / Adaptive",
+            none="適応モード",
+        )
+        adaptive_check.pack(side=LEFT, padx=5)
 
         self.status_label = ttk.Label(
             self,
@@ -101,38 +166,38 @@ class ExamView(ttk.Frame):
         )
         self.question_label.pack(padx=10, pady=10, anchor=NW)
 
-        self.options_frame = ttk.Frame(self)
-        self.options_frame.pack(padx=20, pady=5, anchor=NW)
+        self.options_group = OptionGroup(self, self.selected_var)
+        self.options_group.pack(padx=20, pady=5, anchor=NW)
 
         nav_frame = ttk.Frame(self)
         nav_frame.pack(pady=10)
 
-        if self.help_lang == "en":
-            next_text = "答えを送信 / Next"
-            finish_text = "テスト終了 / Finish"
-        elif self.help_lang == "none":
-            next_text = "答えを送信"
-            finish_text = "テスト終了"
-        else:
-            next_text = "答えを送信 / Siguiente"
-            finish_text = "テスト終了 / Finalizar"
-
         self.next_button = ttk.Button(
             nav_frame,
-            text=next_text,
             bootstyle="success-outline",
             command=self._submit_and_next,
             state=DISABLED,
         )
+        self.help.bind(
+            self.next_button,
+            es="答えを送信 / Siguiente",
+            en="答えを送信 / Next",
+            none="答えを送信",
+        )
         self.next_button.pack(side=LEFT, padx=5)
 
         self.finish_button = ttk.Button(
             nav_frame,
-            text=finish_text,
             bootstyle="secondary-outline",
             command=self._finish_exam,
             state=DISABLED,
         )
+        self.help.bind(
+            self.finish_button,
+            es="テスト終了 / Finalizar",
+            en="テスト終了 / Finish",
+            none="テスト終了",
+        )
         self.finish_button.pack(side=LEFT, padx=5)
 
         self.result_label = ttk.Label(
@@ -147,7 +212,7 @@ class ExamView(ttk.Frame):
 
     # Lógica del examen
 
-    def _start_exam(self) -> None:
+    def _exam_params(self) -> tuple:
         difficulty = (self.settings.difficulty or "normal").lower()
         if difficulty == "easy":
             total_questions = 10
@@ -155,9 +220,134 @@ class ExamView(ttk.Frame):
             total_questions = 30
         else:
             total_questions = 20
+        return difficulty, total_questions, bool(self.adaptive_var.get())
+
+    def _submit_job(self, params: tuple) -> None:
+        difficulty, total_questions, adaptive = params
+        # La semilla se guarda con la sesión para poder regenerar el mismo examen
+        seed = new_exam_seed()
+        if adaptive:
+            self._job = start_adaptive_job(total_questions, seed)
+        else:
+            self._job = start_exam_job(total_questions, seed, difficulty, weighted=WEIGHTED_EXAMS)
+        self._job_params = params + (seed,)
+        self._picks_stale = False
+
+    def _start_exam(self) -> None:
+        if self._waiting:
+            return
 
-        self.questions = generate_exam(total_questions=total_questions)
+        params = self._exam_params()
+        # Reutilizar el examen pregenerado si se pidió con los mismos ajustes y,
+        # si es ponderado, no ha cambiado el progreso con el que se eligió
+        stale = self._picks_stale and WEIGHTED_EXAMS and not params[2]
+        if self._job is None or self._job_params is None or self._job_params[:3] != params or stale:
+            self._cancel_job()
+            self._submit_job(params)
+
+        self._waiting = True
+        self._spinner_step = 0
+        self.start_button.configure(state=DISABLED)
+        self.cancel_button.configure(state=NORMAL)
+        self.next_button.configure(state=DISABLED)
+        self.finish_button.configure(state=DISABLED)
+        self._poll_job()
+
+    def _poll_job(self) -> None:
+        if not self._waiting or self._job is None:
+            return
+
+        if not self._job.done():
+            if self.status_label is not None:
+                frame = SPINNER_FRAMES[self._spinner_step % len(SPINNER_FRAMES)]
+                self.status_label.configure(text=f"{frame} 問題を作成中…", bootstyle="secondary")
+            self._spinner_step += 1
+            self.after(POLL_MS, self._poll_job)
+            return
+
+        job, params = self._job, self._job_params
+        self._job = None
+        self._job_params = None
+        self._waiting = False
+        self.start_button.configure(state=NORMAL)
+        self.cancel_button.configure(state=DISABLED)
+
+        try:
+            result = job.result()
+        except Exception:
+            logger.exception("Error al generar el examen")
+            if self.status_label is not None:
+                error_text = self.help.pick(
+                    es="試験を作成できませんでした (error al generar el examen)",
+                    en="試験を作成できませんでした (failed to generate the exam)",
+                    none="試験を作成できませんでした",
+                )
+                self.status_label.configure(text=error_text, bootstyle="danger")
+            return
+
+        difficulty, total_questions, adaptive, seed = params
+        self.exam_seed = seed
+        if adaptive:
+            self.adaptive, first = result
+            self.questions = [first] if first is not None else []
+            self.exam_difficulty = None
+            self.exam_picks = None
+        else:
+            self.adaptive = None
+            self.questions, self.exam_picks = result
+            self.exam_difficulty = difficulty
+        self._begin_exam(total_questions)
+
+    def refresh(self) -> None:
+        """El contenido ha cambiado: el examen en curso se conserva, el pregenerado se rehace."""
+
+        if self._job is not None and not self._waiting and self._job_params is not None:
+            params = self._job_params[:3]
+            self._cancel_job()
+            self._submit_job(params)
+
+    def _cancel_job(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
+        self._job = None
+        self._job_params = None
+
+    def _cancel_generation(self) -> None:
+        if not self._waiting:
+            return
+
+        self._cancel_job()
+        self._waiting = False
+        self.start_button.configure(state=NORMAL)
+        self.cancel_button.configure(state=DISABLED)
+        if self.status_label is not None:
+            if self.help.lang == "en":
+                cancel_text = "キャンセルしました (cancelled)"
+            elif self.help.lang == "none":
+                cancel_text = "キャンセルしました"
+            else:
+                cancel_text = "キャンセルしました (cancelado)"
+            self.status_label.configure(text=cancel_text, bootstyle="secondary")
+
+    def _on_settings_changed(self, _old: Settings, new: Settings) -> None:
+        self.settings = new
+
+    def _on_review(self, _event: ReviewRecorded) -> None:
+        # Los pesos por debilidad del pregenerado ya no son los actuales; se
+        # rehace al empezar (no en cada respuesta, que pueden ser muchas)
+        self._picks_stale = True
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is not self:
+            return
+        self._unsubscribe_settings()
+        self._unsubscribe_review()
+        self._waiting = False
+        self._cancel_job()
+
+    def _begin_exam(self, total_questions: int) -> None:
         self.answers = []
+        self.answer_times = []
         self.correct_count = 0
         self.current_index = 0 if self.questions else None
         self.start_time = datetime.now() if self.questions else None
@@ -171,8 +361,12 @@ class ExamView(ttk.Frame):
             return
 
         if self.status_label is not None:
+            if self.adaptive is not None:
+                count_text = f"問題数：最大{total_questions}問"
+            else:
+                count_text = f"問題数：{len(self.questions)}問"
             self.status_label.configure(
-                text=f"問題数：{len(self.questions)}問",
+                text=count_text,
                 bootstyle="info",
             )
 
@@ -193,21 +387,8 @@ class ExamView(ttk.Frame):
         if self.question_label is not None:
             self.question_label.configure(text=f"Q{self.current_index + 1}. {q.text}")
 
-        # Limpiar opciones anteriores
-        for child in self.options_frame.winfo_children():
-            child.destroy()
-
         self.selected_var.set(-1)
-
-        for i, choice in enumerate(q.choices):
-            rb = ttk.Radiobutton(
-                self.options_frame,
-                text=choice,
-                variable=self.selected_var,
-                value=i,
-                bootstyle="info-toolbutton",
-            )
-            rb.pack(anchor=NW, pady=2)
+        self.options_group.set_options(q.choices)
 
     def _submit_and_next(self) -> None:
         if self.current_index is None:
@@ -217,9 +398,9 @@ class ExamView(ttk.Frame):
         if selected == -1:
             # Nada seleccionado
             if self.status_label is not None:
-                if self.help_lang == "en":
+                if self.help.lang == "en":
                     warn_text = "選択肢を一つ選んでください (choose an option)"
-                elif self.help_lang == "none":
+                elif self.help.lang == "none":
                     warn_text = "選択肢を一つ選んでください"
                 else:
                     warn_text = "選択肢を一つ選んでください (selecciona una opción)"
@@ -232,18 +413,29 @@ class ExamView(ttk.Frame):
 
         q = self.questions[self.current_index]
         self.answers.append(selected)
+        self.answer_times.append(datetime.now())
 
         if selected == q.correct_index:
             self.correct_count += 1
 
+        if self.adaptive is not None:
+            self.adaptive.answer(selected == q.correct_index)
+            following = self.adaptive.next_question()
+            if following is not None:
+                self.questions.append(following)
+
         # Siguiente pregunta o finalizar
         self.current_index += 1
         if self.current_index >= len(self.questions):
             self._finish_exam()
         else:
             if self.status_label is not None:
+                if self.adaptive is not None:
+                    progress_text = f"Q{self.current_index}/{self.adaptive.max_questions}"
+                else:
+                    progress_text = f"Q{self.current_index}/{len(self.questions)}"
                 self.status_label.configure(
-                    text=f"Q{self.current_index}/{len(self.questions)}",
+                    text=progress_text,
                     bootstyle="secondary",
                 )
             self._show_current_question()
@@ -252,6 +444,12 @@ class ExamView(ttk.Frame):
         if not self.questions:
             return
 
+        # En modo adaptativo solo cuentan las preguntas respondidas
+        if self.adaptive is not None:
+            del self.questions[len(self.answers):]
+            if not self.questions:
+                return
+
         total = len(self.questions)
         now = datetime.now()
         elapsed_sec = 0
@@ -270,17 +468,36 @@ class ExamView(ttk.Frame):
                 end_time=now,
                 correct_count=self.correct_count,
                 total_questions=total,
+                seed=self.exam_seed,
+                difficulty=self.exam_difficulty,
+                weighted=self.exam_picks is not None,
+                adaptive=self.adaptive is not None,
+                picks=self.exam_picks,
             )
             append_session(session)
+            publish_exam_finished(session)
+
+        # Actualizar el SRS con todas las respuestas del examen en una sola escritura
+        update_progress_batch(
+            (q.source_type, q.source_item_id, ans == q.correct_index, answered_at)
+            for q, ans, answered_at in zip(self.questions, self.answers, self.answer_times)
+        )
+        # Recalibrar la dificultad de los ítems con este examen (en el hilo de escritura)
+        submit_exam_responses(
+            [
+                (q.source_type, q.source_item_id, ans == q.correct_index)
+                for q, ans in zip(self.questions, self.answers)
+            ]
+        )
 
-        if self.help_lang == "en":
+        if self.help.lang == "en":
             summary_lines = [
                 f"結果 / Result: {self.correct_count} / {total} 正解 ({score_pct}%)",
                 f"時間 / Time: {elapsed_sec} 秒",
                 "",
                 "間違えた問題 / Incorrect questions:",
             ]
-        elif self.help_lang == "none":
+        elif self.help.lang == "none":
             summary_lines = [
                 f"結果: {self.correct_count} / {total} 正解 ({score_pct}%)",
                 f"時間: {elapsed_sec} 秒",
@@ -295,15 +512,38 @@ class ExamView(ttk.Frame):
                 "間違えた問題 / Preguntas falladas:",
             ]
 
+        if self.adaptive is not None:
+            ratio, pass_prob = self.adaptive.readiness()
+            estimate = self.adaptive.estimate
+            if self.help.lang == "en":
+                readiness_lines = [
+                    f"能力推定 / Ability: {estimate.theta:+.2f} ± {estimate.standard_error:.2f}",
+                    f"推定正答率 / Expected accuracy: {ratio * 100:.0f}%",
+                    f"合格準備度 / Readiness: {pass_prob * 100:.0f}%",
+                ]
+            elif self.help.lang == "none":
+                readiness_lines = [
+                    f"能力推定: {estimate.theta:+.2f} ± {estimate.standard_error:.2f}",
+                    f"推定正答率: {ratio * 100:.0f}%",
+                    f"合格準備度: {pass_prob * 100:.0f}%",
+                ]
+            else:
+                readiness_lines = [
+                    f"能力推定 / Habilidad: {estimate.theta:+.2f} ± {estimate.standard_error:.2f}",
+                    f"推定正答率 / Aciertos esperados: {ratio * 100:.0f}%",
+                    f"合格準備度 / Preparación N5: {pass_prob * 100:.0f}%",
+                ]
+            summary_lines[2:2] = readiness_lines
+
         for idx, (q, ans) in enumerate(zip(self.questions, self.answers), start=1):
             if ans != q.correct_index:
                 correct_text = q.choices[q.correct_index]
                 user_text = q.choices[ans] if 0 <= ans < len(q.choices) else "(sin respuesta)"
-                if self.help_lang == "en":
+                if self.help.lang == "en":
                     line = (
                         f"Q{idx}: {q.text}\n  あなたの答え / Your answer: {user_text}\n  正解 / Correct: {correct_text}\n"
                     )
-                elif self.help_lang == "none":
+                elif self.help.lang == "none":
                     line = (
                         f"Q{idx}: {q.text}\n  あなたの答え: {user_text}\n  正解: {correct_text}\n"
                     )
@@ -325,9 +565,9 @@ class ExamView(ttk.Frame):
         self.finish_button.configure(state=DISABLED)
 
         if self.status_label is not None:
-            if self.help_lang == "en":
+            if self.help.lang == "en":
                 end_text = "テスト終了 (exam finished)"
-            elif self.help_lang == "none":
+            elif self.help.lang == "none":
                 end_text = "テスト終了"
             else:
                 end_text = "テスト終了 (examen finalizado)"
@@ -336,3 +576,7 @@ class ExamView(ttk.Frame):
                 text=end_text,
                 bootstyle="success",
             )
+
+        # Preparar ya el siguiente examen mientras se revisan los resultados
+        if self._job is None:
+            self._submit_job(self._exam_params())
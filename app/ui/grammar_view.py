@@ -4,8 +4,10 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
 from app.core.grammar_repository import load_grammar_points, save_grammar_points
+from app.core.models import GrammarPoint
 from app.core.srs import update_progress_for_item
-from app.storage.settings import load_settings
+from app.ui.events import CONTENT_CHANGED
+from app.ui.help_text import HelpText
 
 
 class GrammarView(ttk.Frame):
@@ -15,14 +17,16 @@ class GrammarView(ttk.Frame):
     escribir la partícula principal que se practica (は, が, を, に, で...).
     """
 
-    def __init__(self, master: ttk.Frame) -> None:
+    def __init__(self, master: ttk.Frame, rng: random.Random | None = None) -> None:
         super().__init__(master)
-        settings = load_settings()
-        self.help_lang: str = (settings.help_language or "es").lower()
+        self.rng = rng or random.Random()
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self)
         self.points = load_grammar_points()
-        self.current_index: int | None = None
+        self.current_point: GrammarPoint | None = None
         self.current_example: str | None = None
 
+        self.list_tree: ttk.Treeview | None = None
         self.title_label: ttk.Label | None = None
         self.desc_label: ttk.Label | None = None
         self.example_label: ttk.Label | None = None
@@ -32,52 +36,46 @@ class GrammarView(ttk.Frame):
         self._create_widgets()
 
     def _create_widgets(self) -> None:
-        if self.help_lang == "en":
-            header_text = "文法N5 / Grammar N5"
-        elif self.help_lang == "none":
-            header_text = "文法N5"
-        else:
-            header_text = "文法N5 (Gramática N5)"
-
         header = ttk.Label(
             self,
-            text=header_text,
             font=("Yu Gothic UI", 18, "bold"),
         )
+        self.help.bind(
+            header,
+            es="文法N5 (Gramática N5)",
+            en="文法N5 / Grammar N5",
+            none="文法N5",
+        )
         header.pack(side=TOP, pady=10)
 
         # Botón para añadir nuevo punto gramatical
         add_frame = ttk.Frame(self)
         add_frame.pack(fill=X, padx=10)
 
-        if self.help_lang == "en":
-            add_text = "文法ポイントを追加 / Add grammar point"
-        elif self.help_lang == "none":
-            add_text = "文法ポイントを追加"
-        else:
-            add_text = "文法ポイントを追加 / Añadir gramática"
-
         add_btn = ttk.Button(
             add_frame,
-            text=add_text,
             bootstyle="info-outline",
             command=self._open_add_grammar_dialog,
         )
+        self.help.bind(
+            add_btn,
+            es="文法ポイントを追加 / Añadir gramática",
+            en="文法ポイントを追加 / Add grammar point",
+            none="文法ポイントを追加",
+        )
         add_btn.pack(side=RIGHT)
 
         if not self.points:
-            if self.help_lang == "en":
-                msg_text = "文法データがありません (no grammar data)"
-            elif self.help_lang == "none":
-                msg_text = "文法データがありません"
-            else:
-                msg_text = "文法データがありません (no hay datos de gramática)"
-
             msg = ttk.Label(
                 self,
-                text=msg_text,
                 bootstyle="danger",
             )
+            self.help.bind(
+                msg,
+                es="文法データがありません (no hay datos de gramática)",
+                en="文法データがありません (no grammar data)",
+                none="文法データがありません",
+            )
             msg.pack(pady=20)
             return
 
@@ -88,20 +86,20 @@ class GrammarView(ttk.Frame):
         exercise_tab = ttk.Frame(notebook)
 
         notebook.add(list_tab, text="一覧 / Lista")
-        if self.help_lang == "en":
-            exercise_label = "練習 / Practice"
-        elif self.help_lang == "none":
-            exercise_label = "練習"
-        else:
-            exercise_label = "練習 / Ejercicios"
-
-        notebook.add(exercise_tab, text=exercise_label)
+        notebook.add(exercise_tab)
+        self.help.bind(
+            exercise_tab,
+            es="練習 / Ejercicios",
+            en="練習 / Practice",
+            none="練習",
+            setter=lambda text: notebook.tab(exercise_tab, text=text),
+        )
 
         self._build_list_tab(list_tab)
         self._build_exercise_tab(exercise_tab)
 
     def _build_list_tab(self, parent: ttk.Frame) -> None:
-        tree = ttk.Treeview(
+        self.list_tree = tree = ttk.Treeview(
             parent,
             columns=("title", "desc", "note"),
             show="headings",
@@ -115,24 +113,41 @@ class GrammarView(ttk.Frame):
         tree.column("desc", width=240)
         tree.column("note", width=260)
 
-        for p in self.points:
-            tree.insert("", END, values=(p.title_jp, p.description_simple_jp, p.note_es))
+        self._fill_list_tree()
 
         tree.pack(fill=BOTH, expand=YES, padx=5, pady=5)
 
-    def _build_exercise_tab(self, parent: ttk.Frame) -> None:
-        if self.help_lang == "en":
-            info_text = "例文を読んで、使われている助詞を入力してください (type the particle)"
-        elif self.help_lang == "none":
-            info_text = "例文を読んで、使われている助詞を入力してください"
-        else:
-            info_text = "例文を読んで、使われている助詞を入力してください (escribe la partícula)"
+    def _fill_list_tree(self) -> None:
+        if self.list_tree is None:
+            return
+
+        self.list_tree.delete(*self.list_tree.get_children())
+        for p in self.points:
+            self.list_tree.insert("", END, values=(p.title_jp, p.description_simple_jp, p.note_es))
+
+    def refresh(self) -> None:
+        """Recargar la gramática tras un cambio hecho en otra vista (conserva el ejercicio en curso)."""
+
+        self.points = load_grammar_points()
+        if self.list_tree is None:
+            # Se construyó sin datos: no hay estado que conservar
+            for child in self.winfo_children():
+                child.destroy()
+            self._create_widgets()
+            return
+        self._fill_list_tree()
 
+    def _build_exercise_tab(self, parent: ttk.Frame) -> None:
         info = ttk.Label(
             parent,
-            text=info_text,
             font=("Yu Gothic UI", 11),
         )
+        self.help.bind(
+            info,
+            es="例文を読んで、使われている助詞を入力してください (escribe la partícula)",
+            en="例文を読んで、使われている助詞を入力してください (type the particle)",
+            none="例文を読んで、使われている助詞を入力してください",
+        )
         info.pack(side=TOP, pady=5)
 
         self.title_label = ttk.Label(
@@ -159,18 +174,16 @@ class GrammarView(ttk.Frame):
         )
         self.example_label.pack(pady=10)
 
-        if self.help_lang == "en":
-            entry_help = "助詞をひらがなで入力してください (type the particle in hiragana):"
-        elif self.help_lang == "none":
-            entry_help = "助詞をひらがなで入力してください"
-        else:
-            entry_help = "助詞をひらがなで入力してください (escribe la partícula en hiragana):"
-
         entry_label = ttk.Label(
             parent,
-            text=entry_help,
             font=("Yu Gothic UI", 10),
         )
+        self.help.bind(
+            entry_label,
+            es="助詞をひらがなで入力してください (escribe la partícula en hiragana):",
+            en="助詞をひらがなで入力してください (type the particle in hiragana):",
+            none="助詞をひらがなで入力してください",
+        )
         entry_label.pack()
 
         self.answer_entry = ttk.Entry(parent, width=10)
@@ -265,8 +278,6 @@ class GrammarView(ttk.Frame):
                 )
                 return
 
-            from app.core.models import GrammarPoint
-
             next_id = max((p.id for p in self.points), default=0) + 1
             new_point = GrammarPoint(
                 id=next_id,
@@ -278,6 +289,7 @@ class GrammarView(ttk.Frame):
 
             self.points.append(new_point)
             save_grammar_points(self.points)
+            self.event_generate(CONTENT_CHANGED)
 
             info_label.configure(
                 text="文法ポイントを保存しました (punto de gramática guardado)",
@@ -309,13 +321,12 @@ class GrammarView(ttk.Frame):
         if not self.points:
             return
 
-        self.current_index = random.randrange(len(self.points))
-        point = self.points[self.current_index]
+        point = self.current_point = self.rng.choice(self.points)
 
         if not point.examples:
             self.current_example = None
         else:
-            self.current_example = random.choice(point.examples)
+            self.current_example = self.rng.choice(point.examples)
 
         if self.title_label is not None:
             self.title_label.configure(text=f"文法ポイント: {point.title_jp}")
@@ -335,22 +346,22 @@ class GrammarView(ttk.Frame):
 
     def _check_answer(self) -> None:
         if (
-            self.current_index is None
+            self.current_point is None
             or self.answer_entry is None
             or self.feedback_label is None
         ):
             return
 
-        point = self.points[self.current_index]
+        point = self.current_point
         user_answer = self.answer_entry.get().strip()
         correct = point.title_jp.strip()
 
         is_correct = user_answer == correct
 
         if is_correct:
-            if self.help_lang == "en":
+            if self.help.lang == "en":
                 fb_text = f"正解です！ ({correct})"
-            elif self.help_lang == "none":
+            elif self.help.lang == "none":
                 fb_text = f"正解です！ ({correct})"
             else:
                 fb_text = f"正解です！ ({correct}) - {point.note_es}"
@@ -360,9 +371,9 @@ class GrammarView(ttk.Frame):
                 bootstyle="success",
             )
         else:
-            if self.help_lang == "en":
+            if self.help.lang == "en":
                 fb_text = f"ちがいます… 正しい助詞: {correct}"
-            elif self.help_lang == "none":
+            elif self.help.lang == "none":
                 fb_text = f"ちがいます… 正しい助詞: {correct}"
             else:
                 fb_text = f"ちがいます… 正しい助詞: {correct}  ({point.note_es})"
@@ -0,0 +1,86 @@
+from typing import Callable, Optional
+
+import ttkbootstrap as ttk
+
+from app.core.models import Settings
+from app.storage.settings import get_settings_service
+
+
+class HelpText:
+    """Textos de una vista que dependen del idioma de ayuda (es/en/none).
+
+    Cada widget se registra con sus tres variantes (`bind`); cuando cambia el
+    ajuste, se reescriben en su sitio en lugar de reconstruir la vista, que
+    puede tener una sesión en curso. `on_change(lang)` permite a la vista
+    actualizar además los textos que genera sobre la marcha.
+
+    La suscripción al servicio de ajustes se cancela al destruir `owner`.
+    """
+
+    def __init__(
+        self,
+        owner: ttk.Frame,
+        on_change: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        settings_service = get_settings_service()
+        self.lang: str = (settings_service.current.help_language or "es").lower()
+        self._owner = owner
+        self._on_change = on_change
+        self._bindings: list[tuple[ttk.Widget, Callable[[str], None], tuple[str, str, str]]] = []
+        self._prune_at = 64
+
+        self._unsubscribe = settings_service.subscribe(self._on_settings_changed)
+        owner.bind("<Destroy>", self._on_destroy, add="+")
+
+    def pick(self, es: str, en: str, none: str) -> str:
+        if self.lang == "en":
+            return en
+        if self.lang == "none":
+            return none
+        return es
+
+    def bind(
+        self,
+        widget: ttk.Widget,
+        es: str,
+        en: str,
+        none: str,
+        setter: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Poner ya el texto de `widget` y rehacerlo cuando cambie el idioma.
+
+        Por defecto se cambia su opción `text`; `setter` sirve para otros
+        casos (p.ej. la pestaña de un Notebook).
+        """
+
+        if setter is None:
+
+            def setter(text: str) -> None:
+                widget.configure(text=text)
+
+        setter(self.pick(es, en, none))
+        self._bindings.append((widget, setter, (es, en, none)))
+        if len(self._bindings) >= self._prune_at:
+            # Vistas que reconstruyen parte de sus widgets (p.ej. al refrescar)
+            self._prune()
+            self._prune_at = 2 * len(self._bindings) + 64
+
+    def _prune(self) -> None:
+        # Olvidar los widgets ya destruidos
+        self._bindings = [entry for entry in self._bindings if entry[0].winfo_exists()]
+
+    def _on_settings_changed(self, _old: Settings, new: Settings) -> None:
+        lang = (new.help_language or "es").lower()
+        if lang == self.lang:
+            return
+        self.lang = lang
+
+        self._prune()
+        for _widget, setter, texts in self._bindings:
+            setter(self.pick(*texts))
+        if self._on_change is not None:
+            self._on_change(lang)
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self._owner:
+            self._unsubscribe()
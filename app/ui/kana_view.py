@@ -4,7 +4,7 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
 from app.core.srs import update_progress_for_item
-from app.storage.settings import load_settings
+from app.ui.help_text import HelpText
 
 
 HIRAGANA_ROWS = [
@@ -155,10 +155,11 @@ class KanaView(ttk.Frame):
     - Pestaña 2: práctica tipo flashcard (hiragana → romaji).
     """
 
-    def __init__(self, master: ttk.Frame) -> None:
+    def __init__(self, master: ttk.Frame, rng: random.Random | None = None) -> None:
         super().__init__(master)
-        settings = load_settings()
-        self.help_lang: str = (settings.help_language or "es").lower()
+        self.rng = rng or random.Random()
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self)
         self.current_char: str | None = None
         self.current_index: int | None = None
 
@@ -194,18 +195,16 @@ class KanaView(ttk.Frame):
         self.current_candidates = list(range(len(self.all_chars)))
 
     def _create_widgets(self) -> None:
-        if self.help_lang == "en":
-            header_text = "ひらがな練習 / Hiragana"
-        elif self.help_lang == "none":
-            header_text = "ひらがな練習"
-        else:
-            header_text = "ひらがな練習 (Hiragana)"
-
         header = ttk.Label(
             self,
-            text=header_text,
             font=("Yu Gothic UI", 18, "bold"),
         )
+        self.help.bind(
+            header,
+            es="ひらがな練習 (Hiragana)",
+            en="ひらがな練習 / Hiragana",
+            none="ひらがな練習",
+        )
         header.pack(side=TOP, pady=10)
 
         notebook = ttk.Notebook(self)
@@ -242,18 +241,16 @@ class KanaView(ttk.Frame):
                 btn.grid(row=row_index, column=col_index, padx=4, pady=4)
 
     def _build_practice_tab(self, parent: ttk.Frame) -> None:
-        if self.help_lang == "en":
-            info_text = "カード練習：ひらがな → ローマ字 (romaji)"
-        elif self.help_lang == "none":
-            info_text = "カード練習：ひらがな → ローマ字"
-        else:
-            info_text = "カード練習：ひらがな → ローマ字 (romaji)"
-
         info = ttk.Label(
             parent,
-            text=info_text,
             font=("Yu Gothic UI", 12),
         )
+        self.help.bind(
+            info,
+            es="カード練習：ひらがな → ローマ字 (romaji)",
+            en="カード練習：ひらがな → ローマ字 (romaji)",
+            none="カード練習：ひらがな → ローマ字",
+        )
         info.pack(side=TOP, pady=5)
 
         # Selector de fila a practicar
@@ -315,18 +312,16 @@ class KanaView(ttk.Frame):
         )
         self.kana_label.pack(pady=20)
 
-        if self.help_lang == "en":
-            entry_help = "Type in romaji:"
-        elif self.help_lang == "none":
-            entry_help = "ローマ字で入力してください"
-        else:
-            entry_help = "ローマ字で入力してください (escribe en romaji):"
-
         entry_label = ttk.Label(
             parent,
-            text=entry_help,
             font=("Yu Gothic UI", 10),
         )
+        self.help.bind(
+            entry_label,
+            es="ローマ字で入力してください (escribe en romaji):",
+            en="Type in romaji:",
+            none="ローマ字で入力してください",
+        )
         entry_label.pack()
 
         self.answer_entry = ttk.Entry(parent, width=20)
@@ -371,7 +366,7 @@ class KanaView(ttk.Frame):
 
         # Usar el subconjunto actual de índices (fila seleccionada)
         candidates = self.current_candidates or list(range(len(self.all_chars)))
-        self.current_index = random.choice(candidates)
+        self.current_index = self.rng.choice(candidates)
         self.current_char = self.all_chars[self.current_index]
 
         if self.kana_label is not None:
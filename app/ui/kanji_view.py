@@ -6,20 +6,23 @@ from ttkbootstrap.constants import *
 from app.core.kanji_repository import load_kanji_items, save_kanji_items
 from app.core.models import KanjiItem
 from app.core.srs import update_progress_for_item
-from app.storage.settings import load_settings
+from app.ui.events import CONTENT_CHANGED
+from app.ui.help_text import HelpText
+from app.ui.virtual_list import VirtualTreeview
 
 
 class KanjiView(ttk.Frame):
     """Vista de práctica de kanji N5 (lista + tarjetas)."""
 
-    def __init__(self, master: ttk.Frame) -> None:
+    def __init__(self, master: ttk.Frame, rng: random.Random | None = None) -> None:
         super().__init__(master)
-        settings = load_settings()
-        self.help_lang: str = (settings.help_language or "es").lower()
+        self.rng = rng or random.Random()
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self)
         self.items = load_kanji_items()
-        self.current_index: int | None = None
+        self.current_item: KanjiItem | None = None
 
-        self.list_tree: ttk.Treeview | None = None
+        self.list_tree: VirtualTreeview | None = None
 
         self.kanji_label: ttk.Label | None = None
         self.readings_label: ttk.Label | None = None
@@ -29,52 +32,46 @@ class KanjiView(ttk.Frame):
         self._create_widgets()
 
     def _create_widgets(self) -> None:
-        if self.help_lang == "en":
-            header_text = "漢字N5 / Kanji N5"
-        elif self.help_lang == "none":
-            header_text = "漢字N5"
-        else:
-            header_text = "漢字N5 (Kanji N5)"
-
         header = ttk.Label(
             self,
-            text=header_text,
             font=("Yu Gothic UI", 18, "bold"),
         )
+        self.help.bind(
+            header,
+            es="漢字N5 (Kanji N5)",
+            en="漢字N5 / Kanji N5",
+            none="漢字N5",
+        )
         header.pack(side=TOP, pady=10)
 
         # Botón para añadir nuevos kanji
         add_frame = ttk.Frame(self)
         add_frame.pack(fill=X, padx=10)
 
-        if self.help_lang == "en":
-            add_text = "新しい漢字を追加 / Add kanji"
-        elif self.help_lang == "none":
-            add_text = "新しい漢字を追加"
-        else:
-            add_text = "新しい漢字を追加 / Añadir kanji"
-
         add_btn = ttk.Button(
             add_frame,
-            text=add_text,
             bootstyle="info-outline",
             command=self._open_add_kanji_dialog,
         )
+        self.help.bind(
+            add_btn,
+            es="新しい漢字を追加 / Añadir kanji",
+            en="新しい漢字を追加 / Add kanji",
+            none="新しい漢字を追加",
+        )
         add_btn.pack(side=RIGHT)
 
         if not self.items:
-            if self.help_lang == "en":
-                msg_text = "漢字データがありません (no kanji data)"
-            elif self.help_lang == "none":
-                msg_text = "漢字データがありません"
-            else:
-                msg_text = "漢字データがありません (no hay datos de kanji)"
-
             msg = ttk.Label(
                 self,
-                text=msg_text,
                 bootstyle="danger",
             )
+            self.help.bind(
+                msg,
+                es="漢字データがありません (no hay datos de kanji)",
+                en="漢字データがありません (no kanji data)",
+                none="漢字データがありません",
+            )
             msg.pack(pady=20)
             return
 
@@ -91,10 +88,9 @@ class KanjiView(ttk.Frame):
         self._build_flashcard_tab(flashcard_tab)
 
     def _build_list_tab(self, parent: ttk.Frame) -> None:
-        self.list_tree = ttk.Treeview(
+        self.list_tree = VirtualTreeview(
             parent,
             columns=("kanji", "readings", "meanings"),
-            show="headings",
             height=10,
         )
         self.list_tree.heading("kanji", text="漢字")
@@ -109,31 +105,42 @@ class KanjiView(ttk.Frame):
 
         self._refresh_list_tree()
 
+    def refresh(self) -> None:
+        """Recargar los kanji tras un cambio hecho en otra vista (conserva la tarjeta en curso)."""
+
+        self.items = load_kanji_items()
+        if self.list_tree is None:
+            # Se construyó sin datos: no hay estado que conservar
+            for child in self.winfo_children():
+                child.destroy()
+            self._create_widgets()
+            return
+        self._refresh_list_tree()
+
     def _refresh_list_tree(self) -> None:
         if self.list_tree is None:
             return
 
-        for row in self.list_tree.get_children():
-            self.list_tree.delete(row)
+        items = self.items
 
-        for item in self.items:
-            readings = ", ".join(item.readings)
-            meanings = ", ".join(item.meanings_es)
-            self.list_tree.insert("", END, values=(item.kanji, readings, meanings))
+        def get_row(i: int) -> tuple:
+            item = items[i]
+            return (item.kanji, ", ".join(item.readings), ", ".join(item.meanings_es))
 
-    def _build_flashcard_tab(self, parent: ttk.Frame) -> None:
-        if self.help_lang == "en":
-            info_text = "カード練習：漢字 → 意味 (meaning)"
-        elif self.help_lang == "none":
-            info_text = "カード練習：漢字 → 意味"
-        else:
-            info_text = "カード練習：漢字 → 意味 (español)"
+        # Solo se pintan las filas visibles
+        self.list_tree.set_rows(len(items), get_row)
 
+    def _build_flashcard_tab(self, parent: ttk.Frame) -> None:
         info = ttk.Label(
             parent,
-            text=info_text,
             font=("Yu Gothic UI", 12),
         )
+        self.help.bind(
+            info,
+            es="カード練習：漢字 → 意味 (español)",
+            en="カード練習：漢字 → 意味 (meaning)",
+            none="カード練習：漢字 → 意味",
+        )
         info.pack(side=TOP, pady=5)
 
         self.kanji_label = ttk.Label(
@@ -151,18 +158,16 @@ class KanjiView(ttk.Frame):
         )
         self.readings_label.pack(pady=5)
 
-        if self.help_lang == "en":
-            entry_help = "意味を英語または母語で入力してください (type the meaning):"
-        elif self.help_lang == "none":
-            entry_help = "意味をスペイン語で入力してください"
-        else:
-            entry_help = "意味をスペイン語で入力してください (escribe el significado en español):"
-
         entry_label = ttk.Label(
             parent,
-            text=entry_help,
             font=("Yu Gothic UI", 10),
         )
+        self.help.bind(
+            entry_label,
+            es="意味をスペイン語で入力してください (escribe el significado en español):",
+            en="意味を英語または母語で入力してください (type the meaning):",
+            none="意味をスペイン語で入力してください",
+        )
         entry_label.pack()
 
         self.answer_entry = ttk.Entry(parent, width=30)
@@ -274,6 +279,7 @@ class KanjiView(ttk.Frame):
 
             self.items.append(new_item)
             save_kanji_items(self.items)
+            self.event_generate(CONTENT_CHANGED)
 
             # Refrescar listado para incluir el nuevo kanji
             self._refresh_list_tree()
@@ -308,8 +314,7 @@ class KanjiView(ttk.Frame):
         if not self.items:
             return
 
-        self.current_index = random.randrange(len(self.items))
-        item = self.items[self.current_index]
+        item = self.current_item = self.rng.choice(self.items)
 
         if self.kanji_label is not None:
             self.kanji_label.configure(text=item.kanji)
@@ -327,13 +332,13 @@ class KanjiView(ttk.Frame):
 
     def _check_answer(self) -> None:
         if (
-            self.current_index is None
+            self.current_item is None
             or self.answer_entry is None
             or self.feedback_label is None
         ):
             return
 
-        item = self.items[self.current_index]
+        item = self.current_item
         user_answer = self.answer_entry.get().strip().lower()
         # Aceptamos si coincide exactamente con una de las traducciones
         meanings = [m.strip().lower() for m in item.meanings_es]
@@ -4,7 +4,7 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
 from app.core.srs import update_progress_for_item
-from app.storage.settings import load_settings
+from app.ui.help_text import HelpText
 
 
 KATAKANA_ROWS = [
@@ -154,10 +154,11 @@ KATAKANA_ID_OFFSET = 100
 class KatakanaView(ttk.Frame):
     """Vista de práctica de katakana (tabla + tarjetas)."""
 
-    def __init__(self, master: ttk.Frame) -> None:
+    def __init__(self, master: ttk.Frame, rng: random.Random | None = None) -> None:
         super().__init__(master)
-        settings = load_settings()
-        self.help_lang: str = (settings.help_language or "es").lower()
+        self.rng = rng or random.Random()
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self)
         self.current_char: str | None = None
         self.current_index: int | None = None
 
@@ -191,18 +192,16 @@ class KatakanaView(ttk.Frame):
         self.current_candidates = list(range(len(self.all_chars)))
 
     def _create_widgets(self) -> None:
-        if self.help_lang == "en":
-            header_text = "カタカナ練習 / Katakana"
-        elif self.help_lang == "none":
-            header_text = "カタカナ練習"
-        else:
-            header_text = "カタカナ練習 (Katakana)"
-
         header = ttk.Label(
             self,
-            text=header_text,
             font=("Yu Gothic UI", 18, "bold"),
         )
+        self.help.bind(
+            header,
+            es="カタカナ練習 (Katakana)",
+            en="カタカナ練習 / Katakana",
+            none="カタカナ練習",
+        )
         header.pack(side=TOP, pady=10)
 
         notebook = ttk.Notebook(self)
@@ -239,18 +238,16 @@ class KatakanaView(ttk.Frame):
                 btn.grid(row=row_index, column=col_index, padx=4, pady=4)
 
     def _build_practice_tab(self, parent: ttk.Frame) -> None:
-        if self.help_lang == "en":
-            info_text = "カード練習：カタカナ → ローマ字 (romaji)"
-        elif self.help_lang == "none":
-            info_text = "カード練習：カタカナ → ローマ字"
-        else:
-            info_text = "カード練習：カタカナ → ローマ字 (romaji)"
-
         info = ttk.Label(
             parent,
-            text=info_text,
             font=("Yu Gothic UI", 12),
         )
+        self.help.bind(
+            info,
+            es="カード練習：カタカナ → ローマ字 (romaji)",
+            en="カード練習：カタカナ → ローマ字 (romaji)",
+            none="カード練習：カタカナ → ローマ字",
+        )
         info.pack(side=TOP, pady=5)
 
         selector_frame = ttk.Frame(parent)
@@ -311,18 +308,16 @@ class KatakanaView(ttk.Frame):
         )
         self.kana_label.pack(pady=20)
 
-        if self.help_lang == "en":
-            entry_help = "Type in romaji:"
-        elif self.help_lang == "none":
-            entry_help = "ローマ字で入力してください"
-        else:
-            entry_help = "ローマ字で入力してください (escribe en romaji):"
-
         entry_label = ttk.Label(
             parent,
-            text=entry_help,
             font=("Yu Gothic UI", 10),
         )
+        self.help.bind(
+            entry_label,
+            es="ローマ字で入力してください (escribe en romaji):",
+            en="Type in romaji:",
+            none="ローマ字で入力してください",
+        )
         entry_label.pack()
 
         self.answer_entry = ttk.Entry(parent, width=20)
@@ -364,7 +359,7 @@ class KatakanaView(ttk.Frame):
             self._init_char_indices()
 
         candidates = self.current_candidates or list(range(len(self.all_chars)))
-        self.current_index = random.choice(candidates)
+        self.current_index = self.rng.choice(candidates)
         self.current_char = self.all_chars[self.current_index]
 
         if self.kana_label is not None:
@@ -1,15 +1,32 @@
+import importlib
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-from app.storage.settings import load_settings
-from app.ui.kana_view import KanaView
-from app.ui.katakana_view import KatakanaView
-from app.ui.vocab_view import VocabView
-from app.ui.kanji_view import KanjiView
-from app.ui.grammar_view import GrammarView
-from app.ui.exam_view import ExamView
-from app.ui.progress_view import ProgressView
-from app.ui.settings_view import SettingsView
+from app.core.models import Settings
+from app.storage.settings import get_settings_service
+from app.ui.events import CONTENT_CHANGED
+from app.ui.help_text import HelpText
+
+
+# Registro de vistas: nombre -> (módulo, clase). El módulo solo se importa la
+# primera vez que se abre la vista, así el arranque no paga por todas.
+VIEW_REGISTRY: dict[str, tuple[str, str]] = {
+    "review": ("app.ui.review_view", "ReviewView"),
+    "kana": ("app.ui.kana_view", "KanaView"),
+    "katakana": ("app.ui.katakana_view", "KatakanaView"),
+    "kanji": ("app.ui.kanji_view", "KanjiView"),
+    "vocab": ("app.ui.vocab_view", "VocabView"),
+    "grammar": ("app.ui.grammar_view", "GrammarView"),
+    "exam": ("app.ui.exam_view", "ExamView"),
+    "progress": ("app.ui.progress_view", "ProgressView"),
+    "settings": ("app.ui.settings_view", "SettingsView"),
+}
+
+
+def load_view_class(name: str) -> type:
+    module_name, class_name = VIEW_REGISTRY[name]
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 class MainWindow(ttk.Frame):
@@ -17,34 +34,53 @@ class MainWindow(ttk.Frame):
 
     La interfaz de usuario está en japonés; el código y comentarios pueden
     incluir español para facilitar el mantenimiento.
+
+    Cada vista se construye la primera vez que se abre y después solo se
+    oculta y se vuelve a mostrar, conservando su estado. Al mostrarla se
+    llama a su `on_show()` si lo tiene; cuando cambian los datos se llama a
+    su `refresh()`. Las vistas que no dependen del contenido no lo tienen y
+    no se tocan: una vista nunca se destruye mientras la aplicación sigue
+    abierta, porque puede tener una sesión en curso.
+
+    Los cambios de ajustes llegan por el servicio de ajustes: el tema se
+    aplica al momento y cada vista (y el menú) cambia sus textos de ayuda en
+    su sitio (ver `HelpText`), sin reconstruir nada.
     """
 
     def __init__(self, master: ttk.Window) -> None:
         super().__init__(master)
         self.master = master
-        self.settings = load_settings()
+        self.settings = get_settings_service().current
         self.pack(fill=BOTH, expand=YES)
 
+        self._views: dict[str, ttk.Frame] = {}
+        self._current_view: ttk.Frame | None = None
+        self._current_name: str | None = None
+        self._placeholder: ttk.Label | None = None
+        # Título, menú y bienvenida cambian de idioma en su sitio
+        self.help = HelpText(self)
+
         self._create_widgets()
 
+        # Las vistas generan este evento sobre sí mismas; llega a la toplevel
+        master.bind(CONTENT_CHANGED, self._on_content_changed, add="+")
+        get_settings_service().subscribe(self._on_settings_changed)
+
     def _create_widgets(self) -> None:
         # Frame superior para título
         header = ttk.Frame(self)
         header.pack(side=TOP, fill=X, pady=10)
-        help_lang = (self.settings.help_language or "es").lower()
-
-        if help_lang == "en":
-            title_text = "日本語N5トレーナー / Japanese N5 Trainer"
-        elif help_lang == "none":
-            title_text = "日本語N5トレーナー"
-        else:
-            title_text = "日本語N5トレーナー / Entrenador N5 de japonés"
 
         title_label = ttk.Label(
             header,
-            text=title_text,
             font=("Yu Gothic UI", 20, "bold"),
         )
+        self.help.bind(
+            title_label,
+            es="日本語N5トレーナー / Entrenador N5 de japonés",
+            en="日本語N5トレーナー / Japanese N5 Trainer",
+            none="日本語N5トレーナー",
+        )
         title_label.pack(side=TOP, pady=5)
 
         # Frame central dividido en menú lateral + área de contenido
@@ -59,106 +95,114 @@ class MainWindow(ttk.Frame):
         self.content_frame = ttk.Frame(body, bootstyle="secondary")
         self.content_frame.pack(side=LEFT, fill=BOTH, expand=YES, padx=10)
 
-        # Botones de menú (en japonés)
-        if help_lang == "en":
-            buttons = [
-                ("ひらがな練習 / Hiragana", self.show_kana_view),
-                ("カタカナ練習 / Katakana", self.show_katakana_view),
-                ("漢字N5 / Kanji N5", self.show_kanji_view),
-                ("単語N5 / Vocabulary N5", self.show_vocab_view),
-                ("文法N5 / Grammar N5", self.show_grammar_view),
-                ("模擬テスト / Mock exam", self.show_exam_view),
-                ("進捗 / Progress", self.show_progress_view),
-                ("設定 / Settings", self.show_settings_view),
-            ]
-        elif help_lang == "none":
-            buttons = [
-                ("ひらがな練習", self.show_kana_view),
-                ("カタカナ練習", self.show_katakana_view),
-                ("漢字N5", self.show_kanji_view),
-                ("単語N5", self.show_vocab_view),
-                ("文法N5", self.show_grammar_view),
-                ("模擬テスト", self.show_exam_view),
-                ("進捗", self.show_progress_view),
-                ("設定", self.show_settings_view),
-            ]
-        else:
-            buttons = [
-                ("ひらがな練習 (Hiragana)", self.show_kana_view),
-                ("カタカナ練習 (Katakana)", self.show_katakana_view),
-                ("漢字N5 (Kanji N5)", self.show_kanji_view),
-                ("単語N5 (Vocabulario N5)", self.show_vocab_view),
-                ("文法N5 (Gramática N5)", self.show_grammar_view),
-                ("模擬テスト (Examen simulado)", self.show_exam_view),
-                ("進捗 (Progreso)", self.show_progress_view),
-                ("設定 (Configuración)", self.show_settings_view),
-            ]
-
-        for text, command in buttons:
-            btn = ttk.Button(menu_frame, text=text, command=command, width=16)
+        # Botones de menú (en japonés): (es, en, none, acción)
+        buttons = [
+            ("復習 (Repaso)", "復習 / Review", "復習", self.show_review_view),
+            ("ひらがな練習 (Hiragana)", "ひらがな練習 / Hiragana", "ひらがな練習", self.show_kana_view),
+            ("カタカナ練習 (Katakana)", "カタカナ練習 / Katakana", "カタカナ練習", self.show_katakana_view),
+            ("漢字N5 (Kanji N5)", "漢字N5 / Kanji N5", "漢字N5", self.show_kanji_view),
+            ("単語N5 (Vocabulario N5)", "単語N5 / Vocabulary N5", "単語N5", self.show_vocab_view),
+            ("文法N5 (Gramática N5)", "文法N5 / Grammar N5", "文法N5", self.show_grammar_view),
+            ("模擬テスト (Examen simulado)", "模擬テスト / Mock exam", "模擬テスト", self.show_exam_view),
+            ("進捗 (Progreso)", "進捗 / Progress", "進捗", self.show_progress_view),
+            ("設定 (Configuración)", "設定 / Settings", "設定", self.show_settings_view),
+        ]
+
+        for es, en, none, command in buttons:
+            btn = ttk.Button(menu_frame, command=command, width=16)
+            self.help.bind(btn, es=es, en=en, none=none)
             btn.pack(side=TOP, fill=X, pady=3)
 
         # Vista inicial
-        if help_lang == "en":
-            welcome = "ようこそ！ 日本語N5トレーナーへ。\n左のメニューから学習モードを選んでください。(Choose a mode from the left menu.)"
-        elif help_lang == "none":
-            welcome = "ようこそ！ 日本語N5トレーナーへ。\n左のメニューから学習モードを選んでください。"
-        else:
-            welcome = "ようこそ！ 日本語N5トレーナーへ。\n左のメニューから学習モードを選んでください。(Elige un modo en el menú de la izquierda.)"
-
-        self._show_placeholder(welcome)
-
-    # Métodos para cambiar de vista (por ahora simples placeholders)
-    def _clear_content(self) -> None:
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-
-    def _show_placeholder(self, message: str) -> None:
-        self._clear_content()
-        label = ttk.Label(
+        self._show_placeholder()
+
+    # Cambio de vista (con caché de vistas ya construidas)
+
+    def _hide_current(self) -> None:
+        if self._placeholder is not None:
+            self._placeholder.destroy()
+            self._placeholder = None
+        if self._current_view is not None:
+            self._current_view.pack_forget()
+            self._current_view = None
+            self._current_name = None
+
+    def _show_placeholder(self) -> None:
+        self._hide_current()
+        self._placeholder = ttk.Label(
             self.content_frame,
-            text=message,
             justify=LEFT,
             font=("Yu Gothic UI", 14),
         )
-        label.pack(padx=20, pady=20, anchor=NW)
+        welcome = "ようこそ！ 日本語N5トレーナーへ。\n左のメニューから学習モードを選んでください。"
+        self.help.bind(
+            self._placeholder,
+            es=welcome + "(Elige un modo en el menú de la izquierda.)",
+            en=welcome + "(Choose a mode from the left menu.)",
+            none=welcome,
+        )
+        self._placeholder.pack(padx=20, pady=20, anchor=NW)
+
+    def _show_view(self, name: str) -> None:
+        view = self._views.get(name)
+        if view is not None and view is self._current_view:
+            return
+
+        self._hide_current()
+        if view is None:
+            view = load_view_class(name)(self.content_frame)
+            self._views[name] = view
+        elif hasattr(view, "on_show"):
+            view.on_show()
 
-    def show_kana_view(self) -> None:
-        self._clear_content()
-        view = KanaView(self.content_frame)
         view.pack(fill=BOTH, expand=YES)
+        self._current_view = view
+        self._current_name = name
+
+    def refresh_views(self, exclude: object = None) -> None:
+        """Avisar a las vistas en caché de que han cambiado los datos.
+
+        Solo se llama a `refresh()` de las vistas que lo tienen; cada una
+        recarga lo que depende del contenido sin perder la sesión en curso.
+        """
+
+        for view in list(self._views.values()):
+            if view is not exclude and hasattr(view, "refresh"):
+                view.refresh()
+
+    def _on_content_changed(self, event) -> None:
+        # La vista que generó el evento ya está al día
+        self.refresh_views(exclude=event.widget)
+
+    def _on_settings_changed(self, old: Settings, new: Settings) -> None:
+        # El idioma de ayuda lo aplica cada vista con su HelpText
+        self.settings = new
+        if new.theme != old.theme:
+            self.master.style.theme_use(new.theme)
+
+    def show_review_view(self) -> None:
+        self._show_view("review")
+
+    def show_kana_view(self) -> None:
+        self._show_view("kana")
 
     def show_katakana_view(self) -> None:
-        self._clear_content()
-        view = KatakanaView(self.content_frame)
-        view.pack(fill=BOTH, expand=YES)
+        self._show_view("katakana")
 
     def show_kanji_view(self) -> None:
-        self._clear_content()
-        view = KanjiView(self.content_frame)
-        view.pack(fill=BOTH, expand=YES)
+        self._show_view("kanji")
 
     def show_vocab_view(self) -> None:
-        self._clear_content()
-        view = VocabView(self.content_frame)
-        view.pack(fill=BOTH, expand=YES)
+        self._show_view("vocab")
 
     def show_grammar_view(self) -> None:
-        self._clear_content()
-        view = GrammarView(self.content_frame)
-        view.pack(fill=BOTH, expand=YES)
+        self._show_view("grammar")
 
     def show_exam_view(self) -> None:
-        self._clear_content()
-        view = ExamView(self.content_frame)
-        view.pack(fill=BOTH, expand=YES)
+        self._show_view("exam")
 
     def show_progress_view(self) -> None:
-        self._clear_content()
-        view = ProgressView(self.content_frame)
-        view.pack(fill=BOTH, expand=YES)
+        self._show_view("progress")
 
     def show_settings_view(self) -> None:
-        self._clear_content()
-        view = SettingsView(self.content_frame)
-        view.pack(fill=BOTH, expand=YES)
+        self._show_view("settings")
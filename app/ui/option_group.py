@@ -0,0 +1,50 @@
+from typing import Sequence
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+
+class OptionGroup(ttk.Frame):
+    """Grupo de Radiobuttons reutilizables para preguntas de elección múltiple.
+
+    Los botones se crean una sola vez (y se añaden más si una pregunta trae
+    más opciones); al cambiar de pregunta solo se cambia su texto y se
+    ocultan los que sobran. El botón i tiene siempre el valor i en `variable`.
+    """
+
+    def __init__(
+        self,
+        master: ttk.Frame,
+        variable: ttk.IntVar,
+        bootstyle: str = "info-toolbutton",
+    ) -> None:
+        super().__init__(master)
+        self.variable = variable
+        self.bootstyle = bootstyle
+        self._buttons: list[ttk.Radiobutton] = []
+        self._texts: list[str] = []
+        self._visible = 0
+
+    def set_options(self, texts: Sequence[str]) -> None:
+        while len(self._buttons) < len(texts):
+            button = ttk.Radiobutton(
+                self,
+                text="",
+                variable=self.variable,
+                value=len(self._buttons),
+                bootstyle=self.bootstyle,
+            )
+            self._buttons.append(button)
+            self._texts.append("")
+
+        for i, text in enumerate(texts):
+            if self._texts[i] != text:
+                self._buttons[i].configure(text=text)
+                self._texts[i] = text
+
+        # Los visibles son siempre los primeros, así que se empaquetan en orden
+        for i in range(self._visible, len(texts)):
+            self._buttons[i].pack(anchor=NW, pady=2)
+        for i in range(len(texts), self._visible):
+            self._buttons[i].pack_forget()
+        self._visible = len(texts)
@@ -1,68 +1,111 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-from app.storage.progress import load_all_progress
-from app.storage.settings import load_settings
+from app.core.event_bus import EXAM_FINISHED, REVIEW_RECORDED, ReviewRecorded, event_bus
+from app.core.models import StudySession
+from app.storage.backend import get_backend
+from app.storage.progress import LEARNED_LEVEL, get_progress_store
 from app.storage.sessions import load_sessions
+from app.ui.help_text import HelpText
+
+
+# Exámenes que se muestran en el historial
+RECENT_SESSIONS = 10
+
+# Nombre de cada tipo de ítem en la tabla: (es, en, none)
+TYPE_LABELS: dict[str, tuple[str, str, str]] = {
+    "kana": ("かな (Kana)", "かな / Kana", "かな"),
+    "vocab": ("単語 (Vocab)", "単語 / Vocab", "単語"),
+    "kanji": ("漢字", "漢字", "漢字"),
+    "grammar": ("文法", "文法", "文法"),
+}
 
 
 class ProgressView(ttk.Frame):
-    """Vista de resumen de progreso (kana, vocabulario, etc.)."""
+    """Vista de resumen de progreso (kana, vocabulario, etc.).
+
+    Las estadísticas se leen una vez al crear la vista; después se mantienen
+    con los eventos de respuesta y de fin de examen del bus de eventos, así
+    que la pantalla está al día incluso mientras se practica en otra vista.
+    """
 
     def __init__(self, master: ttk.Frame) -> None:
         super().__init__(master)
-        settings = load_settings()
-        self.help_lang: str = (settings.help_language or "es").lower()
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self, on_change=self._on_help_language)
+
+        self.table: ttk.Treeview | None = None
+        self.summary_label: ttk.Label | None = None
+        self.hist_table: ttk.Treeview | None = None
+        self._rows: dict[str, str] = {}  # tipo de ítem -> fila de la tabla
+
+        self._load_data()
         self._create_widgets()
 
-    def _create_widgets(self) -> None:
-        if self.help_lang == "en":
-            header_text = "進捗 / Progress"
-        elif self.help_lang == "none":
-            header_text = "進捗"
-        else:
-            header_text = "進捗 (Progreso)"
+        self._unsubscribe = [
+            event_bus.subscribe(REVIEW_RECORDED, self._on_review),
+            event_bus.subscribe(EXAM_FINISHED, self._on_exam_finished),
+        ]
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _load_data(self) -> None:
+        # Estadísticas agregadas por tipo de ítem (GROUP BY en SQLite);
+        # antes se vuelcan las respuestas aún en cola del hilo de escritura
+        get_progress_store().flush()
+        self.stats_by_type: dict[str, dict[str, int]] = get_backend().progress_stats()
+
+        sessions = load_sessions()
+        # Más recientes primero
+        self.recent_sessions: list[StudySession] = sorted(
+            sessions, key=lambda s: s.start_time, reverse=True
+        )[:RECENT_SESSIONS]
+
+    def _reload(self) -> None:
+        """Volver a leer estadísticas e historial desde el almacenamiento.
+
+        No es `refresh`: las estadísticas no dependen del contenido, así que
+        la vista no se rehace en cada cambio de contenido (los eventos la
+        mantienen al día).
+        """
+
+        for child in self.winfo_children():
+            child.destroy()
+        self._rows.clear()
+        self.hist_table = None
+        self._load_data()
+        self._create_widgets()
 
+    def _on_destroy(self, event) -> None:
+        if event.widget is not self:
+            return
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+
+    def _create_widgets(self) -> None:
         header = ttk.Label(
             self,
-            text=header_text,
             font=("Yu Gothic UI", 18, "bold"),
         )
+        self.help.bind(
+            header,
+            es="進捗 (Progreso)",
+            en="進捗 / Progress",
+            none="進捗",
+        )
         header.pack(side=TOP, pady=10)
 
-        if self.help_lang == "en":
-            info_text = "学習状況の概要 / Study progress overview"
-        elif self.help_lang == "none":
-            info_text = "学習状況の概要"
-        else:
-            info_text = "学習状況の概要 / Resumen del estado de estudio"
-
         info = ttk.Label(
             self,
-            text=info_text,
             font=("Yu Gothic UI", 11),
         )
+        self.help.bind(
+            info,
+            es="学習状況の概要 / Resumen del estado de estudio",
+            en="学習状況の概要 / Study progress overview",
+            none="学習状況の概要",
+        )
         info.pack(side=TOP, pady=5)
 
-        progress_items = load_all_progress()
-
-        # Agregar estadísticas por tipo de ítem
-        stats_by_type: dict[str, dict[str, int]] = {}
-        for p in progress_items:
-            t = p.item_type
-            if t not in stats_by_type:
-                stats_by_type[t] = {
-                    "count": 0,
-                    "learned": 0,
-                    "right": 0,
-                    "wrong": 0,
-                }
-            stats_by_type[t]["count"] += 1
-            stats_by_type[t]["right"] += p.right_count
-            stats_by_type[t]["wrong"] += p.wrong_count
-            if p.srs_level >= 2:
-                stats_by_type[t]["learned"] += 1
-
         # Tabla simple de estadísticas
         table = ttk.Treeview(
             self,
@@ -70,24 +113,16 @@ class ProgressView(ttk.Frame):
             show="headings",
             height=5,
         )
-        if self.help_lang == "en":
-            table.heading("tipo", text="種類 / Type")
-            table.heading("items", text="項目数 / Items")
-            table.heading("aprendidos", text="習得済み / Learned")
-            table.heading("aciertos", text="正解数 / Correct")
-            table.heading("fallos", text="不正解数 / Wrong")
-        elif self.help_lang == "none":
-            table.heading("tipo", text="種類")
-            table.heading("items", text="項目数")
-            table.heading("aprendidos", text="習得済み")
-            table.heading("aciertos", text="正解数")
-            table.heading("fallos", text="不正解数")
-        else:
-            table.heading("tipo", text="種類 / Tipo")
-            table.heading("items", text="項目数 / Nº ítems")
-            table.heading("aprendidos", text="習得済み / Aprendidos")
-            table.heading("aciertos", text="正解数 / Aciertos")
-            table.heading("fallos", text="不正解数 / Fallos")
+        self._bind_headings(
+            table,
+            [
+                ("tipo", "種類 / Tipo", "種類 / Type", "種類"),
+                ("items", "項目数 / Nº ítems", "項目数 / Items", "項目数"),
+                ("aprendidos", "習得済み / Aprendidos", "習得済み / Learned", "習得済み"),
+                ("aciertos", "正解数 / Aciertos", "正解数 / Correct", "正解数"),
+                ("fallos", "不正解数 / Fallos", "不正解数 / Wrong", "不正解数"),
+            ],
+        )
 
         table.column("tipo", width=120)
         table.column("items", width=100, anchor=CENTER)
@@ -95,110 +130,140 @@ class ProgressView(ttk.Frame):
         table.column("aciertos", width=100, anchor=CENTER)
         table.column("fallos", width=100, anchor=CENTER)
 
-        if self.help_lang == "en":
-            type_labels = {
-                "kana": "かな / Kana",
-                "vocab": "単語 / Vocab",
-                "kanji": "漢字",
-                "grammar": "文法",
-            }
-        elif self.help_lang == "none":
-            type_labels = {
-                "kana": "かな",
-                "vocab": "単語",
-                "kanji": "漢字",
-                "grammar": "文法",
-            }
-        else:
-            type_labels = {
-                "kana": "かな (Kana)",
-                "vocab": "単語 (Vocab)",
-                "kanji": "漢字",
-                "grammar": "文法",
-            }
-
-        total_items = 0
-        total_learned = 0
-
-        for t, s in stats_by_type.items():
-            label = type_labels.get(t, t)
-            table.insert(
-                "",
-                END,
-                values=(
-                    label,
-                    s["count"],
-                    s["learned"],
-                    s["right"],
-                    s["wrong"],
-                ),
-            )
-            total_items += s["count"]
-            total_learned += s["learned"]
+        self.table = table
+        for t in self.stats_by_type:
+            self._update_row(t)
 
         table.pack(fill=X, padx=10, pady=10)
 
-        if self.help_lang == "en":
-            summary_text = f"合計 / Total: {total_learned} / {total_items} 項目 習得済み (learned)"
-        elif self.help_lang == "none":
-            summary_text = f"合計: {total_learned} / {total_items} 項目 習得済み"
-        else:
-            summary_text = f"合計 / Total: {total_learned} / {total_items} 項目 習得済み (aprendidos)"
-
-        summary = ttk.Label(
+        self.summary_label = ttk.Label(
             self,
-            text=summary_text,
+            text=self._summary_text(),
             font=("Yu Gothic UI", 11, "bold"),
         )
-        summary.pack(pady=5)
+        self.summary_label.pack(pady=5)
 
         # Historial básico de sesiones de examen
-        sessions = load_sessions()
-        if sessions:
-            if self.help_lang == "en":
-                hist_title = "最近の模擬テスト履歴 / Recent mock exams"
-            elif self.help_lang == "none":
-                hist_title = "最近の模擬テスト履歴"
-            else:
-                hist_title = "最近の模擬テスト履歴 / Historial reciente de exámenes"
-
-            hist_label = ttk.Label(
-                self,
-                text=hist_title,
-                font=("Yu Gothic UI", 11, "bold"),
-            )
-            hist_label.pack(pady=(15, 5))
+        if self.recent_sessions:
+            self._create_history_table()
 
-            hist_table = ttk.Treeview(
-                self,
-                columns=("fecha", "duracion", "puntuacion"),
-                show="headings",
-                height=5,
+    def _create_history_table(self) -> None:
+        hist_label = ttk.Label(
+            self,
+            font=("Yu Gothic UI", 11, "bold"),
+        )
+        self.help.bind(
+            hist_label,
+            es="最近の模擬テスト履歴 / Historial reciente de exámenes",
+            en="最近の模擬テスト履歴 / Recent mock exams",
+            none="最近の模擬テスト履歴",
+        )
+        hist_label.pack(pady=(15, 5))
+
+        hist_table = ttk.Treeview(
+            self,
+            columns=("fecha", "duracion", "puntuacion"),
+            show="headings",
+            height=5,
+        )
+
+        self._bind_headings(
+            hist_table,
+            [
+                ("fecha", "日時 / Fecha", "日時 / Date", "日時"),
+                ("duracion", "時間 / Tiempo (s)", "時間 / Time (s)", "時間 (秒)"),
+                ("puntuacion", "得点 / Puntuación", "得点 / Score", "得点"),
+            ],
+        )
+
+        hist_table.column("fecha", width=180)
+        hist_table.column("duracion", width=110, anchor=CENTER)
+        hist_table.column("puntuacion", width=130, anchor=CENTER)
+
+        for s in self.recent_sessions:
+            hist_table.insert("", END, values=self._session_values(s))
+
+        hist_table.pack(fill=X, padx=10, pady=5)
+        self.hist_table = hist_table
+
+    def _bind_headings(self, table: ttk.Treeview, headings: list[tuple[str, str, str, str]]) -> None:
+        # (columna, es, en, none)
+        for column, es, en, none in headings:
+            self.help.bind(
+                table,
+                es=es,
+                en=en,
+                none=none,
+                setter=lambda text, column=column: table.heading(column, text=text),
             )
 
-            if self.help_lang == "en":
-                hist_table.heading("fecha", text="日時 / Date")
-                hist_table.heading("duracion", text="時間 / Time (s)")
-                hist_table.heading("puntuacion", text="得点 / Score")
-            elif self.help_lang == "none":
-                hist_table.heading("fecha", text="日時")
-                hist_table.heading("duracion", text="時間 (秒)")
-                hist_table.heading("puntuacion", text="得点")
-            else:
-                hist_table.heading("fecha", text="日時 / Fecha")
-                hist_table.heading("duracion", text="時間 / Tiempo (s)")
-                hist_table.heading("puntuacion", text="得点 / Puntuación")
-
-            hist_table.column("fecha", width=180)
-            hist_table.column("duracion", width=110, anchor=CENTER)
-            hist_table.column("puntuacion", width=130, anchor=CENTER)
-
-            # Mostrar las últimas 10 sesiones (más recientes primero)
-            recent = sorted(sessions, key=lambda s: s.start_time, reverse=True)[:10]
-            for s in recent:
-                start_str = s.start_time.strftime("%Y-%m-%d %H:%M")
-                duration = int((s.end_time - s.start_time).total_seconds())
-                score = f"{s.correct_count}/{s.total_questions}"
-                hist_table.insert("", END, values=(start_str, duration, score))
-
-            hist_table.pack(fill=X, padx=10, pady=5)
+    def _on_help_language(self, _lang: str) -> None:
+        # Los nombres de tipo y el resumen se generan con el idioma actual
+        for item_type in self._rows:
+            self._update_row(item_type)
+        if self.summary_label is not None:
+            self.summary_label.configure(text=self._summary_text())
+
+    # --- Actualización incremental ---
+
+    def _summary_text(self) -> str:
+        total_items = sum(s["count"] for s in self.stats_by_type.values())
+        total_learned = sum(s["learned"] for s in self.stats_by_type.values())
+
+        if self.help.lang == "en":
+            return f"合計 / Total: {total_learned} / {total_items} 項目 習得済み (learned)"
+        if self.help.lang == "none":
+            return f"合計: {total_learned} / {total_items} 項目 習得済み"
+        return f"合計 / Total: {total_learned} / {total_items} 項目 習得済み (aprendidos)"
+
+    @staticmethod
+    def _session_values(s: StudySession) -> tuple:
+        start_str = s.start_time.strftime("%Y-%m-%d %H:%M")
+        duration = int((s.end_time - s.start_time).total_seconds())
+        score = f"{s.correct_count}/{s.total_questions}"
+        return start_str, duration, score
+
+    def _update_row(self, item_type: str) -> None:
+        s = self.stats_by_type[item_type]
+        values = (
+            self.help.pick(*TYPE_LABELS[item_type]) if item_type in TYPE_LABELS else item_type,
+            s["count"],
+            s["learned"],
+            s["right"],
+            s["wrong"],
+        )
+        row = self._rows.get(item_type)
+        if row is None:
+            self._rows[item_type] = self.table.insert("", END, values=values)
+        else:
+            self.table.item(row, values=values)
+
+    def _on_review(self, event: ReviewRecorded) -> None:
+        s = self.stats_by_type.setdefault(
+            event.item_type, {"count": 0, "learned": 0, "right": 0, "wrong": 0}
+        )
+        if event.created:
+            s["count"] += 1
+        s["learned"] += (event.new_level >= LEARNED_LEVEL) - (event.old_level >= LEARNED_LEVEL)
+        if event.correct:
+            s["right"] += 1
+        else:
+            s["wrong"] += 1
+
+        self._update_row(event.item_type)
+        if self.summary_label is not None:
+            self.summary_label.configure(text=self._summary_text())
+
+    def _on_exam_finished(self, session: StudySession) -> None:
+        self.recent_sessions.insert(0, session)
+        del self.recent_sessions[RECENT_SESSIONS:]
+
+        if self.hist_table is None:
+            # Primer examen: solo falta crear la tabla de historial
+            self._create_history_table()
+            return
+
+        self.hist_table.insert("", 0, values=self._session_values(session))
+        rows = self.hist_table.get_children()
+        if len(rows) > RECENT_SESSIONS:
+            self.hist_table.delete(rows[-1])
@@ -0,0 +1,438 @@
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from app.core.grammar_repository import load_grammar_points
+from app.core.kanji_repository import load_kanji_items
+from app.core.scheduler import get_review_scheduler, next_due
+from app.core.srs import update_progress_for_item
+from app.core.vocab_repository import load_vocab_items
+from app.storage.progress import ProgressKey, get_progress_store
+from app.ui.help_text import HelpText
+from app.ui.kana_view import HIRAGANA_ROWS, KANA_ROMAJI
+from app.ui.katakana_view import KATAKANA_ID_OFFSET, KATAKANA_ROMAJI, KATAKANA_ROWS
+
+
+# Número de tarjetas siguientes que se preparan mientras se muestra la actual
+PREFETCH_SIZE = 5
+# Con la cola vacía se vuelve a mirar cuando venza el próximo ítem (como mucho cada minuto)
+REPOLL_MIN_MS = 1000
+REPOLL_MAX_MS = 60_000
+
+
+@dataclass
+class ReviewCard:
+    key: ProgressKey
+    prompt: str
+    hint: str
+    answers: list[str]
+    answer_text: str
+    note: str = ""
+    type_label: str = ""
+
+
+class ReviewView(ttk.Frame):
+    """Vista de repaso de ítems pendientes (modo mixto).
+
+    - Toma los ítems cuyo repaso toca según el SRS, de todos los tipos
+      (kana, vocabulario, kanji y gramática), en una sola cola.
+    - Mientras se muestra una tarjeta se preparan las siguientes, de modo que
+      pasar a la siguiente no tiene que buscar ni cargar nada.
+    """
+
+    def __init__(self, master: ttk.Frame) -> None:
+        super().__init__(master)
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self, on_change=self._on_help_language)
+        self.scheduler = get_review_scheduler()
+
+        # Contenido por id, cargado solo para los tipos que aparecen en la cola
+        self._lookups: dict[str, dict[int, object]] = {}
+
+        self.upcoming: deque[ReviewCard] = deque()
+        # Ítems vencidos sin contenido (p.ej. borrado): fuera de la cola hasta
+        # que cambie el contenido, para no volver a sacarlos en cada tarjeta
+        self._unresolvable: set[ProgressKey] = set()
+        self.current_card: ReviewCard | None = None
+        self.answered: bool = False
+        self.reviewed_count: int = 0
+        self._repoll_id: str | None = None
+
+        self.type_label: ttk.Label | None = None
+        self.prompt_label: ttk.Label | None = None
+        self.hint_label: ttk.Label | None = None
+        self.answer_entry: ttk.Entry | None = None
+        self.feedback_label: ttk.Label | None = None
+        self.status_label: ttk.Label | None = None
+
+        self._create_widgets()
+
+        # Devolver a la cola las tarjetas preparadas y no respondidas
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _create_widgets(self) -> None:
+        header = ttk.Label(
+            self,
+            font=("Yu Gothic UI", 18, "bold"),
+        )
+        self.help.bind(header, es="復習 (Repaso)", en="復習 / Review", none="復習")
+        header.pack(side=TOP, pady=10)
+
+        self.status_label = ttk.Label(
+            self,
+            text="",
+            font=("Yu Gothic UI", 10),
+            bootstyle="secondary",
+        )
+        self.status_label.pack(pady=5)
+
+        self.type_label = ttk.Label(
+            self,
+            text="",
+            font=("Yu Gothic UI", 11),
+            bootstyle="info",
+        )
+        self.type_label.pack(pady=5)
+
+        self.prompt_label = ttk.Label(
+            self,
+            text="",
+            font=("Yu Gothic UI", 36, "bold"),
+            wraplength=700,
+        )
+        self.prompt_label.pack(pady=10)
+
+        self.hint_label = ttk.Label(
+            self,
+            text="",
+            font=("Yu Gothic UI", 13),
+            bootstyle="secondary",
+            wraplength=700,
+        )
+        self.hint_label.pack(pady=5)
+
+        entry_label = ttk.Label(
+            self,
+            font=("Yu Gothic UI", 10),
+        )
+        self.help.bind(
+            entry_label,
+            es="答えを入力してください (escribe la respuesta):",
+            en="答えを入力してください (type the answer):",
+            none="答えを入力してください",
+        )
+        entry_label.pack()
+
+        self.answer_entry = ttk.Entry(self, width=30)
+        self.answer_entry.pack(pady=5)
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(pady=10)
+
+        check_btn = ttk.Button(
+            button_frame,
+            text="答えを確認 / Comprobar",
+            command=self._check_answer,
+            bootstyle="success-outline",
+        )
+        check_btn.pack(side=LEFT, padx=5)
+
+        next_btn = ttk.Button(
+            button_frame,
+            text="次へ / Siguiente",
+            command=self._next_card,
+            bootstyle="secondary-outline",
+        )
+        next_btn.pack(side=LEFT, padx=5)
+
+        self.feedback_label = ttk.Label(
+            self,
+            text="",
+            font=("Yu Gothic UI", 11),
+            bootstyle="secondary",
+            wraplength=700,
+        )
+        self.feedback_label.pack(pady=10)
+
+        self.answer_entry.bind("<Return>", lambda _event: self._check_answer())
+
+        self._prefetch()
+        self._next_card()
+
+    def refresh(self) -> None:
+        # El contenido ha cambiado: volver a cargar las tablas de búsqueda y
+        # buscar tarjetas que antes no se podían resolver
+        self._lookups.clear()
+        self._restore_unresolvable()
+        self._repoll()
+
+    def on_show(self) -> None:
+        # Mientras estaba oculta pueden haber vencido más repasos
+        self._repoll()
+
+    # --- Resolución de contenido por id ---
+
+    def _lookup(self, item_type: str) -> dict[int, object]:
+        lookup = self._lookups.get(item_type)
+        if lookup is None:
+            if item_type == "vocab":
+                lookup = {it.id: it for it in load_vocab_items()}
+            elif item_type == "kanji":
+                lookup = {it.id: it for it in load_kanji_items()}
+            elif item_type == "grammar":
+                lookup = {p.id: p for p in load_grammar_points()}
+            elif item_type == "kana":
+                hiragana = [c for row in HIRAGANA_ROWS for c in row]
+                katakana = [c for row in KATAKANA_ROWS for c in row]
+                lookup = {i: c for i, c in enumerate(hiragana)}
+                lookup.update({KATAKANA_ID_OFFSET + i: c for i, c in enumerate(katakana)})
+            else:
+                lookup = {}
+            self._lookups[item_type] = lookup
+        return lookup
+
+    def _resolve_card(self, key: ProgressKey) -> ReviewCard | None:
+        _user_id, item_type, item_id = key
+        item = self._lookup(item_type).get(item_id)
+        if item is None:
+            return None
+
+        if item_type == "kana":
+            romaji = KANA_ROMAJI.get(item) or KATAKANA_ROMAJI.get(item, "")
+            if not romaji:
+                return None
+            return ReviewCard(
+                key=key,
+                prompt=item,
+                hint="",
+                answers=[romaji],
+                answer_text=romaji,
+                type_label="かな / Kana",
+            )
+
+        if item_type == "vocab":
+            return ReviewCard(
+                key=key,
+                prompt=item.word_jp,
+                hint=f"よみかた: {item.reading}",
+                answers=[item.meaning_es.strip().lower()],
+                answer_text=item.meaning_es,
+                type_label="単語 / Vocab",
+            )
+
+        if item_type == "kanji":
+            if not item.meanings_es:
+                return None
+            return ReviewCard(
+                key=key,
+                prompt=item.kanji,
+                hint=f"よみかた: {', '.join(item.readings)}",
+                answers=[m.strip().lower() for m in item.meanings_es],
+                answer_text=", ".join(item.meanings_es),
+                type_label="漢字 / Kanji",
+            )
+
+        if item_type == "grammar":
+            example = item.examples[0] if item.examples else item.description_simple_jp
+            return ReviewCard(
+                key=key,
+                prompt=example,
+                hint=item.description_simple_jp if item.examples else "",
+                answers=[item.title_jp.strip()],
+                answer_text=item.title_jp,
+                note=item.note_es,
+                type_label="文法 / Gramática",
+            )
+
+        return None
+
+    # --- Cola de repaso ---
+
+    def _prefetch(self) -> None:
+        """Preparar hasta PREFETCH_SIZE tarjetas siguientes."""
+
+        while len(self.upcoming) < PREFETCH_SIZE:
+            key = self.scheduler.pop_next_due()
+            if key is None:
+                break
+            card = self._resolve_card(key)
+            if card is not None:
+                self.upcoming.append(card)
+            else:
+                self._unresolvable.add(key)
+
+    def _restore_unresolvable(self) -> None:
+        # Los ítems sin contenido vuelven al planificador (su progreso se conserva)
+        store = get_progress_store()
+        for key in self._unresolvable:
+            progress = store.get(*key)
+            if progress is not None:
+                self.scheduler.reschedule(progress)
+        self._unresolvable.clear()
+
+    def _pop_due_card(self) -> ReviewCard | None:
+        """Siguiente tarjeta preparada que aún toque repasar."""
+
+        store = get_progress_store()
+        now = datetime.now()
+        while True:
+            if not self.upcoming:
+                self._prefetch()
+                if not self.upcoming:
+                    return None
+            card = self.upcoming.popleft()
+            # Si se respondió en otra vista mientras esperaba, ya está reprogramada
+            progress = store.get(*card.key)
+            if progress is not None and next_due(progress) <= now:
+                return card
+
+    def _requeue(self, card: ReviewCard) -> None:
+        progress = get_progress_store().get(*card.key)
+        if progress is not None:
+            self.scheduler.reschedule(progress)
+
+    def _next_card(self) -> None:
+        # Una tarjeta saltada sin responder vuelve a la cola
+        if self.current_card is not None and not self.answered:
+            self._requeue(self.current_card)
+
+        self.current_card = self._pop_due_card()
+        self.answered = False
+
+        if self.current_card is None:
+            self._show_empty()
+            return
+
+        card = self.current_card
+        if self.type_label is not None:
+            self.type_label.configure(text=card.type_label)
+        if self.prompt_label is not None:
+            self.prompt_label.configure(text=card.prompt)
+        if self.hint_label is not None:
+            self.hint_label.configure(text=card.hint)
+        if self.feedback_label is not None:
+            self.feedback_label.configure(text="", bootstyle="secondary")
+        if self.answer_entry is not None:
+            self.answer_entry.delete(0, END)
+            self.answer_entry.focus_set()
+
+        self._update_status()
+
+        # Preparar las siguientes cuando la interfaz quede libre
+        self.after_idle(self._prefetch)
+
+    def _empty_text(self) -> str:
+        return self.help.pick(
+            es="今日の復習はありません (no hay repasos pendientes)",
+            en="今日の復習はありません (nothing due for review)",
+            none="今日の復習はありません",
+        )
+
+    def _on_help_language(self, _lang: str) -> None:
+        # El aviso de "sin repasos" es el único texto de ayuda generado al vuelo
+        if self.current_card is None and self.feedback_label is not None:
+            self.feedback_label.configure(text=self._empty_text())
+
+    def _show_empty(self) -> None:
+        msg = self._empty_text()
+
+        if self.type_label is not None:
+            self.type_label.configure(text="")
+        if self.prompt_label is not None:
+            self.prompt_label.configure(text="")
+        if self.hint_label is not None:
+            self.hint_label.configure(text="")
+        if self.feedback_label is not None:
+            self.feedback_label.configure(text=msg, bootstyle="success")
+        self._update_status()
+        self._schedule_repoll()
+
+    def _schedule_repoll(self) -> None:
+        if self._repoll_id is not None:
+            self.after_cancel(self._repoll_id)
+
+        due = self.scheduler.peek_due_time()
+        now = datetime.now()
+        if due is None:
+            delay_ms = REPOLL_MAX_MS
+        else:
+            # Los vencidos sin contenido no están en la cola: si ya toca, mirar pronto
+            delay_ms = (due - now).total_seconds() * 1000
+            delay_ms = min(max(delay_ms, REPOLL_MIN_MS), REPOLL_MAX_MS)
+        self._repoll_id = self.after(int(delay_ms), self._repoll)
+
+    def _repoll(self) -> None:
+        """Con la cola vacía, mirar si ya ha vencido algún repaso."""
+
+        if self._repoll_id is not None:
+            self.after_cancel(self._repoll_id)
+            self._repoll_id = None
+        if self.current_card is not None:
+            return
+
+        self._prefetch()
+        if self.upcoming:
+            self._next_card()
+        else:
+            self._schedule_repoll()
+
+    def _update_status(self) -> None:
+        if self.status_label is None:
+            return
+        self.status_label.configure(text=f"復習済み: {self.reviewed_count}")
+
+    def _check_answer(self) -> None:
+        if (
+            self.current_card is None
+            or self.answered
+            or self.answer_entry is None
+            or self.feedback_label is None
+        ):
+            return
+
+        card = self.current_card
+        user_answer = self.answer_entry.get().strip()
+        if card.key[1] != "grammar":
+            user_answer = user_answer.lower()
+
+        is_correct = user_answer in card.answers
+
+        note = f"  ({card.note})" if card.note and self.help.lang == "es" else ""
+        if is_correct:
+            self.feedback_label.configure(
+                text=f"正解です！ ({card.answer_text}){note}",
+                bootstyle="success",
+            )
+        else:
+            self.feedback_label.configure(
+                text=f"ちがいます… 正しい答え: {card.answer_text}{note}",
+                bootstyle="danger",
+            )
+
+        self.answered = True
+        self.reviewed_count += 1
+        self._update_status()
+
+        user_id, item_type, item_id = card.key
+        update_progress_for_item(
+            user_id=user_id,
+            item_type=item_type,
+            item_id=item_id,
+            correct=is_correct,
+        )
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is not self:
+            return
+        if self._repoll_id is not None:
+            self.after_cancel(self._repoll_id)
+            self._repoll_id = None
+        if self.current_card is not None and not self.answered:
+            self._requeue(self.current_card)
+        self.current_card = None
+        while self.upcoming:
+            self._requeue(self.upcoming.popleft())
+        self._restore_unresolvable()
@@ -1,7 +1,7 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-from app.storage.settings import load_settings, save_settings
+from app.storage.settings import get_settings_service
 from app.core.models import Settings
 
 
@@ -16,7 +16,7 @@ class SettingsView(ttk.Frame):
 
     def __init__(self, master: ttk.Frame) -> None:
         super().__init__(master)
-        self.settings: Settings = load_settings()
+        self.settings: Settings = get_settings_service().current
 
         self.theme_var = ttk.StringVar(value=self.settings.theme)
         self.help_lang_var = ttk.StringVar(value=self.settings.help_language)
@@ -94,7 +94,7 @@ class SettingsView(ttk.Frame):
 
         self.info_label = ttk.Label(
             self,
-            text="設定を変更した後、アプリを再起動してください (reinicia la app tras cambiar el tema)",
+            text="設定はすぐに反映されます (los cambios se aplican al momento)",
             font=("Yu Gothic UI", 9),
             bootstyle="secondary",
         )
@@ -105,10 +105,11 @@ class SettingsView(ttk.Frame):
         self.settings.help_language = self.help_lang_var.get() or self.settings.help_language
         self.settings.difficulty = self.difficulty_var.get() or self.settings.difficulty
 
-        save_settings(self.settings)
+        # Los suscriptores (ventana principal, vistas) aplican el cambio al momento
+        get_settings_service().save(self.settings)
 
         if self.info_label is not None:
             self.info_label.configure(
-                text="設定を保存しました。アプリを再起動してください。 (Configuración guardada; reinicia la app)",
+                text="設定を保存しました (configuración guardada)",
                 bootstyle="success",
             )
@@ -0,0 +1,188 @@
+from typing import Callable, Sequence
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview virtualizado para listas largas.
+
+    Solo existen tantas filas de Treeview como caben en pantalla; al
+    desplazarse se reutilizan cambiando sus valores. Así el coste de pintar la
+    lista depende de la altura visible y no del número de ítems.
+
+    Los datos se pasan con `set_rows(count, get_row)`, donde `get_row(i)`
+    devuelve la tupla de valores de la fila i.
+
+    La selección se guarda como índice lógico de los datos (no como fila de
+    Treeview), así que sobrevive al desplazamiento aunque las filas se
+    reutilicen.
+    """
+
+    def __init__(self, master: ttk.Frame, columns: Sequence[str], height: int = 10) -> None:
+        super().__init__(master)
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=tuple(columns),
+            show="headings",
+            height=height,
+            selectmode="browse",
+        )
+        self.scrollbar = ttk.Scrollbar(self, orient=VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.tree.pack(side=LEFT, fill=BOTH, expand=YES)
+
+        self._count = 0
+        self._get_row: Callable[[int], tuple] = lambda _i: ()
+        self._top = 0
+        self._visible = height
+        self._row_ids: list[str] = []
+        self._selected: int | None = None
+
+        self.tree.bind("<Configure>", self._on_configure)
+        for widget in (self.tree, self.scrollbar):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda _e: self.scroll_rows(-3))
+            widget.bind("<Button-5>", lambda _e: self.scroll_rows(3))
+        self.tree.bind("<Prior>", lambda _e: self.scroll_rows(-self._visible))
+        self.tree.bind("<Next>", lambda _e: self.scroll_rows(self._visible))
+        self.tree.bind("<Up>", lambda _e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda _e: self._move_selection(1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    # --- API ---
+
+    def heading(self, column: str, **kw) -> None:
+        self.tree.heading(column, **kw)
+
+    def column(self, column: str, **kw) -> None:
+        self.tree.column(column, **kw)
+
+    def set_rows(self, count: int, get_row: Callable[[int], tuple]) -> None:
+        """Cambiar los datos mostrados y volver al principio de la lista."""
+
+        self._count = count
+        self._get_row = get_row
+        self._top = 0
+        self._selected = None
+        self._render()
+
+    def selected_index(self) -> int | None:
+        """Índice (en los datos) de la fila seleccionada."""
+
+        if self._selected is None or self._selected >= self._count:
+            return None
+        return self._selected
+
+    def scroll_rows(self, delta: int) -> None:
+        self._scroll_to(self._top + delta)
+
+    # --- Desplazamiento y pintado ---
+
+    def _max_top(self) -> int:
+        return max(self._count - self._visible, 0)
+
+    def _scroll_to(self, top: int) -> None:
+        top = min(max(top, 0), self._max_top())
+        if top != self._top:
+            self._top = top
+            self._render()
+
+    def _move_selection(self, delta: int) -> str:
+        # Flechas: mover la selección lógica y desplazar una fila al llegar al
+        # borde de la ventana visible (el Treeview solo conoce sus filas)
+        if self._count == 0:
+            return "break"
+        if self._selected is None:
+            index = self._top
+        else:
+            index = min(max(self._selected + delta, 0), self._count - 1)
+        self._selected = index
+
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._visible:
+            self._top = index - self._visible + 1
+        self._render()
+        return "break"
+
+    def _on_select(self, _event) -> None:
+        selection = self.tree.selection()
+        if selection and selection[0] in self._row_ids:
+            index = self._top + self._row_ids.index(selection[0])
+            if index < self._count:
+                self._selected = index
+
+    def _ensure_row_widgets(self) -> None:
+        # Crear o quitar filas de Treeview para que coincidan con las visibles
+        while len(self._row_ids) < self._visible:
+            self._row_ids.append(self.tree.insert("", END, values=()))
+        while len(self._row_ids) > self._visible:
+            self.tree.delete(self._row_ids.pop())
+
+    def _render(self) -> None:
+        self._ensure_row_widgets()
+
+        for offset, iid in enumerate(self._row_ids):
+            index = self._top + offset
+            if index < self._count:
+                self.tree.item(iid, values=self._get_row(index))
+            else:
+                self.tree.item(iid, values=())
+
+        if self._count > 0:
+            first = self._top / self._count
+            last = min(self._top + self._visible, self._count) / self._count
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+        self._apply_selection()
+
+    def _apply_selection(self) -> None:
+        # Reaplicar la selección lógica sobre la fila que la muestra ahora
+        offset = None
+        if self._selected is not None and self._selected < self._count:
+            offset = self._selected - self._top
+            if not 0 <= offset < len(self._row_ids):
+                offset = None
+
+        current = self.tree.selection()
+        if offset is None:
+            if current:
+                self.tree.selection_remove(current)
+            return
+        iid = self._row_ids[offset]
+        if current != (iid,):
+            self.tree.selection_set(iid)
+        self.tree.focus(iid)
+
+    def _on_scrollbar(self, action: str, *args) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * self._count))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self._visible if unit == "pages" else 1
+            self.scroll_rows(amount * step)
+
+    def _on_mousewheel(self, event) -> str:
+        # Windows/macOS: event.delta en múltiplos de 120 (o pequeños en macOS)
+        if event.delta:
+            steps = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+            self.scroll_rows(steps * 3)
+        return "break"
+
+    def _on_configure(self, event) -> None:
+        if not self._row_ids:
+            return
+        bbox = self.tree.bbox(self._row_ids[0])
+        if not bbox:
+            return
+        _x, y, _w, row_height = bbox
+        if row_height <= 0:
+            return
+        visible = max((event.height - y) // row_height, 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._top = min(self._top, self._max_top())
+            self._render()
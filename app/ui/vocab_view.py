@@ -1,11 +1,37 @@
 import random
+from concurrent.futures import Future
+from itertools import chain
 
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
+from app.core.models import VocabItem
 from app.core.srs import update_progress_for_item
-from app.core.vocab_repository import load_vocab_items, save_vocab_items
-from app.storage.settings import load_settings
+from app.core.vocab_repository import (
+    count_vocab_items,
+    get_vocab_filter_index,
+    get_vocab_search_index,
+    iter_vocab_items,
+    load_vocab_at,
+    load_vocab_items,
+    load_vocab_page,
+    prepare_vocab_filter_index,
+    prepare_vocab_search_index,
+    save_vocab_items,
+)
+from app.ui.events import CONTENT_CHANGED
+from app.ui.help_text import HelpText
+from app.ui.option_group import OptionGroup
+from app.ui.virtual_list import VirtualTreeview
+
+
+# Espera tras la última pulsación antes de buscar (ms)
+SEARCH_DEBOUNCE_MS = 150
+# Lista sin filtros: filas leídas de una vez y páginas que se mantienen en memoria
+LIST_PAGE_SIZE = 200
+LIST_MAX_PAGES = 8
+# Cada cuánto se mira si el índice de filtros ya está listo (ms)
+INDEX_POLL_MS = 100
 
 
 class VocabView(ttk.Frame):
@@ -15,74 +41,80 @@ class VocabView(ttk.Frame):
     - Modo tarjetas: japonés → significado en español.
     """
 
-    def __init__(self, master: ttk.Frame) -> None:
+    def __init__(self, master: ttk.Frame, rng: random.Random | None = None) -> None:
         super().__init__(master)
-        settings = load_settings()
-        self.help_lang: str = (settings.help_language or "es").lower()
-        # Datos completos y vista filtrada
-        self.all_items = load_vocab_items()
-        self.items = list(self.all_items)
-        self.current_index: int | None = None
+        self.rng = rng or random.Random()
+        # Los textos de ayuda cambian de idioma en su sitio (ver HelpText)
+        self.help = HelpText(self)
+        # Palabras de tarjetas y test: sin filtros, la secuencia cacheada del
+        # repositorio (se decodifica al leer); con filtros, solo las que casan
+        self.items = load_vocab_items()
+        self._filtered = False
+        self.current_item: VocabItem | None = None
 
         self.filter_tag_var: ttk.StringVar | None = None
         self.filter_pos_var: ttk.StringVar | None = None
-
-        self.list_tree: ttk.Treeview | None = None
+        self.tag_combo: ttk.Combobox | None = None
+        self.pos_combo: ttk.Combobox | None = None
+        self.search_var: ttk.StringVar | None = None
+        self._search_after_id: str | None = None
+        # Índices construyéndose en segundo plano desde que se abre la vista
+        self._filter_index_job: Future | None = None
+        self._search_index_job: Future | None = None
+
+        self.list_tree: VirtualTreeview | None = None
+        # Páginas del mazo leídas para la lista sin filtros (nº de página -> ítems)
+        self._pages: dict[int, list] = {}
 
         self.word_label: ttk.Label | None = None
         self.reading_label: ttk.Label | None = None
         self.answer_entry: ttk.Entry | None = None
         self.feedback_label: ttk.Label | None = None
 
+        self._prepare_indexes()
         self._create_widgets()
 
     def _create_widgets(self) -> None:
-        if self.help_lang == "en":
-            header_text = "単語N5 / Vocabulary N5"
-        elif self.help_lang == "none":
-            header_text = "単語N5"
-        else:
-            header_text = "単語N5 (Vocabulario N5)"
-
         header = ttk.Label(
             self,
-            text=header_text,
             font=("Yu Gothic UI", 18, "bold"),
         )
+        self.help.bind(
+            header,
+            es="単語N5 (Vocabulario N5)",
+            en="単語N5 / Vocabulary N5",
+            none="単語N5",
+        )
         header.pack(side=TOP, pady=10)
 
         # Botón para añadir nuevo vocabulario
         add_frame = ttk.Frame(self)
         add_frame.pack(fill=X, padx=10)
 
-        if self.help_lang == "en":
-            add_text = "新しい単語を追加 / Add word"
-        elif self.help_lang == "none":
-            add_text = "新しい単語を追加"
-        else:
-            add_text = "新しい単語を追加 / Añadir palabra"
-
         add_btn = ttk.Button(
             add_frame,
-            text=add_text,
             bootstyle="info-outline",
             command=self._open_add_vocab_dialog,
         )
+        self.help.bind(
+            add_btn,
+            es="新しい単語を追加 / Añadir palabra",
+            en="新しい単語を追加 / Add word",
+            none="新しい単語を追加",
+        )
         add_btn.pack(side=RIGHT)
 
         if not self.items:
-            if self.help_lang == "en":
-                msg_text = "単語データがありません (no vocabulary data)"
-            elif self.help_lang == "none":
-                msg_text = "単語データがありません"
-            else:
-                msg_text = "単語データがありません (no hay datos de vocabulario)"
-
             msg = ttk.Label(
                 self,
-                text=msg_text,
                 bootstyle="danger",
             )
+            self.help.bind(
+                msg,
+                es="単語データがありません (no hay datos de vocabulario)",
+                en="単語データがありません (no vocabulary data)",
+                none="単語データがありません",
+            )
             msg.pack(pady=20)
             return
 
@@ -106,11 +138,11 @@ class VocabView(ttk.Frame):
         filter_frame = ttk.Frame(parent)
         filter_frame.pack(fill=X, padx=5, pady=5)
 
+        # Los valores se rellenan cuando termina el índice de filtros
         ttk.Label(filter_frame, text="タグ / Etiqueta:").pack(side=LEFT, padx=2)
-        all_tags = sorted({t for item in self.all_items for t in item.tags})
-        tag_values = ["(all)"] + all_tags
+        tag_values = ["(all)"]
         self.filter_tag_var = ttk.StringVar(value="(all)")
-        tag_combo = ttk.Combobox(
+        self.tag_combo = tag_combo = ttk.Combobox(
             filter_frame,
             textvariable=self.filter_tag_var,
             values=tag_values,
@@ -121,10 +153,9 @@ class VocabView(ttk.Frame):
         tag_combo.bind("<<ComboboxSelected>>", lambda _e: self._apply_filters())
 
         ttk.Label(filter_frame, text="品詞 / Tipo:").pack(side=LEFT, padx=8)
-        all_pos = sorted({item.pos for item in self.all_items if item.pos})
-        pos_values = ["(all)"] + all_pos
+        pos_values = ["(all)"]
         self.filter_pos_var = ttk.StringVar(value="(all)")
-        pos_combo = ttk.Combobox(
+        self.pos_combo = pos_combo = ttk.Combobox(
             filter_frame,
             textvariable=self.filter_pos_var,
             values=pos_values,
@@ -134,10 +165,18 @@ class VocabView(ttk.Frame):
         pos_combo.pack(side=LEFT, padx=2)
         pos_combo.bind("<<ComboboxSelected>>", lambda _e: self._apply_filters())
 
-        self.list_tree = ttk.Treeview(
+        # Búsqueda incremental (japonés, lectura, romaji o significado)
+        search_label = ttk.Label(filter_frame)
+        self.help.bind(search_label, es="検索 / Buscar:", en="検索 / Search:", none="検索:")
+        search_label.pack(side=LEFT, padx=8)
+        self.search_var = ttk.StringVar(value="")
+        search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=18)
+        search_entry.pack(side=LEFT, padx=2)
+        search_entry.bind("<KeyRelease>", lambda _e: self._schedule_search())
+
+        self.list_tree = VirtualTreeview(
             parent,
             columns=("jp", "reading", "meaning"),
-            show="headings",
             height=10,
         )
         self.list_tree.heading("jp", text="日本語")
@@ -151,20 +190,19 @@ class VocabView(ttk.Frame):
         self.list_tree.pack(fill=BOTH, expand=YES, padx=5, pady=5)
 
         self._refresh_list_tree()
+        self._poll_filter_index()
 
     def _build_flashcard_tab(self, parent: ttk.Frame) -> None:
-        if self.help_lang == "en":
-            info_text = "カード練習：日本語 → 意味 (English/Spanish)"
-        elif self.help_lang == "none":
-            info_text = "カード練習：日本語 → 意味"
-        else:
-            info_text = "カード練習：日本語 → 意味 (español)"
-
         info = ttk.Label(
             parent,
-            text=info_text,
             font=("Yu Gothic UI", 12),
         )
+        self.help.bind(
+            info,
+            es="カード練習：日本語 → 意味 (español)",
+            en="カード練習：日本語 → 意味 (English/Spanish)",
+            none="カード練習：日本語 → 意味",
+        )
         info.pack(side=TOP, pady=5)
 
         self.word_label = ttk.Label(
@@ -182,18 +220,16 @@ class VocabView(ttk.Frame):
         )
         self.reading_label.pack(pady=5)
 
-        if self.help_lang == "en":
-            entry_help = "意味を英語または母語で入力してください (type the meaning)"
-        elif self.help_lang == "none":
-            entry_help = "意味をスペイン語で入力してください"
-        else:
-            entry_help = "意味をスペイン語で入力してください (escribe el significado en español):"
-
         entry_label = ttk.Label(
             parent,
-            text=entry_help,
             font=("Yu Gothic UI", 10),
         )
+        self.help.bind(
+            entry_label,
+            es="意味をスペイン語で入力してください (escribe el significado en español):",
+            en="意味を英語または母語で入力してください (type the meaning)",
+            none="意味をスペイン語で入力してください",
+        )
         entry_label.pack()
 
         self.answer_entry = ttk.Entry(parent, width=30)
@@ -233,18 +269,16 @@ class VocabView(ttk.Frame):
     # --- Tab de test tipo elección múltiple ---
 
     def _build_test_tab(self, parent: ttk.Frame) -> None:
-        if self.help_lang == "en":
-            info_text = "単語テスト：日本語 → 意味 (4 options)"
-        elif self.help_lang == "none":
-            info_text = "単語テスト：日本語 → 意味"
-        else:
-            info_text = "単語テスト：日本語 → 意ma (4 opciones)"
-
         info = ttk.Label(
             parent,
-            text=info_text,
             font=("Yu Gothic UI", 12),
         )
+        self.help.bind(
+            info,
+            es="単語テスト：日本語 → 意ma (4 opciones)",
+            en="単語テスト：日本語 → 意味 (4 options)",
+            none="単語テスト：日本語 → 意味",
+        )
         info.pack(side=TOP, pady=5)
 
         self.test_word_label = ttk.Label(
@@ -263,8 +297,8 @@ class VocabView(ttk.Frame):
         self.test_reading_label.pack(pady=5)
 
         self.test_var = ttk.IntVar(value=-1)
-        self.test_options_frame = ttk.Frame(parent)
-        self.test_options_frame.pack(pady=5, anchor=NW)
+        self.test_options = OptionGroup(parent, self.test_var)
+        self.test_options.pack(pady=5, anchor=NW)
 
         btn_frame = ttk.Frame(parent)
         btn_frame.pack(pady=10)
@@ -353,9 +387,7 @@ class VocabView(ttk.Frame):
                 )
                 return
 
-            next_id = max((it.id for it in self.all_items), default=0) + 1
-
-            from app.core.models import VocabItem
+            next_id = max((it.id for it in iter_vocab_items()), default=0) + 1
 
             new_item = VocabItem(
                 id=next_id,
@@ -366,11 +398,11 @@ class VocabView(ttk.Frame):
                 tags=tags,
             )
 
-            self.all_items.append(new_item)
-            save_vocab_items(self.all_items)
+            save_vocab_items(chain(iter_vocab_items(), [new_item]))
+            self.event_generate(CONTENT_CHANGED)
 
-            # Reaplicar filtros y refrescar vista
-            self._apply_filters()
+            # Recargar índices, filtros y lista (el evento no llega a esta vista)
+            self.refresh()
 
             info_label.configure(
                 text="単語を保存しました (palabra guardada)",
@@ -402,8 +434,7 @@ class VocabView(ttk.Frame):
         if not self.items:
             return
 
-        self.current_index = random.randrange(len(self.items))
-        item = self.items[self.current_index]
+        item = self.current_item = self.rng.choice(self.items)
 
         if self.word_label is not None:
             self.word_label.configure(text=item.word_jp)
@@ -420,13 +451,13 @@ class VocabView(ttk.Frame):
 
     def _check_answer(self) -> None:
         if (
-            self.current_index is None
+            self.current_item is None
             or self.answer_entry is None
             or self.feedback_label is None
         ):
             return
 
-        item = self.items[self.current_index]
+        item = self.current_item
         user_answer = self.answer_entry.get().strip().lower()
         correct_meaning = item.meaning_es.strip().lower()
 
@@ -450,32 +481,115 @@ class VocabView(ttk.Frame):
             correct=is_correct,
         )
 
+    def refresh(self) -> None:
+        """Recargar el vocabulario tras un cambio hecho en otra vista.
+
+        Se conservan la tarjeta y la pregunta de test en curso; solo se
+        actualizan los filtros y la lista.
+        """
+
+        self._prepare_indexes()
+        if self.list_tree is None:
+            # Se construyó sin datos: no hay estado que conservar
+            for child in self.winfo_children():
+                child.destroy()
+            self.items = load_vocab_items()
+            self._filtered = False
+            self._create_widgets()
+            return
+
+        self._poll_filter_index()
+        self._apply_filters()
+
+    def _prepare_indexes(self) -> None:
+        # Los dos recorren el mazo entero: fuera del hilo de Tk
+        self._filter_index_job = prepare_vocab_filter_index()
+        self._search_index_job = prepare_vocab_search_index()
+
+    def _poll_filter_index(self) -> None:
+        job = self._filter_index_job
+        if job is None or not job.done():
+            self.after(INDEX_POLL_MS, self._poll_filter_index)
+            return
+
+        filter_index = job.result()
+        if self.tag_combo is not None:
+            self.tag_combo.configure(values=["(all)"] + filter_index.tags)
+        if self.pos_combo is not None:
+            self.pos_combo.configure(values=["(all)"] + filter_index.pos_values)
+
     # --- Filtros de lista ---
 
     def _apply_filters(self) -> None:
         tag = self.filter_tag_var.get() if self.filter_tag_var is not None else "(all)"
         pos = self.filter_pos_var.get() if self.filter_pos_var is not None else "(all)"
 
-        filtered = list(self.all_items)
+        query = self.search_var.get().strip() if self.search_var is not None else ""
+        tag_filter = tag if tag and tag != "(all)" else None
+        pos_filter = pos if pos and pos != "(all)" else None
+        filtered = tag_filter is not None or pos_filter is not None or bool(query)
 
-        if tag and tag != "(all)":
-            filtered = [it for it in filtered if tag in it.tags]
+        jobs = (self._filter_index_job, self._search_index_job if query else None)
+        if filtered and any(job is not None and not job.done() for job in jobs):
+            # Algún índice aún se está construyendo: reintentar sin bloquear la interfaz
+            self._schedule_search()
+            return
 
-        if pos and pos != "(all)":
-            filtered = [it for it in filtered if it.pos == pos]
+        if not filtered:
+            self.items = load_vocab_items()
+        else:
+            # Intersección de bitsets por etiqueta, tipo de palabra y búsqueda
+            filter_index = get_vocab_filter_index()
+            bits = filter_index.match(tag=tag_filter, pos=pos_filter)
+            if query:
+                positions = get_vocab_search_index().search(query) or []
+                bits &= filter_index.bits_from_positions(positions)
+            self.items = load_vocab_at(filter_index.positions(bits))
+        self._filtered = filtered
 
-        self.items = filtered
         self._refresh_list_tree()
 
+    def _schedule_search(self) -> None:
+        # Agrupar pulsaciones seguidas en una sola búsqueda
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self) -> None:
+        self._search_after_id = None
+        self._apply_filters()
+
+    def _paged_row(self, i: int) -> tuple:
+        page_no, pos = divmod(i, LIST_PAGE_SIZE)
+        page = self._pages.get(page_no)
+        if page is None:
+            if len(self._pages) >= LIST_MAX_PAGES:
+                # Descartar la página leída hace más tiempo
+                del self._pages[next(iter(self._pages))]
+            page = self._pages[page_no] = load_vocab_page(page_no * LIST_PAGE_SIZE, LIST_PAGE_SIZE)
+        if pos >= len(page):
+            return ("", "", "")
+        item = page[pos]
+        return (item.word_jp, item.reading, item.meaning_es)
+
     def _refresh_list_tree(self) -> None:
         if self.list_tree is None:
             return
 
-        for row in self.list_tree.get_children():
-            self.list_tree.delete(row)
+        if not self._filtered:
+            # Sin filtros la lista se pinta por páginas, que se leen y se descartan
+            self._pages.clear()
+            self.list_tree.set_rows(count_vocab_items(), self._paged_row)
+            return
+
+        items = self.items
 
-        for item in self.items:
-            self.list_tree.insert("", END, values=(item.word_jp, item.reading, item.meaning_es))
+        def get_row(i: int) -> tuple:
+            item = items[i]
+            return (item.word_jp, item.reading, item.meaning_es)
+
+        # Solo se pintan las filas visibles
+        self.list_tree.set_rows(len(items), get_row)
 
     # --- Lógica del test de elección múltiple ---
 
@@ -483,15 +597,20 @@ class VocabView(ttk.Frame):
         if not self.items:
             return
 
-        correct_item = random.choice(self.items)
-        distractors_pool = [it for it in self.items if it.id != correct_item.id]
-        if len(distractors_pool) < 3:
+        # Por índice, para no recorrer (ni decodificar) todo el mazo
+        count = len(self.items)
+        correct_index = self.rng.randrange(count)
+        correct_item = self.items[correct_index]
+        if count - 1 >= 3:
+            picks = self.rng.sample(range(count - 1), 3)
+            distractor_indices = [i + 1 if i >= correct_index else i for i in picks]
+        else:
             # No hay suficientes opciones, usar todo el conjunto
-            distractors_pool = self.items
+            distractor_indices = self.rng.sample(range(count), count)
 
-        distractors = random.sample(distractors_pool, min(3, len(distractors_pool)))
+        distractors = [self.items[i] for i in distractor_indices]
         options = distractors + [correct_item]
-        random.shuffle(options)
+        self.rng.shuffle(options)
 
         self.test_current_correct_id = correct_item.id
         self.test_current_options = options
@@ -499,19 +618,8 @@ class VocabView(ttk.Frame):
         self.test_word_label.configure(text=correct_item.word_jp)
         self.test_reading_label.configure(text=f"よみかた: {correct_item.reading}")
 
-        for child in self.test_options_frame.winfo_children():
-            child.destroy()
-
         self.test_var.set(-1)
-        for idx, opt in enumerate(options):
-            rb = ttk.Radiobutton(
-                self.test_options_frame,
-                text=opt.meaning_es,
-                variable=self.test_var,
-                value=idx,
-                bootstyle="info-toolbutton",
-            )
-            rb.pack(anchor=NW, pady=2)
+        self.test_options.set_options([opt.meaning_es for opt in options])
 
         self.test_feedback_label.configure(text="", bootstyle="secondary")
 
@@ -0,0 +1,47 @@
+from app.core import distractor_index
+from app.core.distractor_index import BKTree, edit_distance, max_distance
+from app.core.models import VocabItem
+
+
+def _vocab(item_id: int, reading: str, meaning: str) -> VocabItem:
+    return VocabItem(id=item_id, word_jp=reading, reading=reading, meaning_es=meaning, pos="", tags=[])
+
+
+def test_max_distance_grows_with_reading_length():
+    assert max_distance("え") == 1
+    assert max_distance("ほん") == 1
+    assert max_distance("くるま") == 1
+    assert max_distance("でんしゃ") == 1
+    assert max_distance("いちにちじゅう") == 2
+
+
+def test_short_readings_only_match_one_edit_away():
+    readings = ["ほん", "ほし", "みず", "くつ", "て", "め", "やま"]
+    tree: BKTree[str] = BKTree()
+    for reading in readings:
+        tree.add(reading, reading)
+
+    close = {r for _d, r in tree.search("ほん", max_distance("ほん"))}
+    assert close == {r for r in readings if edit_distance("ほん", r) <= 1}
+    # Con una distancia fija de 2 casarían todas las lecturas de 2 kana
+    assert "みず" not in close and "くつ" not in close and "やま" not in close
+
+
+def test_vocab_neighbours_of_short_readings(monkeypatch):
+    items = [
+        _vocab(1, "ほん", "libro"),
+        _vocab(2, "ほし", "estrella"),
+        _vocab(3, "みず", "agua"),
+        _vocab(4, "くつ", "zapatos"),
+        _vocab(5, "て", "mano"),
+        _vocab(6, "め", "ojo"),
+    ]
+    monkeypatch.setattr(distractor_index, "load_vocab_items", lambda: items)
+
+    neighbours = distractor_index._build_vocab()
+
+    assert neighbours["1"] == ["estrella"]
+    assert neighbours["5"] == ["ojo"]
+    # "みず" y "くつ" no se parecen a ninguna otra lectura
+    assert "3" not in neighbours
+    assert "4" not in neighbours